@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Synchronizer Node Agent
+
+Runs next to synchronizer-cli, polls its API on loopback and streams one
+merged, delta-compressed snapshot to any number of dashboards over a
+single persistent connection each (``dashboard.py --agent`` / inventory
+``"agent"``). Protocol: see core/agent.py. Needs ``httpx`` only.
+
+CLI flags
+---------
+--api-port        Local port exposing /api/*      (default: 3000)
+--metrics-port    Local port exposing /metrics    (default: 3001)
+--api-base        Full API base URL instead of --api-port (e.g. behind a path prefix)
+--metrics-base    Full /metrics base URL (default: --api-base if given)
+--password        Web password: used for the local API and required from
+                  dashboards (default: ~/.synchronizer-cli/config.json)
+--listen          [HOST:]PORT to accept dashboards on (default: 127.0.0.1:3002);
+                  keep it on loopback behind an SSH tunnel, or bind a LAN address
+"""
+
+import argparse
+import asyncio
+import contextlib
+import signal
+
+from core.agent import DEFAULT_PORT, AgentServer
+from core.http_pool import HTTPPool
+from core.scheduler import PollScheduler, listen_address_arg, load_password_from_config
+
+
+def make_arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Synchronizer node agent for the TUI dashboard")
+    p.add_argument("--api-port", type=int, default=3000, help="Local port exposing /api/*")
+    p.add_argument("--metrics-port", type=int, default=3001, help="Local port exposing /metrics")
+    p.add_argument("--api-base", metavar="URL", default=None,
+                   help="Full API base URL, overrides --api-port")
+    p.add_argument("--metrics-base", metavar="URL", default=None,
+                   help="Full /metrics base URL (default: --api-base, else --metrics-port)")
+    p.add_argument("--password", default=None,
+                   help="Web service password, also required from dashboards")
+    p.add_argument("--listen", metavar="[HOST:]PORT", type=listen_address_arg,
+                   default=("127.0.0.1", DEFAULT_PORT),
+                   help=f"Address dashboards connect to (default: 127.0.0.1:{DEFAULT_PORT})")
+    return p
+
+
+async def serve(args, password: str) -> None:
+    http_pool = HTTPPool(per_host=2)
+    server = AgentServer(
+        PollScheduler(http_pool),
+        api_base=args.api_base or f"http://127.0.0.1:{args.api_port}",
+        metrics_base=(args.metrics_base or args.api_base
+                      or f"http://127.0.0.1:{args.metrics_port}"),
+        password=password,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop.set)
+
+    await server.start(*args.listen)
+    print("Agent listening on %s:%d (Ctrl+C to stop)" % args.listen)
+    try:
+        await stop.wait()
+    finally:
+        await server.stop()
+        await http_pool.aclose()
+
+
+def main() -> None:
+    args = make_arg_parser().parse_args()
+    password = args.password if args.password is not None else load_password_from_config()
+    asyncio.run(serve(args, password))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+DashboardApp
+============
+The Textual side of the dashboard: per-node widget grid, fleet view and
+node drill-down. Imported lazily by ``dashboard.main`` so the headless
+paths never load Textual.
+"""
+
+from typing import Iterable, Mapping
+
+from textual.app import App, ComposeResult, SystemCommand
+from textual.binding import Binding
+from textual.containers import Grid, Vertical
+from textual.screen import Screen
+from textual.widgets import Footer
+
+from core.exporter import MetricsExporter
+from core.fleet import FleetState, Node
+from core.history import FleetHistory
+from core.rates import DerivedMetrics
+from core.http_pool import HTTPPool
+from core.snapshot import SAVE_EVERY, SnapshotCache
+from core.store import TimeSeriesStore
+from core.ticker import Ticker
+from widgets.base_widget import APIWidget
+from widgets.config_widget import ConfigWidget
+from widgets.diagnostics_widget import DiagnosticsWidget
+from widgets.fleet_table_widget import FleetTable
+from widgets.fleet_widget import FleetSummaryWidget
+from widgets.frames import FrameScheduler
+from widgets.history_widget import HistoryWidget
+from widgets.performance_widget import PerformanceWidget
+from widgets.points_widget import PointsWidget
+from widgets.qos_widget import QOSWidget
+from widgets.status_widget import StatusWidget
+
+
+# ---------------------------------------------------------------------- #
+# Layout
+# ---------------------------------------------------------------------- #
+def compose_node(node: Node) -> ComposeResult:
+    """Build the 2 × 3 grid of widgets for a single node."""
+    with Vertical():
+        with Grid(id="body-grid"):
+            # Row 1
+            yield StatusWidget(
+                "Service Status",
+                api_base=node.api_base,
+                api_password=node.password,
+                node=node.name,
+            )
+            yield ConfigWidget(
+                "Configuration",
+                endpoints=[node.metrics_base, node.api_base],
+                api_password=node.password,
+                node=node.name,
+            )
+
+            # Row 2
+            yield PerformanceWidget(
+                "Performance",
+                api_base=node.api_base,
+                api_password=node.password,
+                node=node.name,
+            )
+            yield QOSWidget(
+                "QoS Metrics",
+                api_base=node.api_base,
+                api_password=node.password,
+                node=node.name,
+            )
+        # Row 3
+        yield PointsWidget("Points",
+            api_base=node.api_base,
+            api_password=node.password,
+            node=node.name)
+
+
+class NodeScreen(Screen):
+    """Fleet drill-down: the regular per-node dashboard for one node."""
+
+    BINDINGS = [
+        Binding("escape", "app.pop_screen", "Back", key_display="Esc:"),
+    ]
+
+    def __init__(self, node: Node, **kwargs):
+        super().__init__(**kwargs)
+        self.node = node
+        self.sub_title = node.name
+
+    def compose(self) -> ComposeResult:
+        yield from compose_node(self.node)
+        yield Footer()
+
+
+class DiagnosticsScreen(Screen):
+    """Self-diagnostics: endpoint latency and widget render timings."""
+
+    BINDINGS = [
+        Binding("escape", "app.pop_screen", "Back", key_display="Esc:"),
+        Binding("f2", "app.pop_screen", "Back", show=False),
+    ]
+
+    def __init__(self, diagnostics, **kwargs):
+        super().__init__(**kwargs)
+        self._diagnostics = diagnostics
+        self.sub_title = "Diagnostics"
+
+    def compose(self) -> ComposeResult:
+        yield DiagnosticsWidget("Diagnostics", diagnostics=self._diagnostics)
+        yield Footer()
+
+
+class HistoryScreen(Screen):
+    """Long-term QoS and points charts for one node, read from --store."""
+
+    BINDINGS = [
+        Binding("escape", "app.pop_screen", "Back", key_display="Esc:"),
+        Binding("f3", "app.pop_screen", "Back", show=False),
+    ]
+
+    def __init__(self, store, node: str, **kwargs):
+        super().__init__(**kwargs)
+        self._store = store
+        self._node = node
+        self.sub_title = f"{node} – History"
+
+    def compose(self) -> ComposeResult:
+        yield HistoryWidget("History", store=self._store, node=self._node)
+        yield Footer()
+
+
+class DashboardApp(App):
+    CSS_PATH = "dashboard.css"
+    TITLE = "Synchronizer Dashboard TUI"
+
+    # Customize the bottom/footer bar with options
+    COMMAND_PALETTE_DISPLAY = "Ctrl+p"
+    BINDINGS = [
+        Binding("ctrl+q", "quit", "Quit", key_display="Ctrl+q:"),
+        Binding("f5", "refresh", "Refresh", key_display="F5:"),
+        Binding("f2", "diagnostics", "Diagnostics", key_display="F2:"),
+        Binding("f3", "history", "History", key_display="F3:"),
+    ]
+
+    def __init__(
+        self,
+        *,
+        nodes: list[Node],
+        http_pool: HTTPPool,
+        scheduler,                # core.scheduler.PollScheduler
+        fleet_mode: bool = False,
+        history_size: int = 240,
+        rate_window: float = 60.0,
+        poll_bounds: Mapping[str, tuple[float, float]] | None = None,
+        export: tuple[str, int] | None = None,
+        clock=None,               # time source for history / rates (replay)
+        snapshots: SnapshotCache | None = None,   # already loaded
+        alerts: tuple[list, list] | None = None,   # core.alerts.load_alerts
+        store: TimeSeriesStore | None = None,     # read-only, for the history view
+        shards=None,              # core.shards.ShardPool: fleet rows polled by workers
+        max_fps: float = 0,       # widget repaints per second (0 = unbatched)
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._inventory = nodes
+        self._fleet_mode = fleet_mode
+
+        # section -> (min, max) adaptive poll interval, read by every widget
+        self.poll_bounds = dict(poll_bounds or {})
+
+        # one keep-alive client, driven by one scheduler every widget subscribes to
+        self.http_pool = http_pool
+        self.scheduler = scheduler
+
+        # summary data for every node, shared by the fleet views; subscribed
+        # before any widget so history is current when widgets render
+        # (or, with --workers, polled and extracted in worker processes)
+        self.shards = shards
+        self.fleet = FleetState(self.scheduler, nodes, bounds=self.poll_bounds,
+                                poll=shards is None)
+        if shards is not None:
+            shards.attach(self.fleet)
+        self.history = FleetHistory(self.fleet, capacity=history_size, clock=clock)
+        self.derived = DerivedMetrics(self.fleet, tau=rate_window, clock=clock)
+
+        # last-known-good values from the previous run: painted at once,
+        # replaced section by section as live responses arrive
+        self.snapshots = snapshots
+        if snapshots is not None:
+            for node in nodes:
+                for section, (data, _) in snapshots.sections(node.name).items():
+                    self.fleet.seed(node.name, section, data)
+            snapshots.attach(self.fleet)
+
+        # one 1 s clock for everything that ages between polls (uptime …)
+        self.ticker = Ticker()
+
+        # widget repaints batched into frames under the --max-fps budget
+        self.frames = FrameScheduler(self, max_fps) if max_fps > 0 else None
+
+        # optional alert rules, checked on every update and on each tick
+        self.alerts = None
+        if alerts is not None:
+            from core.alerts import AlertEngine
+            rules, sinks = alerts
+            self.alerts = AlertEngine(self.fleet, rules, sinks=sinks, clock=clock)
+            self.alerts.add_listener(self._on_alert)
+            self.ticker.add(lambda now: self.alerts.check())
+
+        # long-term history recorded by a headless collector, if any
+        self.store = store
+
+        # optional OpenMetrics endpoint rendered from the same rows
+        self._export = export
+        self.exporter = MetricsExporter(self.fleet) if export else None
+
+    async def on_mount(self) -> None:
+        self.scheduler.start()
+        if self.shards is not None:
+            self.shards.start()
+        self.set_interval(1, self.ticker.tick)
+        if self.snapshots is not None:
+            self.set_interval(SAVE_EVERY, self.snapshots.save)
+        if self.exporter is not None:
+            try:
+                await self.exporter.start(*self._export)
+            except OSError as e:
+                self.notify(f"Metrics exporter not started: {e}", severity="error")
+
+    def action_refresh(self) -> None:
+        """Drop cached responses and poll every endpoint now."""
+        self.scheduler.invalidate()
+        if self.shards is not None:
+            self.shards.invalidate()
+
+    def action_diagnostics(self) -> None:
+        """Toggle the diagnostics screen."""
+        if isinstance(self.screen, DiagnosticsScreen):
+            self.pop_screen()
+        else:
+            self.push_screen(DiagnosticsScreen(self.scheduler.diagnostics))
+
+    def action_history(self) -> None:
+        """Toggle the history charts for the node in view (or under the fleet cursor)."""
+        if isinstance(self.screen, HistoryScreen):
+            self.pop_screen()
+            return
+        if self.store is None:
+            self.notify("No history recorded: run a --headless collector with --store DIR",
+                        severity="warning")
+            return
+        if isinstance(self.screen, NodeScreen):
+            node = self.screen.node.name
+        elif not self._fleet_mode:
+            node = self._inventory[0].name
+        else:
+            node = self.query_one(FleetTable).selected
+            if node is None:
+                return
+        self.push_screen(HistoryScreen(self.store, node))
+
+    def _on_alert(self, event: dict) -> None:
+        """Toast the transition and re-mark the node's widgets on every screen."""
+        if event["state"] == "firing":
+            severity = "error" if event["severity"] == "critical" else "warning"
+            self.notify(event["message"], title="Alert", severity=severity, timeout=10)
+        else:
+            self.notify(event["message"], title="Resolved", severity="information")
+        for screen in self.screen_stack:
+            for widget in screen.query(APIWidget):
+                if widget.node == event["node"]:
+                    widget.refresh_alerts()
+
+    def get_system_commands(self, screen: Screen) -> Iterable[SystemCommand]:
+        yield from super().get_system_commands(screen)
+        yield SystemCommand("Diagnostics", "Endpoint latency and widget render timings",
+                            self.action_diagnostics)
+        yield SystemCommand("History", "Long-term QoS and points charts (--store)",
+                            self.action_history)
+
+    async def on_unmount(self) -> None:
+        """Stop polling and close pooled connections cleanly on quit."""
+        if self.frames is not None:
+            self.frames.close()
+        if self.exporter is not None:
+            await self.exporter.stop()
+        await self.scheduler.stop()
+        if self.shards is not None:
+            await self.shards.stop()
+        await self.http_pool.aclose()
+        if self.alerts is not None:
+            await self.alerts.aclose()
+        if self.snapshots is not None:
+            self.snapshots.save()
+
+    # ------------------------------------------------------------------ #
+    # Layout
+    # ------------------------------------------------------------------ #
+    def compose(self) -> ComposeResult:
+        if not self._fleet_mode:
+            yield from compose_node(self._inventory[0])
+        else:
+            with Vertical():
+                yield FleetSummaryWidget("Fleet Summary", fleet=self.fleet)
+                yield FleetTable(fleet=self.fleet, id="fleet-nodes")
+        yield Footer()
+
+    def on_fleet_table_node_selected(self, event: FleetTable.NodeSelected) -> None:
+        """Drill down into the selected fleet node."""
+        self.push_screen(NodeScreen(self.fleet.nodes[event.node]))
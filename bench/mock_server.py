@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+MockSynchronizer
+============
+Local stand-in for the synchronizer-cli web API, for benchmarks.
+
+One asyncio HTTP/1.1 server (keep-alive, ETag / If-None-Match) serves any
+number of simulated nodes, each under its own path prefix::
+
+    http://127.0.0.1:<port>/n/<index>/api/status
+    http://127.0.0.1:<port>/n/<index>/api/performance
+    http://127.0.0.1:<port>/n/<index>/api/points
+    http://127.0.0.1:<port>/n/<index>/api/versions
+    http://127.0.0.1:<port>/n/<index>/metrics
+
+Knobs:
+    --latency      mean response delay in seconds (± --latency-jitter)
+    --error-rate   fraction of requests answered with 503
+    --drift        probability that a request sees the node's data moved on
+                   (0 = static payloads, 1 = every poll changes)
+
+Run stand-alone to point the real dashboard at it::
+
+    python -m bench.mock_server --nodes 100 --inventory /tmp/mock-nodes.json
+    ./dashboard.py --inventory /tmp/mock-nodes.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+
+
+class MockNode:
+    """Counters and identity of one simulated synchronizer."""
+
+    def __init__(self, index: int, rng: random.Random):
+        self.index = index
+        self.rng = rng
+        self.started = time.time() - rng.randint(60, 30 * 86400)
+        self.bytes_in = rng.randint(0, 10**9)
+        self.bytes_out = rng.randint(0, 10**9)
+        self.sessions = rng.randint(0, 1000)
+        self.users = rng.randint(0, 50)
+        self.life_points = rng.randint(0, 10**6)
+        self.sync_points = rng.randint(0, 10**5)
+        self.qos = [rng.randint(0, 2) for _ in range(3)]
+
+    def drift(self, path: str) -> None:
+        """Advance whatever *path* reports, the way a live node would."""
+        rng = self.rng
+        if path == "/api/performance":
+            self.bytes_in += rng.randint(1, 10**6)
+            self.bytes_out += rng.randint(1, 10**6)
+            self.sessions += rng.randint(0, 3)
+            self.users = max(0, self.users + rng.randint(-2, 2))
+            if rng.random() < 0.05:
+                self.qos[rng.randrange(3)] = rng.randint(0, 2)
+        elif path == "/api/points":
+            self.life_points += rng.randint(1, 50)
+            self.sync_points += rng.randint(1, 50)
+
+    def payload(self, path: str) -> dict | None:
+        iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started))
+        if path == "/api/status":
+            return {"serviceStatus": "running", "dockerAvailable": True, "autoStart": True,
+                    "uptime": iso,
+                    "imageUpdates": {"available": False, "lastChecked": iso}}
+        if path == "/api/performance":
+            return {"performance": {"totalTraffic": self.bytes_in + self.bytes_out,
+                                    "sessions": self.sessions, "bytesIn": self.bytes_in,
+                                    "bytesOut": self.bytes_out, "users": self.users},
+                    "qos": {"reliability": self.qos[0], "availability": self.qos[1],
+                            "efficiency": self.qos[2],
+                            "ratingsBlurbs": {"reliability": "ok", "availability": "ok",
+                                              "efficiency": "ok"}}}
+        if path == "/api/points":
+            return {"walletLifePoints": self.life_points, "syncLifePoints": self.sync_points,
+                    "points": {"rank": 1 + self.index, "multiplier": 1.5}}
+        if path == "/api/versions":
+            return {"versions": {"dockerImage": "cdrakep/synqchronizer:latest",
+                                 "containerImage": "sha256:mock", "reflectorVersion": "1.0.0",
+                                 "launcher": "mock"}}
+        if path == "/metrics":
+            return {"version": "2.0.0",
+                    "synchronizer": {"syncHash": f"mock-{self.index:04d}",
+                                     "wallet": f"0x{self.index:040x}"},
+                    "system": {"hostname": f"mock-{self.index}", "platform": "linux",
+                               "arch": "x64"}}
+        return None
+
+
+class MockSynchronizer:
+    """The HTTP server; ``await start()`` then read ``port``."""
+
+    def __init__(self, nodes: int, *, latency: float = 0.0, latency_jitter: float = 0.0,
+                 error_rate: float = 0.0, drift: float = 0.5, seed: int = 0):
+        self.rng = random.Random(seed)
+        self.nodes = [MockNode(i, self.rng) for i in range(nodes)]
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.drift = drift
+        self.requests = 0
+        self.not_modified = 0
+        self.errors = 0
+        self.port: int | None = None
+        self._server: asyncio.AbstractServer | None = None
+
+    def base_url(self, index: int) -> str:
+        return f"http://127.0.0.1:{self.port}/n/{index}"
+
+    def inventory(self) -> list[dict]:
+        """Node list in ``core.fleet.load_inventory`` format."""
+        return [{"name": f"mock-{i:04d}", "api_base": self.base_url(i),
+                 "metrics_base": self.base_url(i)} for i in range(len(self.nodes))]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = await asyncio.start_server(self._serve, host, port, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    # ------------------------------------------------------------------ #
+    # HTTP
+    # ------------------------------------------------------------------ #
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await reader.readline()
+                if not request:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                parts = request.decode("latin-1").split()
+                status, extra, body = await self._respond(parts[1] if len(parts) > 1 else "/",
+                                                          headers)
+                writer.write((f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                              f"Content-Length: {len(body)}\r\n{extra}\r\n").encode() + body)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, target: str, headers: dict) -> tuple[str, str, bytes]:
+        self.requests += 1
+        if self.latency or self.latency_jitter:
+            await asyncio.sleep(max(0.0, self.latency + self.rng.uniform(
+                -self.latency_jitter, self.latency_jitter)))
+
+        # /n/<index>/<endpoint path>
+        parts = target.split("?")[0].split("/", 3)
+        node = payload = None
+        if len(parts) == 4 and parts[1] == "n" and parts[2].isdigit():
+            node = self.nodes[int(parts[2])] if int(parts[2]) < len(self.nodes) else None
+            path = "/" + parts[3]
+            payload = node.payload(path) if node is not None else None
+        if payload is None:
+            return "404 Not Found", "", b'{"error":"Not Found"}'
+        if self.rng.random() < self.error_rate:
+            self.errors += 1
+            return "503 Service Unavailable", "", b'{"error":"Service Unavailable"}'
+
+        if self.rng.random() < self.drift:
+            node.drift(path)
+            payload = node.payload(path)
+        body = json.dumps(payload).encode()
+        etag = '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+        if headers.get("if-none-match") == etag:
+            self.not_modified += 1
+            return "304 Not Modified", f"ETag: {etag}\r\n", b""
+        return "200 OK", f"ETag: {etag}\r\n", body
+
+
+# ---------------------------------------------------------------------- #
+# Stand-alone entrypoint
+# ---------------------------------------------------------------------- #
+def make_arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Mock synchronizer API for benchmarks")
+    p.add_argument("--nodes", type=int, default=1)
+    p.add_argument("--port", type=int, default=0, help="0 = any free port")
+    p.add_argument("--latency", type=float, default=0.0)
+    p.add_argument("--latency-jitter", type=float, default=0.0)
+    p.add_argument("--error-rate", type=float, default=0.0)
+    p.add_argument("--drift", type=float, default=0.5)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--inventory", metavar="FILE", default=None,
+                   help="Write a dashboard --inventory file for the simulated nodes")
+    return p
+
+
+async def _serve_forever(args) -> None:
+    server = MockSynchronizer(args.nodes, latency=args.latency,
+                              latency_jitter=args.latency_jitter,
+                              error_rate=args.error_rate, drift=args.drift, seed=args.seed)
+    await server.start(port=args.port)
+    if args.inventory:
+        with open(args.inventory, "w") as f:
+            json.dump({"nodes": server.inventory()}, f, indent=2)
+    # first line is machine-readable for the benchmark runner
+    print(f"READY {server.port}", flush=True)
+    await asyncio.Event().wait()
+
+
+def main() -> None:
+    try:
+        asyncio.run(_serve_forever(make_arg_parser().parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
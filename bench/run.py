@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Benchmark
+============
+Measure the dashboard's own cost against ``bench.mock_server``.
+
+For each fleet size (default 1, 10, 100 and 1000 nodes) a fresh child
+process starts the real ``DashboardApp`` headless against a mock server
+running in its own process (so the server's CPU is not counted), lets
+it settle for ``--warmup`` seconds and then samples for ``--duration``:
+
+    startup_ms          process start → first painted frame (imports included);
+                        checked against --startup-target-ms (exit status 1 if missed)
+    poll_to_paint_ms    changed values published → next frame painted (p50/p95/max)
+    cpu_ms_per_request  process CPU time per answered request
+    cpu_percent         process CPU time / wall time
+    requests_per_s      upstream requests answered (or failed)
+    frames_per_s        frames written to the terminal
+    terminal_kb_per_s   terminal output, what a slow SSH link has to carry
+    rss_mb              resident memory at the end of the run
+
+The app runs as ``dashboard.py`` would, under the same ``--max-fps``
+frame budget (default: the dashboard's). Textual's headless driver
+skips encoding frames, so a driver that encodes and counts them but
+writes nowhere stands in for the terminal. Requests are read from the
+scheduler's diagnostics and updates from the fleet's listeners.
+
+Usage::
+
+    python -m bench.run                                  # JSON report on stdout
+    python -m bench.run --nodes 1 100 --duration 30 --latency 0.05 \\
+        --error-rate 0.02 --drift 0.3 --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+T_PROCESS = time.perf_counter()
+
+# time-to-first-paint budget, process start → first frame, single node
+STARTUP_TARGET_MS = 500
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from dashboard import DEFAULT_MAX_FPS  # noqa: E402
+
+
+def percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"p50": None, "p95": None, "max": None, "count": 0}
+    values = sorted(values)
+
+    def at(q):
+        return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 3)
+
+    return {"p50": at(0.50), "p95": at(0.95), "max": round(values[-1] * 1000, 3),
+            "count": len(values)}
+
+
+def rss_mb() -> float:
+    """Current resident set size (falls back to the peak where /proc is missing)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+# ---------------------------------------------------------------------- #
+# Child: one fleet size
+# ---------------------------------------------------------------------- #
+def start_mock(args, nodes: int, inventory: str) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "bench.mock_server", "--nodes", str(nodes),
+           "--latency", str(args.latency), "--latency-jitter", str(args.latency_jitter),
+           "--error-rate", str(args.error_rate), "--drift", str(args.drift),
+           "--seed", str(args.seed), "--inventory", inventory]
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith("READY"):
+        proc.kill()
+        raise RuntimeError(f"mock server failed to start: {line!r}")
+    return proc
+
+
+async def measure(args, nodes: int) -> dict:
+    from core.fleet import load_inventory
+    from core.http_pool import HTTPPool
+    from core.scheduler import PollScheduler
+    from dashboard import cap_textual_fps
+
+    # before Textual is imported, as in dashboard.main
+    cap_textual_fps(args.max_fps)
+    with tempfile.TemporaryDirectory() as tmp:
+        inventory = os.path.join(tmp, "nodes.json")
+        mock = start_mock(args, nodes, inventory)
+        try:
+            return await _measure(args, load_inventory(inventory), HTTPPool, PollScheduler)
+        finally:
+            mock.terminate()
+            mock.wait()
+
+
+async def _measure(args, inventory, HTTPPool, PollScheduler) -> dict:
+    from textual.drivers.headless_driver import HeadlessDriver
+
+    from app import DashboardApp
+
+    frames = {"count": 0, "bytes": 0}
+    pending: list[float] = []
+    latencies: list[float] = []
+    first_paint: list[float] = []
+
+    class FrameCounter(HeadlessDriver):
+        """A terminal that takes every encoded frame and throws it away."""
+
+        @property
+        def is_headless(self) -> bool:
+            return False             # so Textual encodes and writes each frame
+
+        def write(self, data: str) -> None:
+            frames["bytes"] += len(data.encode())
+
+        def flush(self) -> None:
+            # one flush per displayed frame
+            now = time.perf_counter()
+            if not first_paint:
+                first_paint.append(now)
+            frames["count"] += 1
+            latencies.extend(now - t for t in pending)
+            pending.clear()
+
+    fleet_mode = len(inventory) > 1
+    # every simulated node shares one host:port, so lift the per-host cap
+    pool = HTTPPool(per_host=args.concurrency, max_connections=max(100, args.concurrency))
+    scheduler = PollScheduler(pool, concurrency=args.concurrency,
+                              jitter=0.2 if fleet_mode else 0.0)
+    app = DashboardApp(nodes=inventory, fleet_mode=fleet_mode,
+                       http_pool=pool, scheduler=scheduler, max_fps=args.max_fps,
+                       driver_class=FrameCounter)
+    app.fleet.add_listener(lambda node, section, data: pending.append(time.perf_counter()))
+
+    def requests() -> tuple[int, int]:
+        endpoints = scheduler.diagnostics.endpoints.values()
+        return sum(e.requests for e in endpoints), sum(e.errors for e in endpoints)
+
+    async with app.run_test(headless=False, size=(args.width, args.height)):
+        await asyncio.sleep(args.warmup)
+        sent, failed = requests()
+        frames.update(count=0, bytes=0)
+        latencies.clear()
+        wall, cpu = time.perf_counter(), time.process_time()
+        await asyncio.sleep(args.duration)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        sent, failed = (n - before for n, before in zip(requests(), (sent, failed)))
+        rss = rss_mb()
+
+    return {
+        "nodes": len(inventory),
+        "duration_s": round(wall, 3),
+        "startup_ms": round((first_paint[0] - T_PROCESS) * 1000, 1) if first_paint else None,
+        "poll_to_paint_ms": percentiles(latencies),
+        "paints": frames["count"],
+        "requests": sent,
+        "request_errors": failed,
+        "requests_per_s": round(sent / wall, 2),
+        "frames_per_s": round(frames["count"] / wall, 2),
+        "terminal_kb_per_s": round(frames["bytes"] / wall / 1024, 2),
+        "cpu_percent": round(100 * cpu / wall, 2),
+        "cpu_ms_per_request": round(1000 * cpu / sent, 3) if sent else None,
+        "rss_mb": rss,
+    }
+
+
+# ---------------------------------------------------------------------- #
+# Parent: run every size in its own process, collect a report
+# ---------------------------------------------------------------------- #
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_child(args, nodes: int) -> dict:
+    cmd = [sys.executable, "-m", "bench.run", "--child", str(nodes)] + [
+        f"--{k.replace('_', '-')}={v}" for k, v in vars(args).items()
+        if k not in ("nodes", "child", "output")
+    ]
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        return {"nodes": nodes, "error": lines[-1] if lines else "failed"}
+    return json.loads(proc.stdout)
+
+
+def make_arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Benchmark the dashboard against a mock fleet")
+    p.add_argument("--nodes", type=int, nargs="+", default=[1, 10, 100, 1000],
+                   help="Fleet sizes to measure (default: 1 10 100 1000)")
+    p.add_argument("--duration", type=float, default=20.0, help="Sampling seconds per size")
+    p.add_argument("--warmup", type=float, default=5.0, help="Seconds before sampling starts")
+    p.add_argument("--latency", type=float, default=0.01, help="Mock response delay, seconds")
+    p.add_argument("--latency-jitter", type=float, default=0.005)
+    p.add_argument("--error-rate", type=float, default=0.0, help="Mock 503 fraction")
+    p.add_argument("--drift", type=float, default=0.5, help="Mock payload change probability")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--concurrency", type=int, default=64)
+    p.add_argument("--max-fps", type=float, default=DEFAULT_MAX_FPS,
+                   help=f"Frame budget, as dashboard.py --max-fps (default: {DEFAULT_MAX_FPS:g})")
+    p.add_argument("--width", type=int, default=160)
+    p.add_argument("--height", type=int, default=50)
+    p.add_argument("--startup-target-ms", type=float, default=STARTUP_TARGET_MS,
+                   help=f"Time-to-first-paint budget (default: {STARTUP_TARGET_MS})")
+    p.add_argument("--output", metavar="FILE", default=None, help="Write JSON here, not stdout")
+    p.add_argument("--child", type=int, default=None, help=argparse.SUPPRESS)
+    return p
+
+
+def main() -> None:
+    args = make_arg_parser().parse_args()
+
+    if args.child is not None:
+        print(json.dumps(asyncio.run(measure(args, args.child))))
+        return
+
+    results = []
+    for nodes in args.nodes:
+        print(f"benchmarking {nodes} node(s)…", file=sys.stderr)
+        result = run_child(args, nodes)
+        if nodes == 1 and result.get("startup_ms") is not None:
+            result["startup_within_target"] = result["startup_ms"] <= args.startup_target_ms
+        results.append(result)
+
+    import textual
+    report = {
+        "schema": 2,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "textual": textual.__version__,
+        "params": {k: v for k, v in vars(args).items() if k not in ("child", "output")},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if any(r.get("startup_within_target") is False for r in results):
+        print(f"time to first paint over {args.startup_target_ms:g} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
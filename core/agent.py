@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Agent
+============
+Wire protocol and server side of the node agent (``agent.py``).
+
+The agent runs next to synchronizer-cli, polls its API on loopback and
+keeps one snapshot ``{path: payload}`` of every endpoint the dashboard
+uses. Dashboards connect once and stay connected. Instead of five
+authenticated polls per node they receive:
+
+    snapshot   the whole state, once per connection
+    delta      field-level changes since the previous message, batched
+               every ``FLUSH_EVERY`` seconds
+    ping       "still alive, nothing changed", every ``PING_EVERY`` s
+
+Connection::
+
+    client → agent   one JSON line  {"hello": "multisync-agent", "version": 1,
+                                     "password": "<web password>"}
+                     then JSON lines {"type": "invalidate", "paths": [...] | null}
+    agent → client   one zlib stream of JSON lines, sync-flushed per message
+
+The zlib window spans the whole connection, so repeated keys and values
+in consecutive deltas cost a few bytes each.
+
+A delta holds ``set``: ``[[path, key, …, value], …]`` and ``del``:
+``[[path, key, …], …]``. Dicts are diffed recursively; lists and scalars
+are replaced whole.
+"""
+
+import asyncio
+import contextlib
+import hmac
+import json
+import logging
+import time
+import zlib
+from typing import Mapping
+
+from core.extract import SECTION_TTL, SECTIONS
+
+HELLO = "multisync-agent"
+VERSION = 1
+DEFAULT_PORT = 3002
+
+FLUSH_EVERY = 0.5           # seconds a batch of changes is held before sending
+PING_EVERY = 15.0           # seconds of silence before a keep-alive ping
+HANDSHAKE_TIMEOUT = 10.0
+MAX_BUFFER = 1 << 20        # a client this far behind is dropped (it resyncs on reconnect)
+
+log = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+# ---------------------------------------------------------------------- #
+# Deltas
+# ---------------------------------------------------------------------- #
+def diff(old, new, prefix: list) -> tuple[list, list]:
+    """``(set, del)`` turning *old* into *new*, every entry prefixed by *prefix*."""
+    if not (isinstance(old, dict) and isinstance(new, dict)):
+        return ([] if old == new else [[*prefix, new]]), []
+    sets, dels = [], []
+    for key, value in new.items():
+        before = old.get(key, _MISSING)
+        if before is _MISSING:
+            sets.append([*prefix, key, value])
+        elif before != value:
+            s, d = diff(before, value, [*prefix, key])
+            sets += s
+            dels += d
+    dels += [[*prefix, key] for key in old.keys() - new.keys()]
+    return sets, dels
+
+
+def apply(state: dict, message: Mapping) -> set[str]:
+    """Apply a snapshot or delta *message* to *state*; returns the endpoint paths it touched."""
+    kind = message.get("type")
+    if kind == "snapshot":
+        state.clear()
+        state.update(message["data"])
+        return set(state)
+    if kind == "error":
+        raise ConnectionError(message.get("error") or "agent error")
+    if kind != "delta":
+        return set()
+    touched = set()
+    for *keys, value in message.get("set", ()):
+        touched.add(keys[0])
+        _walk(state, keys[:-1])[keys[-1]] = value
+    for keys in message.get("del", ()):
+        touched.add(keys[0])
+        _walk(state, keys[:-1]).pop(keys[-1], None)
+    return touched
+
+
+def _walk(state: dict, keys: list) -> dict:
+    for key in keys:
+        child = state.get(key)
+        if not isinstance(child, dict):
+            child = state[key] = {}
+        state = child
+    return state
+
+
+class Encoder:
+    """One compressed stream of JSON lines (agent → client)."""
+
+    def __init__(self):
+        self._zlib = zlib.compressobj(6)
+
+    def encode(self, message: Mapping) -> bytes:
+        line = json.dumps(message, separators=(",", ":")).encode() + b"\n"
+        return self._zlib.compress(line) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+
+class Decoder:
+    """Inverse of ``Encoder``: feed raw bytes, get whole messages back."""
+
+    def __init__(self):
+        self._zlib = zlib.decompressobj()
+        self._partial = b""
+
+    def feed(self, data: bytes) -> list[dict]:
+        lines = (self._partial + self._zlib.decompress(data)).split(b"\n")
+        self._partial = lines.pop()
+        return [json.loads(line) for line in lines if line]
+
+
+def hello(password: str) -> bytes:
+    return json.dumps({"hello": HELLO, "version": VERSION, "password": password}).encode() + b"\n"
+
+
+async def fetch_snapshot(address: str, password: str = "") -> dict[str, Mapping]:
+    """Connect to the agent at ``host:port``, return its snapshot ``{path: payload}``, hang up."""
+    host, _, port = address.rpartition(":")
+    reader, writer = await asyncio.open_connection(host, int(port))
+    try:
+        writer.write(hello(password))
+        decoder, state = Decoder(), {}
+        while data := await reader.read(1 << 16):
+            for message in decoder.feed(data):
+                apply(state, message)
+                if message.get("type") == "snapshot":
+                    return state
+        raise ConnectionError("agent closed the connection")
+    finally:
+        writer.close()
+
+
+def paths() -> dict[str, tuple[float, float | None]]:
+    """Every endpoint path the widgets use → ``(interval, ttl)``, tightest per path."""
+    out: dict[str, tuple[float, float | None]] = {}
+    for section, (section_paths, _, interval) in SECTIONS.items():
+        ttl = SECTION_TTL.get(section)
+        for path in section_paths:
+            if path not in out:
+                out[path] = (interval, ttl)
+                continue
+            old_interval, old_ttl = out[path]
+            out[path] = (min(interval, old_interval),
+                         None if ttl is None or old_ttl is None else min(ttl, old_ttl))
+    return out
+
+
+# ---------------------------------------------------------------------- #
+# Server
+# ---------------------------------------------------------------------- #
+class _Client:
+    __slots__ = ("writer", "encoder")
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.encoder = Encoder()
+
+    def send(self, message: Mapping) -> bool:
+        """Queue *message*; False if the client is too far behind to keep."""
+        if self.writer.transport.get_write_buffer_size() > MAX_BUFFER:
+            return False
+        self.writer.write(self.encoder.encode(message))
+        return True
+
+
+class AgentServer:
+    """
+    Subscribe every endpoint path of one node to *scheduler*
+    (a ``PollScheduler`` on loopback) and stream the merged state to
+    connected dashboards. *api_base* / *metrics_base* are the local base
+    URLs; *password* is both the API's web password and what clients
+    must present.
+    """
+
+    def __init__(self, scheduler, *, api_base: str, metrics_base: str, password: str = ""):
+        self.scheduler = scheduler
+        self.password = password
+        self.state: dict[str, Mapping] = {}     # path -> latest payload
+        self._sent: dict[str, Mapping] = {}     # path -> payload as of the last flush
+        self._dirty: set[str] = set()
+        self._clients: set[_Client] = set()
+        self._server: asyncio.base_events.Server | None = None
+        self._flusher: asyncio.Task | None = None
+        self._urls: dict[str, str] = {}         # url -> path
+
+        for path, (interval, ttl) in paths().items():
+            base = metrics_base if path == "/metrics" else api_base
+            url = base.rstrip("/") + path
+            self._urls[url] = path
+            scheduler.subscribe(url, self._receive, interval=interval, ttl=ttl,
+                                auth=("", password))
+
+    def _receive(self, url: str, payload: Mapping) -> None:
+        path = self._urls[url]
+        self.state[path] = payload
+        self._dirty.add(path)
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+    async def start(self, host: str, port: int) -> None:
+        self.scheduler.start()
+        self._server = await asyncio.start_server(self._serve, host, port)
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+        for client in list(self._clients):
+            client.writer.close()
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+        await self.scheduler.stop()
+
+    # ------------------------------------------------------------------ #
+    # Streaming
+    # ------------------------------------------------------------------ #
+    async def _flush_loop(self) -> None:
+        quiet = 0.0
+        while True:
+            await asyncio.sleep(FLUSH_EVERY)
+            if self._dirty:
+                sets, dels = [], []
+                for path in sorted(self._dirty):
+                    s, d = diff(self._sent.get(path, _MISSING), self.state[path], [path])
+                    sets += s
+                    dels += d
+                    self._sent[path] = self.state[path]
+                self._dirty.clear()
+                if sets or dels:
+                    self._broadcast({"type": "delta", "at": time.time(), "set": sets, "del": dels})
+                    quiet = 0.0
+                    continue
+            quiet += FLUSH_EVERY
+            if quiet >= PING_EVERY:
+                self._broadcast({"type": "ping", "at": time.time()})
+                quiet = 0.0
+
+    def _broadcast(self, message: Mapping) -> None:
+        for client in list(self._clients):
+            if not client.send(message):
+                log.warning("dropping a client that stopped reading")
+                self._clients.discard(client)
+                client.writer.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = _Client(writer)
+        try:
+            line = await asyncio.wait_for(reader.readline(), HANDSHAKE_TIMEOUT)
+            try:
+                greeting = json.loads(line)
+            except ValueError:
+                return
+            if not isinstance(greeting, dict) or greeting.get("hello") != HELLO:
+                return
+            if not hmac.compare_digest(str(greeting.get("password", "")).encode(),
+                                       self.password.encode()):
+                client.send({"type": "error", "error": "Authentication failed"})
+                await writer.drain()
+                return
+
+            client.send({"type": "snapshot", "at": time.time(), "data": self._sent})
+            self._clients.add(client)
+            while line := await reader.readline():
+                try:
+                    command = json.loads(line)
+                except ValueError:
+                    continue
+                if command.get("type") == "invalidate":
+                    wanted = command.get("paths")
+                    self.scheduler.invalidate(
+                        url for url, path in self._urls.items() if wanted is None or path in wanted)
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        except Exception:
+            log.exception("agent client failed")
+        finally:
+            self._clients.discard(client)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
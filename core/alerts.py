@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Alerts
+============
+Declarative alert rules, evaluated incrementally on the ``FleetState``
+stream.
+
+Rules file (JSON)::
+
+    {
+      "rules": [
+        {"name": "service-down", "section": "status", "field": "status",
+         "op": "!=", "value": "Running"},
+        {"name": "unreachable", "section": "status", "op": "error", "for": 60},
+        {"name": "qos-low", "section": "qos", "field": "score", "op": "<", "value": 50,
+         "for": 300, "clear": 60, "clear_for": 120, "severity": "critical"},
+        {"name": "reliability-blurb", "section": "qos", "field": "reliability_comment",
+         "op": "changed"},
+        {"name": "traffic-stopped", "section": "rates", "field": "in_rate",
+         "op": "<", "value": 1, "for": 120},
+        {"name": "points-stalled", "section": "rates", "field": "points_per_hour",
+         "op": "<=", "value": 0, "for": 900}
+      ],
+      "sinks": [
+        {"type": "file", "path": "~/multisync-alerts.jsonl"},
+        {"type": "command", "command": "notify-send \\"$ALERT_NODE\\" \\"$ALERT_MESSAGE\\""},
+        {"type": "webhook", "url": "http://127.0.0.1:9000/alerts"}
+      ]
+    }
+
+    section    status, performance, qos, points, rates or alerts; config too under
+               --headless (the TUI's fleet does not poll it, a warning says so)
+    op         < <= > >= == != against ``value``; ``changed`` (field differs from
+               the previous sample); ``error`` (the section failed to poll)
+    for        seconds the condition must hold before the alert fires (default 0)
+    clear      hysteresis: while firing, the condition is tested against this
+               value instead of ``value`` (fire below 50, clear at 60 …)
+    clear_for  seconds the condition must stay false before it resolves
+               (default 0; 300 for ``changed`` rules, whose condition is momentary)
+    severity   ``warning`` (default) or ``critical``
+
+Each (rule, node) pair is a small state machine – ok → pending → firing
+→ resolving → ok – and only the transitions into *firing* and back to
+*ok* emit an event, so repeated samples or a value flapping inside the
+hysteresis band never notify twice. A sample is checked against the
+rules for its section only, and ``check()`` walks just the pairs waiting
+on a ``for`` / ``clear_for`` timer: nothing rescans history, so the cost
+per sample is flat in fleet size.
+
+Events go to every sink and to ``add_listener`` callbacks, and the active
+alerts of a node are published back as its ``alerts`` FleetState section.
+"""
+
+import asyncio
+import json
+import logging
+import operator
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping
+
+from core.extract import SECTIONS
+from core.rates import DerivedMetrics
+
+log = logging.getLogger(__name__)
+
+OPS: dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+    "==": operator.eq, "!=": operator.ne,
+}
+SPECIAL_OPS = ("changed", "error")
+SEVERITIES = ("warning", "critical")
+
+# FleetState section the engine publishes active alerts under
+SECTION = "alerts"
+
+# sections a rule may watch: the polled ones plus derived rates and alerts
+RULE_SECTIONS = (*SECTIONS, DerivedMetrics.SECTION, SECTION)
+
+# default clear_for of "changed" rules, seconds
+CHANGED_HOLD = 300.0
+
+# seconds a command / webhook sink may take per event
+SINK_TIMEOUT = 10.0
+
+_UNSET = object()
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    section: str
+    op: str
+    field: str | None = None
+    value: Any = None
+    for_: float = 0.0
+    clear: Any = None
+    clear_for: float = 0.0
+    severity: str = "warning"
+
+    def describe(self, value) -> str:
+        if self.op == "error":
+            return f"{self.name}: {self.section} failing ({value})"
+        if self.op == "changed":
+            return f"{self.name}: {self.field} changed to {value!r}"
+        return f"{self.name}: {self.field} {self.op} {self.value!r} (now {value!r})"
+
+
+def parse_rule(i: int, spec: Mapping) -> Rule:
+    """One rules-file entry → ``Rule``; raises ``ValueError`` when malformed."""
+    name = spec.get("name") or f"rule-{i}"
+    op = spec.get("op")
+    if op not in OPS and op not in SPECIAL_OPS:
+        raise ValueError(f"alert rule {name!r}: unknown op {op!r}")
+    section = spec.get("section")
+    if not section:
+        raise ValueError(f"alert rule {name!r} has no 'section'")
+    if section not in RULE_SECTIONS:
+        raise ValueError(f"alert rule {name!r}: unknown section {section!r} "
+                         f"(choose from {', '.join(RULE_SECTIONS)})")
+    if op != "error" and not spec.get("field"):
+        raise ValueError(f"alert rule {name!r} has no 'field'")
+    if op in OPS and "value" not in spec:
+        raise ValueError(f"alert rule {name!r} has no 'value'")
+    severity = spec.get("severity", "warning")
+    if severity not in SEVERITIES:
+        raise ValueError(f"alert rule {name!r}: severity must be one of {SEVERITIES}")
+    return Rule(
+        name=str(name),
+        section=section,
+        op=op,
+        field=spec.get("field"),
+        value=spec.get("value"),
+        for_=float(spec.get("for", 0)),
+        clear=spec.get("clear"),
+        clear_for=float(spec.get("clear_for", CHANGED_HOLD if op == "changed" else 0)),
+        severity=severity,
+    )
+
+
+def load_alerts(path: str) -> tuple[list[Rule], list]:
+    """
+    Parse a rules file into ``(rules, sinks)``.
+    Raises ``ValueError`` on malformed entries or duplicate rule names.
+    """
+    with open(path) as f:
+        raw = json.load(f)
+    if isinstance(raw, list):
+        raw = {"rules": raw}
+
+    rules = [parse_rule(i, spec) for i, spec in enumerate(raw.get("rules", []))]
+    names = [r.name for r in rules]
+    duplicate = next((n for n in names if names.count(n) > 1), None)
+    if duplicate is not None:
+        raise ValueError(f"duplicate alert rule name: {duplicate!r}")
+    if not rules:
+        raise ValueError(f"alert file {path!r} lists no rules")
+
+    sinks = []
+    for i, spec in enumerate(raw.get("sinks", [])):
+        kind = spec.get("type")
+        if kind == "file" and spec.get("path"):
+            sinks.append(FileSink(os.path.expanduser(spec["path"])))
+        elif kind == "command" and spec.get("command"):
+            sinks.append(CommandSink(spec["command"]))
+        elif kind == "webhook" and spec.get("url"):
+            sinks.append(WebhookSink(spec["url"]))
+        else:
+            raise ValueError(f"alert sink #{i}: need type file+path, command+command "
+                             f"or webhook+url")
+    return rules, sinks
+
+
+# ---------------------------------------------------------------------- #
+# Sinks
+# ---------------------------------------------------------------------- #
+class FileSink:
+    """Append each event as one JSON line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = asyncio.Lock()          # events land in the order they fired
+
+    async def send(self, event: Mapping) -> None:
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        async with self._lock:
+            # file I/O off the event loop: a slow disk must not stall the UI
+            await asyncio.to_thread(self._append, line)
+
+    def _append(self, line: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class CommandSink:
+    """Run a shell command per event: ``ALERT_*`` variables set, JSON on stdin."""
+
+    def __init__(self, command: str):
+        self.command = command
+
+    async def send(self, event: Mapping) -> None:
+        env = {**os.environ, **{f"ALERT_{k.upper()}": str(v) for k, v in event.items()}}
+        proc = await asyncio.create_subprocess_shell(
+            self.command, env=env, stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            await asyncio.wait_for(proc.communicate(json.dumps(event).encode()), SINK_TIMEOUT)
+        except asyncio.TimeoutError:
+            proc.kill()
+            raise
+        if proc.returncode:
+            log.warning("alert command exited with %s", proc.returncode)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class WebhookSink:
+    """POST each event as JSON."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._client = None
+
+    async def send(self, event: Mapping) -> None:
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(timeout=SINK_TIMEOUT)
+        response = await self._client.post(self.url, json=event)
+        response.raise_for_status()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+
+
+# ---------------------------------------------------------------------- #
+# Engine
+# ---------------------------------------------------------------------- #
+class _State:
+    __slots__ = ("firing", "pending", "clearing", "last", "value")
+
+    def __init__(self):
+        self.firing = False
+        self.pending: float | None = None     # condition true since
+        self.clearing: float | None = None    # firing, condition false since
+        self.last = _UNSET                    # previous field value ("changed")
+        self.value = None                     # value that made the condition true
+
+
+class AlertEngine:
+    """Evaluate *rules* against every ``FleetState`` update."""
+
+    def __init__(self, fleet, rules: Iterable[Rule], *, sinks: Iterable = (), clock=None):
+        self._fleet = fleet
+        self._clock = clock or time.time
+        self.rules = list(rules)
+        self._sinks = list(sinks)
+        self._by_section: dict[str, list[Rule]] = {}
+        for rule in self.rules:
+            self._by_section.setdefault(rule.section, []).append(rule)
+            if rule.section in SECTIONS and rule.section not in fleet.sections:
+                log.warning("alert rule %r can never fire: section %r is not polled in "
+                            "this mode", rule.name, rule.section)
+
+        self._states: dict[tuple[str, str], _State] = {}
+        self._timed: set[tuple[str, str]] = set()        # waiting on for / clear_for
+        self._active: dict[str, dict[str, dict]] = {}    # node -> rule -> firing event
+        self._listeners: list[Callable[[dict], None]] = []
+        self._tasks: set[asyncio.Task] = set()
+        self._rules = {rule.name: rule for rule in self.rules}
+        fleet.add_listener(self._on_fleet_update)
+
+    def add_listener(self, callback: Callable[[dict], None]) -> None:
+        self._listeners.append(callback)
+
+    def active(self, node: str | None) -> dict[str, dict]:
+        """Firing alerts of *node*, rule name → event."""
+        return self._active.get(node, {})
+
+    # ------------------------------------------------------------------ #
+    # Evaluation
+    # ------------------------------------------------------------------ #
+    def _on_fleet_update(self, node: str, section: str, data: Mapping) -> None:
+        rules = self._by_section.get(section)
+        if not rules:
+            return
+        now = self._clock()
+        for rule in rules:
+            key = (rule.name, node)
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _State()
+            holds = self._condition(rule, state, data)
+            if holds is not None:
+                self._advance(rule, node, state, holds, now)
+
+    def _condition(self, rule: Rule, state: _State, data: Mapping) -> bool | None:
+        """Does *data* meet the rule? None = cannot tell, leave the state alone."""
+        if rule.op == "error":
+            if "error" not in data:
+                return False
+            state.value = data["error"]
+            return True
+        if "error" in data:
+            return None
+        value = data.get(rule.field)
+        if rule.op == "changed":
+            previous, state.last = state.last, value
+            if previous is _UNSET or previous == value:
+                return False
+            state.value = value
+            return True
+        if value is None:
+            return None
+        threshold = rule.clear if state.firing and rule.clear is not None else rule.value
+        try:
+            holds = OPS[rule.op](value, threshold)
+        except TypeError:
+            return None
+        if holds:
+            state.value = value
+        return holds
+
+    def _advance(self, rule: Rule, node: str, state: _State, holds: bool, now: float) -> None:
+        key = (rule.name, node)
+        if holds:
+            state.clearing = None
+            if not state.firing:
+                if state.pending is None:
+                    state.pending = now
+                if now - state.pending >= rule.for_:
+                    self._fire(rule, node, state, now)
+                else:
+                    self._timed.add(key)
+            if rule.op == "changed" and state.firing:
+                # the condition is momentary: start the hold at once
+                state.clearing = now
+                self._timed.add(key)
+            elif state.firing:
+                self._timed.discard(key)
+            return
+
+        state.pending = None
+        if not state.firing:
+            self._timed.discard(key)
+            return
+        if state.clearing is None:
+            state.clearing = now
+        if now - state.clearing >= rule.clear_for:
+            self._resolve(rule, node, state, now)
+        else:
+            self._timed.add(key)
+
+    def check(self, now: float | None = None) -> None:
+        """Fire / resolve the pairs whose ``for`` / ``clear_for`` ran out."""
+        if not self._timed:
+            return
+        now = self._clock() if now is None else now
+        for key in list(self._timed):
+            name, node = key
+            rule, state = self._rules[name], self._states[key]
+            if not state.firing and state.pending is not None:
+                if now - state.pending >= rule.for_:
+                    self._fire(rule, node, state, now)
+            elif state.firing and state.clearing is not None:
+                if now - state.clearing >= rule.clear_for:
+                    self._resolve(rule, node, state, now)
+
+    # ------------------------------------------------------------------ #
+    # Transitions
+    # ------------------------------------------------------------------ #
+    def _fire(self, rule: Rule, node: str, state: _State, now: float) -> None:
+        state.firing, state.pending = True, None
+        if state.clearing is None:
+            self._timed.discard((rule.name, node))
+        event = self._event(rule, node, "firing", state.value, now)
+        self._active.setdefault(node, {})[rule.name] = event
+        self._emit(node, event)
+
+    def _resolve(self, rule: Rule, node: str, state: _State, now: float) -> None:
+        state.firing, state.clearing = False, None
+        self._timed.discard((rule.name, node))
+        self._active.get(node, {}).pop(rule.name, None)
+        self._emit(node, self._event(rule, node, "resolved", state.value, now))
+
+    @staticmethod
+    def _event(rule: Rule, node: str, state: str, value, now: float) -> dict:
+        return {
+            "ts": now,
+            "node": node,
+            "rule": rule.name,
+            "state": state,
+            "severity": rule.severity,
+            "section": rule.section,
+            "field": rule.field,
+            "value": value,
+            "message": f"{node}: {rule.describe(value)}",
+        }
+
+    def _emit(self, node: str, event: dict) -> None:
+        active = self._active.get(node, {})
+        self._fleet.publish(node, SECTION, {
+            "firing": tuple(sorted(active)),
+            "critical": any(e["severity"] == "critical" for e in active.values()),
+        })
+        for callback in self._listeners:
+            callback(event)
+        for sink in self._sinks:
+            self._spawn(sink, event)
+
+    def _spawn(self, sink, event: dict) -> None:
+        try:
+            task = asyncio.get_running_loop().create_task(self._deliver(sink, event))
+        except RuntimeError:
+            log.warning("no event loop, alert not delivered: %s", event["message"])
+            return
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    async def _deliver(sink, event: dict) -> None:
+        try:
+            await sink.send(event)
+        except Exception as e:
+            log.warning("alert sink %s failed: %s", type(sink).__name__, e)
+
+    async def aclose(self) -> None:
+        """Let in-flight deliveries finish (bounded), then close the sinks."""
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=SINK_TIMEOUT)
+        for sink in self._sinks:
+            await sink.aclose()
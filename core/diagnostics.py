@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Diagnostics
+============
+Cheap, always-on self-measurement: is the node's API slow, or is it us?
+
+Every observation is one ``bisect`` into a fixed, log-spaced bucket
+array – no per-sample storage, O(1) memory per series – so recording
+costs well under a microsecond and nothing is rendered until the
+diagnostics panel is opened.
+
+    endpoint stats   keyed by endpoint path (``/api/status`` …), all nodes pooled:
+                     request latency, errors, timeouts, 304s, payload bytes,
+                     circuit-breaker openings
+    widget stats     keyed by widget class: extract_data and render_content time
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from urllib.parse import urlsplit
+
+from core.extract import SECTIONS
+
+# endpoint paths the dashboard knows, longest first so suffix matching is exact
+_KNOWN_PATHS = sorted({p for paths, _, _ in SECTIONS.values() for p in paths},
+                      key=len, reverse=True)
+
+
+def endpoint_key(url: str) -> str:
+    """``http://host:3000/api/status`` → ``/api/status`` (proxy prefixes dropped)."""
+    path = urlsplit(url).path
+    for known in _KNOWN_PATHS:
+        if path.endswith(known):
+            return known
+    return path or "/"
+
+
+class Histogram:
+    """Log-bucketed histogram with percentile estimates."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, lo: float, hi: float, factor: float = 1.25):
+        steps = math.ceil(math.log(hi / lo, factor))
+        self.bounds = [lo * factor ** i for i in range(steps + 1)]
+        # one extra bucket catches everything above *hi*
+        self.counts = array("L", bytes(array("L").itemsize * (len(self.bounds) + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def merge(self, other: "Histogram") -> None:
+        """Add *other*'s observations (same bounds) into this histogram."""
+        for i, n in enumerate(other.counts):
+            if n:
+                self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the *q*-quantile (capped at the max seen)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                bound = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(bound, self.max)
+        return self.max
+
+
+class EndpointStats:
+    __slots__ = ("latency", "size", "errors", "timeouts", "not_modified", "breaker_opens")
+
+    def __init__(self):
+        self.latency = Histogram(0.0005, 60.0)       # seconds
+        self.size = Histogram(64, 16 * 1024 * 1024, 2.0)  # bytes
+        self.errors = 0
+        self.timeouts = 0
+        self.not_modified = 0
+        self.breaker_opens = 0
+
+    @property
+    def requests(self) -> int:
+        return self.latency.count
+
+    def merge(self, other: "EndpointStats") -> None:
+        self.latency.merge(other.latency)
+        self.size.merge(other.size)
+        self.errors += other.errors
+        self.timeouts += other.timeouts
+        self.not_modified += other.not_modified
+        self.breaker_opens += other.breaker_opens
+
+
+class WidgetStats:
+    __slots__ = ("extract", "render")
+
+    def __init__(self):
+        self.extract = Histogram(0.00001, 10.0)      # seconds
+        self.render = Histogram(0.00001, 10.0)
+
+
+class Diagnostics:
+    """Registry the scheduler and widgets report into."""
+
+    def __init__(self):
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.widgets: dict[str, WidgetStats] = {}
+
+    def endpoint(self, url: str) -> EndpointStats:
+        key = endpoint_key(url)
+        stats = self.endpoints.get(key)
+        if stats is None:
+            stats = self.endpoints[key] = EndpointStats()
+        return stats
+
+    def merge(self, other: "Diagnostics") -> None:
+        """Fold endpoint stats recorded elsewhere (a poll worker) into these."""
+        for key, stats in other.endpoints.items():
+            if key in self.endpoints:
+                self.endpoints[key].merge(stats)
+            else:
+                self.endpoints[key] = stats
+
+    def widget(self, name: str) -> WidgetStats:
+        stats = self.widgets.get(name)
+        if stats is None:
+            stats = self.widgets[name] = WidgetStats()
+        return stats
+
+    # ------------------------------------------------------------------ #
+    # Recording hooks
+    # ------------------------------------------------------------------ #
+    def request(self, url: str, seconds: float, *, status: int | None = None,
+                size: int | None = None, error: bool = False, timeout: bool = False) -> None:
+        stats = self.endpoint(url)
+        stats.latency.add(seconds)
+        if size is not None:
+            stats.size.add(size)
+        if status == 304:
+            stats.not_modified += 1
+        if error or timeout or (status is not None and status >= 400):
+            stats.errors += 1
+        if timeout:
+            stats.timeouts += 1
+
+    def extracted(self, widget: str, seconds: float) -> None:
+        self.widget(widget).extract.add(seconds)
+
+    def rendered(self, widget: str, seconds: float) -> None:
+        self.widget(widget).render.add(seconds)
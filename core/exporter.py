@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Exporter
+============
+Serve what the dashboard already polls as OpenMetrics text on a local
+``/metrics`` endpoint, labelled by node, so Prometheus scrapes one
+aggregator instead of every synchronizer's authenticated API.
+
+Output is built purely from ``FleetState`` rows – a scrape never causes
+an upstream request. Sample lines are cached per node and rebuilt only
+when that node's section changes; uptime is the one value computed at
+scrape time (from the parsed container start).
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Mapping
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# (family, type, help, section, key in the extracted dict, extra labels)
+METRICS = (
+    ("multisync_up", "gauge", "1 if the synchronizer service is running",
+     "status", "status", {}),
+    ("multisync_start_time_seconds", "gauge", "Container start, seconds since the epoch",
+     "status", "started_at", {}),
+    ("multisync_qos_score", "gauge", "QoS score in percent",
+     "qos", "score", {"component": "overall"}),
+    ("multisync_qos_score", "gauge", "QoS score in percent",
+     "qos", "reliability", {"component": "reliability"}),
+    ("multisync_qos_score", "gauge", "QoS score in percent",
+     "qos", "availability", {"component": "availability"}),
+    ("multisync_qos_score", "gauge", "QoS score in percent",
+     "qos", "efficiency", {"component": "efficiency"}),
+    ("multisync_traffic_bytes", "counter", "Bytes relayed since the container started",
+     "performance", "in", {"direction": "in"}),
+    ("multisync_traffic_bytes", "counter", "Bytes relayed since the container started",
+     "performance", "out", {"direction": "out"}),
+    ("multisync_sessions", "counter", "Sessions served since the container started",
+     "performance", "sessions", {}),
+    ("multisync_users", "gauge", "Users currently connected",
+     "performance", "users", {}),
+    ("multisync_points", "gauge", "Points earned",
+     "points", "life_total", {"kind": "wallet_lifetime"}),
+    ("multisync_points", "gauge", "Points earned",
+     "points", "session_total", {"kind": "sync_lifetime"}),
+    ("multisync_rank", "gauge", "Leaderboard rank",
+     "points", "rank", {}),
+    ("multisync_multiplier", "gauge", "Points multiplier",
+     "points", "multiplier", {}),
+)
+
+UPTIME = ("multisync_uptime_seconds", "gauge", "Seconds since the container started")
+ERRORS = ("multisync_node_error", "gauge", "1 if the last poll of any section failed")
+
+# sections whose updates can change the exposition (config: errors only)
+_SECTIONS = {section for _, _, _, section, _, _ in METRICS} | {"config"}
+
+# family -> (type, help), in output order
+_FAMILIES: dict[str, tuple[str, str]] = {}
+for _family, _type, _help, *_ in METRICS:
+    _FAMILIES.setdefault(_family, (_type, _help))
+for _family, _type, _help in (UPTIME, ERRORS):
+    _FAMILIES[_family] = (_type, _help)
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _number(key: str, value) -> float | None:
+    if key == "status":
+        return None if value is None else float(value == "Running")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _sample(family: str, labels: Mapping[str, str], value: float) -> str:
+    name = family + "_total" if _FAMILIES[family][0] == "counter" else family
+    body = ",".join(f'{k}="{escape_label(v)}"' for k, v in labels.items())
+    text = str(int(value)) if value.is_integer() else repr(value)
+    return f"{name}{{{body}}} {text}"
+
+
+class MetricsExporter:
+    """OpenMetrics view of a ``FleetState``, optionally served over HTTP."""
+
+    def __init__(self, fleet, *, clock=None):
+        self._fleet = fleet
+        self._clock = clock or time.time
+        # node -> family -> sample lines
+        self._lines: dict[str, dict[str, list[str]]] = {}
+        self._server: asyncio.AbstractServer | None = None
+        for name in fleet.nodes:
+            self._rebuild(name)
+        fleet.add_listener(self._on_fleet_update)
+
+    def _on_fleet_update(self, node: str, section: str, data: Mapping) -> None:
+        if section in _SECTIONS:
+            self._rebuild(node)
+
+    def _rebuild(self, name: str) -> None:
+        row = self._fleet.rows[name]
+        lines: dict[str, list[str]] = {}
+        for family, _, _, section, key, extra in METRICS:
+            value = _number(key, row.get(section, {}).get(key))
+            if value is not None:
+                lines.setdefault(family, []).append(_sample(family, {"node": name, **extra}, value))
+        failed = any("error" in data for data in row.values())
+        lines[ERRORS[0]] = [_sample(ERRORS[0], {"node": name}, float(failed))]
+        self._lines[name] = lines
+
+    # ------------------------------------------------------------------ #
+    # Rendering
+    # ------------------------------------------------------------------ #
+    def render(self) -> str:
+        """The whole exposition, ``# EOF`` terminated."""
+        now = self._clock()
+        out = []
+        for family, (kind, help_text) in _FAMILIES.items():
+            out.append(f"# TYPE {family} {kind}")
+            out.append(f"# HELP {family} {help_text}")
+            if family == UPTIME[0]:
+                for name in self._fleet.nodes:
+                    start = self._fleet.rows[name].get("status", {}).get("started_at")
+                    if start is not None:
+                        out.append(_sample(family, {"node": name}, float(max(0, int(now - start)))))
+                continue
+            for name in self._fleet.nodes:
+                out.extend(self._lines[name].get(family, ()))
+        out.append("# EOF\n")
+        return "\n".join(out)
+
+    # ------------------------------------------------------------------ #
+    # HTTP
+    # ------------------------------------------------------------------ #
+    async def start(self, host: str, port: int) -> None:
+        self._server = await asyncio.start_server(self._serve, host, port)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readline(), 10)
+            while (await asyncio.wait_for(reader.readline(), 10)) not in (b"\r\n", b"\n", b""):
+                pass  # headers are not needed
+            parts = request.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] in ("GET", "HEAD") and parts[1].split("?")[0] == "/metrics":
+                status, ctype, body = "200 OK", CONTENT_TYPE, self.render().encode()
+            else:
+                status, ctype, body = "404 Not Found", "text/plain; charset=utf-8", b"Not Found\n"
+            head = (f"HTTP/1.1 {status}\r\nContent-Type: {ctype}\r\n"
+                    f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode()
+            writer.write(head if parts and parts[0] == "HEAD" else head + body)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        except Exception:
+            logging.getLogger(__name__).exception("exporter request failed")
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
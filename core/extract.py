@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Extractors
+============
+Pure, Textual-free versions of the widgets' ``extract_data`` logic.
+
+Each ``extract_*`` turns raw API payload(s) into the flat dict a widget
+renders. Widgets, the fleet summary and any non-TUI consumer share
+these so every view agrees on what a node reports.
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Mapping
+
+
+# ---------------------------------------------------------------------- #
+# Formatting helpers
+# ---------------------------------------------------------------------- #
+def convert_bytes(size_in_bytes):
+    """Convert bytes to KB, MB, or GB, rounded to 2 decimal places."""
+    KB = 1024
+    MB = KB * 1024
+    GB = MB * 1024
+
+    if size_in_bytes >= GB:
+        return f"{size_in_bytes / GB:.2f} GB"
+    elif size_in_bytes >= MB:
+        return f"{size_in_bytes / MB:.2f} MB"
+    elif size_in_bytes >= KB:
+        return f"{size_in_bytes / KB:.2f} KB"
+    else:
+        return f"{size_in_bytes} B"
+
+
+def score_translate(score: int) -> int:
+    """Convert API score code (0, 1, 2) → percentage (100 %, 66 %, 33 %)."""
+    return (3 - score) * 100 // 3 if score in (0, 1, 2) else 0
+
+
+def parse_timestamp(timestamp: str) -> datetime | None:
+    """
+    Parse an API timestamp; None if unparsable.
+
+    The stdlib handles the ISO 8601 the API sends; ``dateutil`` (slow to
+    import) is only loaded for anything more exotic.
+    """
+    if not isinstance(timestamp, str):
+        return None
+    try:
+        return datetime.fromisoformat(timestamp)
+    except ValueError:
+        pass
+    from dateutil import parser
+    try:
+        return parser.parse(timestamp)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def _epoch(dt: datetime | None) -> float | None:
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _human_utc(dt: datetime | None) -> str:
+    return "N/A" if dt is None else dt.strftime("%b %-d, %Y %H:%M UTC")
+
+
+def started_at(timestamp: str) -> float | None:
+    """ISO *timestamp* (naive = UTC) → epoch seconds; None if unparsable."""
+    return _epoch(parse_timestamp(timestamp))
+
+
+def seconds_since(epoch: float | None, now: float | None = None) -> int | None:
+    """Whole seconds from *epoch* to *now* (default: current time, clamped at 0); None if unknown."""
+    if epoch is None:
+        return None
+    return max(0, int((time.time() if now is None else now) - epoch))
+
+
+def uptime_seconds(timestamp: str) -> int | None:
+    """Seconds elapsed since ISO *timestamp* (naive = UTC); None if unparsable."""
+    return seconds_since(started_at(timestamp))
+
+
+def format_duration(total_seconds: int | None) -> str:
+    """Seconds → compact ``1d 2h 3m 4s`` (``N/A`` when unknown)."""
+    if total_seconds is None:
+        return "N/A"
+    days, rem = divmod(total_seconds, 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes, seconds = divmod(rem, 60)
+
+    parts = []
+    if days > 0:
+        parts.append(f"{days}d")
+    if hours > 0:
+        parts.append(f"{hours}h")
+    if minutes > 0:
+        parts.append(f"{minutes}m")
+    parts.append(f"{seconds}s")
+
+    return " ".join(parts)
+
+
+def uptime(timestamp: str) -> str:
+    return format_duration(uptime_seconds(timestamp))
+
+
+def date_to_human_utc(timestamp: str) -> str:
+    return _human_utc(parse_timestamp(timestamp))
+
+
+# ---------------------------------------------------------------------- #
+# Extractors – one per widget
+# ---------------------------------------------------------------------- #
+def extract_status(payload: Mapping) -> dict:
+    """/api/status → StatusWidget fields."""
+    if "error" in payload:
+        return {"error": payload["error"]}
+    # timestamps are parsed once here; widgets age them on a local clock
+    start = started_at(payload.get("uptime"))
+    seconds = seconds_since(start)
+    image_updates = payload.get("imageUpdates", {})
+    checked = parse_timestamp(image_updates.get("lastChecked"))
+    return {
+        "status": "Running" if payload.get("serviceStatus") == "running" else "Not Running",
+        "docker": "Available" if payload.get("dockerAvailable") else "Not Available",
+        "autostart": "Enabled" if payload.get("autoStart") else "Not Enabled",
+        "uptime": format_duration(seconds),
+        "uptime_seconds": seconds,
+        "started_at": start,
+        "image_updates": image_updates.get("available", "N/A"),
+        "last_checked": _human_utc(checked),
+        "last_checked_at": _epoch(checked),
+    }
+
+
+def extract_performance(payload: Mapping) -> dict:
+    """/api/performance → PerformanceWidget fields."""
+    if "error" in payload:
+        return {"error": payload["error"]}
+    p = payload.get("performance", {})
+    return {
+        "total": p.get("totalTraffic"),
+        "sessions": p.get("sessions"),
+        "in": p.get("bytesIn"),
+        "out": p.get("bytesOut"),
+        "users": p.get("users"),
+    }
+
+
+def extract_qos(payload: Mapping) -> dict:
+    """/api/performance → QOSWidget fields."""
+    if "error" in payload:
+        return {"error": payload["error"]}
+    qos = payload.get("qos", {})
+
+    reliability  = score_translate(qos.get("reliability"))
+    availability = score_translate(qos.get("availability"))
+    efficiency   = score_translate(qos.get("efficiency"))
+    blurbs = qos.get("ratingsBlurbs", {})
+    blurbs = blurbs if blurbs else {}
+
+    return {
+        "score": (reliability + availability + efficiency) // 3,
+        "reliability": reliability,
+        "availability": availability,
+        "efficiency": efficiency,
+        "reliability_comment":   blurbs.get("reliability", ""),
+        "availability_comment":  blurbs.get("availability", ""),
+        "efficiency_comment":    blurbs.get("efficiency", ""),
+    }
+
+
+def extract_points(payload: Mapping) -> dict:
+    """/api/points → PointsWidget fields."""
+    if "error" in payload:
+        return {"error": payload["error"]}
+    points = payload.get("points", {})
+    return {
+        "life_total": payload.get("walletLifePoints", 0),
+        "session_total": payload.get("syncLifePoints", 0),
+        "rank": points.get("rank", 0),
+        "multiplier": points.get("multiplier", 0),
+    }
+
+
+def extract_config(metrics: Mapping, versions: Mapping) -> dict:
+    """/metrics + /api/versions → ConfigWidget fields."""
+    # bubble up any upstream errors
+    for name, payload in (("metrics", metrics), ("versions", versions)):
+        if "error" in payload:
+            return {"error": f"{name}: {payload['error']}"}
+
+    sync = metrics.get("synchronizer", {})
+    sys = metrics.get("system", {})
+    other = versions.get("versions", {})
+
+    return {
+        "sync_hash": sync.get("syncHash", "N/A"),
+        "wallet": sync.get("wallet", "N/A"),
+        "hostname": sys.get("hostname", "N/A"),
+        "os_platform": f"{sys.get('platform', '')} {sys.get('arch', '')}".strip(),
+        "cli": metrics.get("version", "N/A"),
+        "docker_image": other.get("dockerImage", "N/A"),
+        "container": other.get("containerImage", "N/A"),
+        "reflector": other.get("reflectorVersion", "N/A"),
+        "launcher": other.get("launcher", "N/A"),
+    }
+
+
+def diff_fields(old: Mapping | None, new: Mapping) -> set[str]:
+    """Keys whose value differs between two extracted dicts (all keys if *old* is None)."""
+    if old is None:
+        return set(new)
+    return {k for k in old.keys() | new.keys() if old.get(k, diff_fields) != new.get(k, diff_fields)}
+
+
+# section name -> (endpoint paths, extractor, default poll interval in s)
+SECTIONS = {
+    "status":      (("/api/status",), extract_status, 10),
+    "performance": (("/api/performance",), extract_performance, 5),
+    "qos":         (("/api/performance",), extract_qos, 5),
+    "points":      (("/api/points",), extract_points, 15),
+    "config":      (("/metrics", "/api/versions"), extract_config, 10),
+}
+
+# section name -> seconds a successful response may be reused before it
+# is fetched again (near-static data that only changes on redeploys)
+SECTION_TTL = {
+    "config": 300,
+}
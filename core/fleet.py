@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Fleet
+============
+Node inventory plus a live, per-node view of what the scheduler polls.
+
+Inventory file (JSON) – either a bare list of nodes or::
+
+    {
+      "defaults": {"api_port": 3000, "metrics_port": 3001, "password": "..."},
+      "nodes": [
+        {"name": "eu-1", "host": "10.0.0.5"},
+        {"name": "us-1", "host": "10.1.0.7", "api_port": 4000, "password": "..."}
+      ]
+    }
+
+Instead of ``host`` a node may give full ``api_base`` / ``metrics_base``
+URLs (``metrics_base`` defaults to ``api_base``). A node running the
+agent (``agent.py``) adds ``"agent": "HOST:PORT"`` (or just a port on
+``host``); its data then streams from there instead of being polled.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Callable, Iterable, Mapping
+
+from core.extract import SECTION_TTL, SECTIONS, diff_fields
+
+# sections the fleet summary needs for every node
+SUMMARY_SECTIONS = ("status", "performance", "qos", "points")
+
+# status fields that signal a restart / redeploy: when one moves, cached
+# near-static responses (versions, system info) are fetched again
+REDEPLOY_FIELDS = ("started_at", "image_updates", "last_checked")
+
+
+def _tightest(a: float | None, b: float | None) -> float | None:
+    """Smaller of two optional intervals (None = no preference)."""
+    if a is None or b is None:
+        return b if a is None else a
+    return min(a, b)
+
+
+@dataclass(frozen=True)
+class Node:
+    """One synchronizer node and the two base URLs it exposes."""
+
+    name: str
+    api_base: str
+    metrics_base: str
+    password: str = ""
+    agent: str = ""               # "host:port" of its agent.py, if any
+
+    @property
+    def auth(self) -> tuple[str, str]:
+        return ("", self.password)
+
+    def url(self, path: str) -> str:
+        """Full URL for an endpoint *path* (``/metrics`` lives on its own port)."""
+        base = self.metrics_base if path == "/metrics" else self.api_base
+        return base.rstrip("/") + path
+
+
+def load_inventory(path: str, *, default_password: str = "") -> list[Node]:
+    """
+    Parse an inventory file into ``Node`` objects.
+    Raises ``ValueError`` on malformed entries or duplicate names.
+    """
+    with open(path) as f:
+        raw = json.load(f)
+
+    if isinstance(raw, list):
+        raw = {"nodes": raw}
+    defaults = {"api_port": 3000, "metrics_port": 3001, "password": default_password}
+    defaults.update(raw.get("defaults", {}))
+
+    nodes: list[Node] = []
+    seen: set[str] = set()
+    for i, entry in enumerate(raw.get("nodes", [])):
+        spec = {**defaults, **entry}
+        host = spec.get("host")
+        if host:
+            host = host.split("://", 1)[-1].rstrip("/")
+        elif not spec.get("api_base"):
+            raise ValueError(f"inventory entry #{i} has no 'host'")
+
+        # explicit base URLs (e.g. behind a path-prefixing proxy) win over host:port
+        api_base = spec.get("api_base") or f"http://{host}:{int(spec['api_port'])}"
+        metrics_base = spec.get("metrics_base") or (
+            f"http://{host}:{int(spec['metrics_port'])}" if host else api_base)
+
+        name = str(spec.get("name") or host or api_base)
+        if name in seen:
+            raise ValueError(f"duplicate node name in inventory: {name!r}")
+        seen.add(name)
+
+        agent = str(spec.get("agent") or "")
+        if agent and ":" not in agent:
+            if not host:
+                raise ValueError(f"inventory entry #{i}: agent port without a 'host'")
+            agent = f"{host}:{agent}"
+
+        nodes.append(Node(
+            name=name,
+            api_base=api_base.rstrip("/"),
+            metrics_base=metrics_base.rstrip("/"),
+            password=spec.get("password") or "",
+            agent=agent,
+        ))
+    if not nodes:
+        raise ValueError(f"inventory {path!r} lists no nodes")
+    return nodes
+
+
+class FleetState:
+    """
+    Subscribe every node's endpoints to the scheduler and keep the
+    latest extracted section dicts per node.
+
+    ``rows[node][section]`` holds what the matching widget would show;
+    listeners are called with ``(node_name, section, data)`` only when a
+    field actually changed. Idle listeners hear ``(node_name, path)``
+    when a poll came back identical to the previous one.
+
+    A node restart or image update seen in its status expires the
+    scheduler's cached config endpoints (``/metrics``, ``/api/versions``).
+
+    ``seed`` fills ``warm[node][section]`` from a persisted snapshot; views
+    read ``row(node)``, where the first good live value replaces warm data
+    section by section (errors before it leave the warm value showing). Warm values never reach listeners (no history or rates from
+    old samples).
+
+    With ``poll=False`` nothing is subscribed: sections arrive already
+    extracted through ``publish`` / ``idle`` (e.g. from ``core.shards``).
+    """
+
+    def __init__(self, scheduler, nodes: Iterable[Node],
+                 sections: Iterable[str] = SUMMARY_SECTIONS,
+                 bounds: Mapping[str, tuple[float, float]] | None = None,
+                 poll: bool = True):
+        self.scheduler = scheduler
+        self.nodes: dict[str, Node] = {n.name: n for n in nodes}
+        self.sections = tuple(sections)
+        # section -> (min, max) adaptive poll interval
+        self.bounds = dict(bounds or {})
+
+        self.rows: dict[str, dict[str, Mapping]] = {name: {} for name in self.nodes}
+        self.warm: dict[str, dict[str, Mapping]] = {name: {} for name in self.nodes}
+        self._payloads: dict[str, dict[str, Mapping]] = {name: {} for name in self.nodes}
+        self._listeners: list[Callable[[str, str, Mapping], None]] = []
+        self._idle_listeners: list[Callable[[str, str], None]] = []
+        # url -> [(node name, path)] (two entries may point at one host)
+        self._routes: dict[str, list[tuple[str, str]]] = {}
+        self._tokens: list[int] = []
+        self._deploys: dict[str, tuple] = {}   # node -> REDEPLOY_FIELDS values
+
+        for node in self.nodes.values() if poll else ():
+            for path, (interval, lo, hi, ttl) in self._paths().items():
+                url = node.url(path)
+                routes = self._routes.setdefault(url, [])
+                if not routes:
+                    self._tokens.append(
+                        scheduler.subscribe(url, self._receive, interval=interval,
+                                            min_interval=lo, max_interval=hi, ttl=ttl,
+                                            auth=node.auth, on_unchanged=self._unchanged)
+                    )
+                routes.append((node.name, path))
+
+    def _paths(self) -> dict[str, tuple]:
+        """
+        Every endpoint path the chosen sections need, as
+        ``(interval, min, max, ttl)`` – the tightest of the sections sharing
+        it; one section wanting live data disables the TTL.
+        """
+        paths: dict[str, tuple] = {}
+        for section in self.sections:
+            section_paths, _, interval = SECTIONS[section]
+            lo, hi = self.bounds.get(section, (None, None))
+            ttl = SECTION_TTL.get(section)
+            for path in section_paths:
+                if path not in paths:
+                    paths[path] = (interval, lo, hi, ttl)
+                    continue
+                old_interval, old_lo, old_hi, old_ttl = paths[path]
+                paths[path] = (
+                    min(interval, old_interval), _tightest(lo, old_lo), _tightest(hi, old_hi),
+                    None if ttl is None or old_ttl is None else min(ttl, old_ttl),
+                )
+        return paths
+
+    # ------------------------------------------------------------------ #
+    # Listeners
+    # ------------------------------------------------------------------ #
+    def add_listener(self, callback: Callable[[str, str, Mapping], None]) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def add_idle_listener(self, callback: Callable[[str, str], None]) -> None:
+        self._idle_listeners.append(callback)
+
+    def close(self) -> None:
+        for token in self._tokens:
+            self.scheduler.unsubscribe(token)
+        self._tokens = []
+
+    # ------------------------------------------------------------------ #
+    # Scheduler callback
+    # ------------------------------------------------------------------ #
+    def _receive(self, url: str, payload: Mapping) -> None:
+        for name, path in self._routes[url]:
+            self._update(name, path, payload)
+
+    def _unchanged(self, url: str) -> None:
+        for name, path in self._routes[url]:
+            self.idle(name, path)
+
+    def idle(self, name: str, path: str) -> None:
+        """Tell idle listeners *path* of *name* was polled and came back unchanged."""
+        for callback in self._idle_listeners:
+            callback(name, path)
+
+    def _update(self, name: str, path: str, payload: Mapping) -> None:
+        payloads = self._payloads[name]
+        payloads[path] = payload
+
+        for section in self.sections:
+            section_paths, extractor, _ = SECTIONS[section]
+            if path not in section_paths or any(p not in payloads for p in section_paths):
+                continue
+            self.publish(name, section, extractor(*(payloads[p] for p in section_paths)))
+
+    def seed(self, name: str, section: str, data: Mapping) -> None:
+        """Show *data* for *name* until the first good live value of *section* arrives."""
+        if name in self.warm and section not in self.rows[name]:
+            self.warm[name][section] = data
+
+    def row(self, name: str) -> dict[str, Mapping]:
+        """``rows[name]`` with warm-start values for the sections not yet polled successfully."""
+        warm = self.warm[name]
+        # a warm section outlives only errors, so it wins over what rows holds
+        return {**self.rows[name], **warm} if warm else self.rows[name]
+
+    def publish(self, name: str, section: str, data: Mapping) -> None:
+        """Store *data* as ``rows[name][section]`` and notify every listener.
+
+        Also used by derived producers (e.g. rates) to add their own sections.
+        Re-publishing identical values is a no-op.
+        """
+        if "error" not in data:
+            # a node briefly unreachable after a restart keeps its warm values
+            self.warm[name].pop(section, None)
+        if not diff_fields(self.rows[name].get(section), data):
+            return
+        self.rows[name][section] = data
+        if section == "status" and "error" not in data:
+            self._check_redeploy(name, data)
+        for callback in self._listeners:
+            callback(name, section, data)
+
+    def _check_redeploy(self, name: str, status: Mapping) -> None:
+        marks = tuple(status.get(k) for k in REDEPLOY_FIELDS)
+        old = self._deploys.get(name)
+        self._deploys[name] = marks
+        if old is not None and old != marks:
+            node = self.nodes[name]
+            self.scheduler.invalidate(node.url(p) for p in SECTIONS["config"][0])
+
+    # ------------------------------------------------------------------ #
+    # Aggregates
+    # ------------------------------------------------------------------ #
+    def summary(self) -> dict:
+        """Fleet-wide totals for the summary header."""
+        running = errors = traffic = points = 0
+        scores = []
+        for name in self.rows:
+            row = self.row(name)
+            if any("error" in data for data in row.values()):
+                errors += 1
+            if row.get("status", {}).get("status") == "Running":
+                running += 1
+            if "score" in row.get("qos", {}):
+                scores.append(row["qos"]["score"])
+            traffic += row.get("performance", {}).get("total") or 0
+            points += row.get("points", {}).get("session_total") or 0
+        return {
+            "nodes": len(self.rows),
+            "cached": sum(1 for warm in self.warm.values() if warm),
+            "running": running,
+            "errors": errors,
+            "avg_score": sum(scores) // len(scores) if scores else 0,
+            "traffic": traffic,
+            "points": points,
+        }
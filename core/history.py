@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+History
+============
+Bounded, array-backed in-memory history for trend views.
+
+Every series lives in preallocated ``array('d')`` ring buffers – no
+per-sample objects – so memory is fixed by ``capacity`` no matter how
+long the dashboard runs. Values stay float64: cumulative byte counters
+outgrow float32 precision within days.
+"""
+
+import math
+import time
+from array import array
+from typing import Iterable, Mapping
+
+# section -> (metric name, key in the extracted dict)
+TRACKED = {
+    "performance": (("bytes_in", "in"), ("bytes_out", "out"),
+                    ("sessions", "sessions"), ("users", "users")),
+    "qos":         (("score", "score"), ("reliability", "reliability"),
+                    ("availability", "availability"), ("efficiency", "efficiency")),
+    "points":      (("life_points", "life_total"), ("session_points", "session_total")),
+    "rates":       (("in_rate", "in_rate"), ("out_rate", "out_rate"),
+                    ("points_per_hour", "points_per_hour")),
+}
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+class SeriesBuffer:
+    """Ring buffer of samples sharing one timestamp column."""
+
+    __slots__ = ("capacity", "fields", "_ts", "_columns", "_head", "_len")
+
+    def __init__(self, fields: Iterable[str], capacity: int):
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self._ts = array("d", bytes(8 * capacity))
+        self._columns = {f: array("d", bytes(8 * capacity)) for f in self.fields}
+        self._head = 0   # next slot to write
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def append(self, ts: float, values: Mapping[str, float]) -> None:
+        i = self._head
+        self._ts[i] = ts
+        for field, column in self._columns.items():
+            value = values.get(field)
+            column[i] = math.nan if value is None else value
+        self._head = (i + 1) % self.capacity
+        self._len = min(self._len + 1, self.capacity)
+
+    def _order(self, last: int | None) -> range:
+        n = self._len if last is None else min(last, self._len)
+        start = (self._head - n) % self.capacity
+        return range(start, start + n)
+
+    def timestamps(self, last: int | None = None) -> list[float]:
+        """Oldest → newest timestamps (optionally only the *last* N)."""
+        cap = self.capacity
+        return [self._ts[i % cap] for i in self._order(last)]
+
+    def values(self, field: str, last: int | None = None) -> list[float]:
+        """Oldest → newest values of *field* (NaN where unknown)."""
+        cap, column = self.capacity, self._columns[field]
+        return [column[i % cap] for i in self._order(last)]
+
+    def latest(self, field: str) -> float | None:
+        if not self._len:
+            return None
+        value = self._columns[field][(self._head - 1) % self.capacity]
+        return None if math.isnan(value) else value
+
+
+class NodeHistory:
+    """One ``SeriesBuffer`` per tracked section for a single node."""
+
+    def __init__(self, capacity: int):
+        self.sections = {
+            section: SeriesBuffer((name for name, _ in metrics), capacity)
+            for section, metrics in TRACKED.items()
+        }
+
+    def record(self, section: str, ts: float, data: Mapping) -> None:
+        if section not in TRACKED or "error" in data:
+            return
+        values = {}
+        for name, key in TRACKED[section]:
+            value = data.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[name] = value
+        self.sections[section].append(ts, values)
+
+    def series(self, metric: str) -> SeriesBuffer:
+        """The buffer holding *metric* (e.g. ``"bytes_in"``)."""
+        for section, metrics in TRACKED.items():
+            if any(name == metric for name, _ in metrics):
+                return self.sections[section]
+        raise KeyError(metric)
+
+    def values(self, metric: str, last: int | None = None) -> list[float]:
+        return self.series(metric).values(metric, last)
+
+
+class FleetHistory:
+    """Feeds a ``NodeHistory`` per node from ``FleetState`` updates."""
+
+    def __init__(self, fleet, *, capacity: int = 240, clock=None):
+        self._clock = clock or time.time
+        self.capacity = capacity
+        self.nodes = {name: NodeHistory(capacity) for name in fleet.nodes}
+        fleet.add_listener(self._on_fleet_update)
+
+    def __getitem__(self, node: str) -> NodeHistory:
+        return self.nodes[node]
+
+    def get(self, node: str | None) -> NodeHistory | None:
+        return self.nodes.get(node)
+
+    def _on_fleet_update(self, node: str, section: str, data: Mapping) -> None:
+        self.nodes[node].record(section, self._clock(), data)
+
+
+# ---------------------------------------------------------------------- #
+# Rendering helper
+# ---------------------------------------------------------------------- #
+def sparkline(values: list[float], width: int) -> str:
+    """Render the newest *width* values as a unicode sparkline."""
+    values = values[-width:] if width > 0 else []
+    known = [v for v in values if not math.isnan(v)]
+    if not known:
+        return ""
+    lo, hi = min(known), max(known)
+    span = (hi - lo) or 1.0
+    top = len(SPARK_CHARS) - 1
+    return "".join(
+        " " if math.isnan(v) else SPARK_CHARS[round((v - lo) / span * top)]
+        for v in values
+    )
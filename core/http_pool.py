@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+HTTPPool
+============
+One long-lived, connection-pooled HTTPX client shared by every widget.
+
+The pool keeps sockets alive between polls, caps the number of
+concurrent connections per host and (optionally) speaks HTTP/2.
+"""
+
+import asyncio
+import importlib.util
+from urllib.parse import urlsplit
+
+from httpx import AsyncClient, Limits, Response, Timeout
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class HTTPPool:
+    """Keep-alive ``AsyncClient`` with a per-host connection limit."""
+
+    def __init__(
+        self,
+        *,
+        per_host: int = 4,
+        max_connections: int = 100,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        timeout: float = 10.0,
+    ):
+        self.per_host = per_host
+        self.http2 = http2 and http2_available()
+
+        self._client = AsyncClient(
+            limits=Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=Timeout(timeout),
+            http2=self.http2,
+        )
+        # host:port -> semaphore, created lazily on first request
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    # ------------------------------------------------------------------ #
+    # Requests
+    # ------------------------------------------------------------------ #
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        netloc = urlsplit(url).netloc
+        sem = self._hosts.get(netloc)
+        if sem is None:
+            sem = self._hosts[netloc] = asyncio.Semaphore(self.per_host)
+        return sem
+
+    async def get(self, url: str, *, auth=None, **kwargs) -> Response:
+        """GET *url* through the shared pool, respecting the per-host cap."""
+        async with self._host_limit(url):
+            return await self._client.get(url, auth=auth, **kwargs)
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
+
+    async def aclose(self) -> None:
+        """Close every pooled connection; safe to call more than once."""
+        if not self._client.is_closed:
+            await self._client.aclose()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Rates
+============
+Derive smoothed rates from the synchronizer's cumulative counters.
+
+``bytesIn`` / ``bytesOut`` / ``sessions`` / points only ever grow until
+the container restarts, so consecutive samples give a rate. Rates are
+smoothed with a time-aware EWMA (``alpha = 1 - exp(-dt / tau)``), which
+weights each sample by how much time it covers and therefore copes with
+irregular poll spacing. A counter going backwards is a reset: the new
+value becomes the baseline and the previous smoothed rate is kept.
+"""
+
+import math
+import time
+from typing import Mapping
+
+from core.extract import SECTIONS, convert_bytes
+
+# derived metric -> (section, key, scale to the reported unit)
+DERIVED = {
+    "in_rate":          ("performance", "in", 1),            # bytes / s
+    "out_rate":         ("performance", "out", 1),           # bytes / s
+    "sessions_per_min": ("performance", "sessions", 60),
+    "points_per_hour":  ("points", "session_total", 3600),
+}
+
+
+def format_rate(bytes_per_second: float | None) -> str:
+    """Bytes/s → ``1.20 KB/s`` (``N/A`` until two samples exist)."""
+    if bytes_per_second is None:
+        return "N/A"
+    if bytes_per_second < 1024:
+        return f"{bytes_per_second:.0f} B/s"
+    return f"{convert_bytes(bytes_per_second)}/s"
+
+
+class RateEstimator:
+    """EWMA-smoothed per-second rate of one cumulative counter."""
+
+    __slots__ = ("tau", "rate", "_ts", "_value")
+
+    def __init__(self, tau: float = 60.0):
+        self.tau = tau
+        self.rate: float | None = None
+        self._ts: float | None = None
+        self._value: float | None = None
+
+    def update(self, ts: float, value: float) -> float | None:
+        """Feed one sample; returns the current smoothed rate (None until known)."""
+        if self._ts is None or value < self._value:
+            # first sample, or the counter reset (container restart)
+            self._ts, self._value = ts, value
+            return self.rate
+        dt = ts - self._ts
+        if dt <= 0:
+            return self.rate
+
+        instant = (value - self._value) / dt
+        if self.rate is None:
+            self.rate = instant
+        else:
+            alpha = 1 - math.exp(-dt / self.tau)
+            self.rate += alpha * (instant - self.rate)
+        self._ts, self._value = ts, value
+        return self.rate
+
+    def hold(self, ts: float) -> float | None:
+        """The counter was polled again and had not moved – decay towards 0."""
+        if self._value is None:
+            return self.rate
+        return self.update(ts, self._value)
+
+
+class DerivedMetrics:
+    """
+    Turn FleetState counter updates into a ``rates`` section per node,
+    published back through the FleetState so any widget or listener
+    can read ``fleet.rows[node]["rates"]``.
+    """
+
+    SECTION = "rates"
+
+    def __init__(self, fleet, *, tau: float = 60.0, clock=None):
+        self._fleet = fleet
+        self._clock = clock or time.time
+        self._estimators = {
+            name: {metric: RateEstimator(tau) for metric in DERIVED}
+            for name in fleet.nodes
+        }
+        fleet.add_listener(self._on_fleet_update)
+        fleet.add_idle_listener(self._on_idle)
+
+    def _on_idle(self, node: str, path: str) -> None:
+        """Unchanged poll: the counters fed from *path* stood still."""
+        now = self._clock()
+        estimators = self._estimators[node]
+        for metric, (section, _, _) in DERIVED.items():
+            if path in SECTIONS[section][0]:
+                estimators[metric].hold(now)
+        self._publish(node)
+
+    def _on_fleet_update(self, node: str, section: str, data: Mapping) -> None:
+        if "error" in data or not any(s == section for s, _, _ in DERIVED.values()):
+            return
+        now = self._clock()
+        estimators = self._estimators[node]
+        for metric, (src_section, key, _) in DERIVED.items():
+            value = data.get(key) if src_section == section else None
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                estimators[metric].update(now, value)
+        self._publish(node)
+
+    def _publish(self, node: str) -> None:
+        # rounded so a fully decayed rate settles and stops re-publishing
+        self._fleet.publish(node, self.SECTION, {
+            metric: None if est.rate is None else round(est.rate * DERIVED[metric][2], 2)
+            for metric, est in self._estimators[node].items()
+        })
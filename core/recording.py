@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Recording
+============
+Capture the payloads the scheduler fans out, and read them back for
+``--replay``.
+
+A recording is compact JSON Lines (gzip-compressed when the file name
+ends in ``.gz``), written append-only::
+
+    {"format": "multisync-rec", "version": 1, "start": 1760000000.0, "fleet": false, "nodes": [...]}
+    {"url": "http://host:3000/api/status", "id": 0}     first sighting of a URL
+    [1250, 0, {...payload...}]                          ms since start, URL id, parsed body
+    [6250, 0]                                           same URL polled, body unchanged
+
+Node passwords are never written.
+"""
+
+import gzip
+import json
+import time
+from typing import IO, Iterable, Iterator, Mapping
+
+from core.fleet import Node
+
+FORMAT = "multisync-rec"
+VERSION = 1
+
+# flush buffered records at least this often (seconds)
+FLUSH_EVERY = 5.0
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+class Recorder:
+    """Append every published / unchanged poll to a recording file."""
+
+    def __init__(self, path: str, nodes: Iterable[Node], *, fleet: bool = False, clock=None):
+        self._clock = clock or time.time
+        self._start = self._clock()
+        self._ids: dict[str, int] = {}
+        self._file = _open(path, "w")
+        self._flushed = self._start
+        self._file.write(_dumps({
+            "format": FORMAT,
+            "version": VERSION,
+            "start": self._start,
+            "fleet": fleet,
+            "nodes": [{"name": n.name, "api_base": n.api_base, "metrics_base": n.metrics_base}
+                      for n in nodes],
+        }) + "\n")
+
+    def write(self, url: str, payload: Mapping | None) -> None:
+        """Record one poll of *url*; ``payload=None`` means "unchanged"."""
+        now = self._clock()
+        uid = self._ids.get(url)
+        if uid is None:
+            uid = self._ids[url] = len(self._ids)
+            self._file.write(_dumps({"url": url, "id": uid}) + "\n")
+        ms = int((now - self._start) * 1000)
+        self._file.write(_dumps([ms, uid] if payload is None else [ms, uid, payload]) + "\n")
+        if now - self._flushed >= FLUSH_EVERY:
+            self._file.flush()
+            self._flushed = now
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_header(path: str) -> dict:
+    """The recording's header line (raises ValueError if it is not one)."""
+    with _open(path, "r") as f:
+        header = json.loads(f.readline() or "null")
+    if not isinstance(header, dict) or header.get("format") != FORMAT:
+        raise ValueError("not a multisync recording")
+    if header.get("version") != VERSION:
+        raise ValueError(f"unsupported recording version {header.get('version')!r}")
+    return header
+
+
+def header_nodes(header: Mapping, *, password: str = "") -> list[Node]:
+    return [Node(name=n["name"], api_base=n["api_base"], metrics_base=n["metrics_base"],
+                 password=password) for n in header["nodes"]]
+
+
+def read_records(path: str) -> Iterator[tuple[float, str, Mapping | None]]:
+    """Yield ``(absolute ts, url, payload or None)`` in recorded order."""
+    urls: dict[int, str] = {}
+    with _open(path, "r") as f:
+        start = json.loads(f.readline())["start"]
+        try:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    return  # truncated tail of a recording that was still open
+                if isinstance(rec, dict):
+                    urls[rec["id"]] = rec["url"]
+                    continue
+                yield start + rec[0] / 1000, urls[rec[1]], rec[2] if len(rec) > 2 else None
+        except EOFError:
+            return  # same, for a gzip stream that was never closed
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+PollScheduler
+============
+The data bus between the synchronizer API and its consumers: one polling
+task per subscribed URL, shared by every subscriber, with change
+detection, adaptive cadence, response caching and a circuit breaker per
+host.
+
+Used by the dashboard (``dashboard.py``), the node agent (``agent.py``)
+and the benchmark, so it needs nothing beyond ``httpx``.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from typing import Callable, Iterable, Mapping, NamedTuple
+from urllib.parse import urlparse
+
+import httpx
+
+from core.diagnostics import Diagnostics
+from core.http_pool import HTTPPool
+
+# adaptive polling: longest wait when nobody asked for a bound, growth
+# factor per unchanged poll, and base of the exponential error backoff
+DEFAULT_MAX_INTERVAL = 60.0
+IDLE_BACKOFF = 1.5
+ERROR_BACKOFF = 2.0
+
+# circuit breaker per host:port: failures in a row that open it, and its
+# first / longest cool-down before a half-open probe (doubling in between)
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 15.0
+BREAKER_MAX_COOLDOWN = 300.0
+
+# a request is abandoned after this many base intervals (at least DEADLINE_MIN s)
+DEADLINE_FACTOR = 2.0
+DEADLINE_MIN = 2.0
+
+
+# ---------------------------------------------------------------------- #
+# Helpers
+# ---------------------------------------------------------------------- #
+def load_password_from_config() -> str:
+    """
+    Read a password from the default config.json files
+    """
+    cfg_path = os.path.expanduser("~/.synchronizer-cli/config.json")
+    if os.path.exists(cfg_path):
+        try:
+            with open(cfg_path) as f:
+                return json.load(f).get("dashboardPassword", "")
+        except (OSError, json.JSONDecodeError):
+            pass
+    return ""
+
+
+def listen_address_arg(spec: str) -> tuple[str, int]:
+    """argparse type for ``[HOST:]PORT``; the host defaults to loopback."""
+    host, _, port = spec.rpartition(":")
+    try:
+        port = int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected [HOST:]PORT, got {spec!r}") from None
+    if not 0 < port < 65536:
+        raise argparse.ArgumentTypeError(f"port out of range: {port}")
+    return host.strip("[]") or "127.0.0.1", port
+
+
+# ---------------------------------------------------------------------- #
+# Poll scheduler / data bus
+# ---------------------------------------------------------------------- #
+def parse_response(result) -> Mapping:
+    """Turn an HTTPX response (or the exception raised instead) into a payload."""
+    if isinstance(result, Exception):
+        # network failure etc.; httpx timeouts often carry no message
+        return {"error": str(result) or type(result).__name__}
+    if result.status_code == 401:
+        return {"error": "Authentication failed"}
+    if result.status_code >= 500:
+        return {"error": f"HTTP {result.status_code}"}
+    try:
+        return result.json()
+    except ValueError:
+        return {"error": "Invalid JSON"}
+
+
+class _Subscriber(NamedTuple):
+    callback: Callable[[str, Mapping], None]
+    interval: float
+    min_interval: float
+    max_interval: float
+    ttl: float | None
+    on_unchanged: Callable[[str], None] | None
+
+
+class _Breaker:
+    """
+    Circuit breaker shared by every polled URL on one host:port – a node
+    that times out on one endpoint times out on all of them.
+
+    * closed    – requests flow; ``BREAKER_THRESHOLD`` failures in a row open it
+    * open      – no requests until the cool-down ends
+    * half-open – one probe request; success closes the breaker, failure
+                  re-opens it with the cool-down doubled (up to
+                  ``BREAKER_MAX_COOLDOWN``)
+    """
+
+    __slots__ = ("failures", "until", "cooldown", "probing")
+
+    def __init__(self):
+        self.failures = 0
+        self.until = 0.0                 # monotonic time the next probe may go
+        self.cooldown = BREAKER_COOLDOWN
+        self.probing = False
+
+    @property
+    def closed(self) -> bool:
+        return self.failures < BREAKER_THRESHOLD
+
+    def admit(self, now: float) -> float:
+        """0 if a request may go out now, else seconds to wait before asking again."""
+        if self.closed:
+            return 0.0
+        if self.probing:
+            return self.cooldown         # woken early if the probe closes the breaker
+        if now < self.until:
+            return self.until - now
+        self.probing = True
+        return 0.0
+
+    def release(self) -> None:
+        """Forget a probe that will never report back (its poll was cancelled)."""
+        self.probing = False
+
+    def record(self, failed: bool, now: float) -> str | None:
+        """Count one outcome; returns ``"opened"`` / ``"closed"`` on a transition."""
+        if not failed:
+            was_open = not self.closed
+            self.failures, self.cooldown, self.probing = 0, BREAKER_COOLDOWN, False
+            return "closed" if was_open else None
+        self.failures += 1
+        if self.probing:
+            self.probing = False
+            self.cooldown = min(BREAKER_MAX_COOLDOWN, self.cooldown * 2)
+        elif self.failures != BREAKER_THRESHOLD:
+            return None
+        self.until = now + self.cooldown
+        return "opened"
+
+
+class _Endpoint:
+    """One polled URL plus everyone interested in it."""
+
+    def __init__(self, url: str, auth, breaker: _Breaker):
+        self.url = url
+        self.auth = auth
+        self.breaker = breaker
+        self.subscribers: dict[int, _Subscriber] = {}
+        self.payload: Mapping | None = None
+        self.task: asyncio.Task | None = None
+
+        # change detection: server ETag + digest of the last raw body
+        self.etag: str | None = None
+        self.digest: bytes | None = None
+
+        # adaptive cadence: current wait, consecutive failures, early wake-up
+        self.delay: float | None = None
+        self.failures = 0
+        self.wake = asyncio.Event()
+
+    @property
+    def bounds(self) -> tuple[float, float]:
+        """(min, max) wait – the tightest any subscriber asked for."""
+        subs = self.subscribers.values()
+        hi = min(s.max_interval for s in subs)
+        return min(min(s.min_interval for s in subs), hi), hi
+
+    @property
+    def ttl(self) -> float | None:
+        """How long a good response stays fresh (None if any subscriber wants live data)."""
+        ttls = [s.ttl for s in self.subscribers.values()]
+        return None if None in ttls else min(ttls)
+
+    @property
+    def interval(self) -> float:
+        """Base cadence: tightest freshness any subscriber asked for, within bounds."""
+        lo, hi = self.bounds
+        return max(lo, min(min(s.interval for s in self.subscribers.values()), hi))
+
+    def next_delay(self, outcome: str, jitter: float) -> float:
+        """
+        Wait before the next poll given the last *outcome*:
+
+        * ``changed``   – straight back to the base interval
+        * ``unchanged`` – stretch the wait by ``IDLE_BACKOFF`` up to the max bound
+        * ``error``     – exponential backoff with "equal jitter" up to the max bound
+
+        A good response is additionally reused for the endpoint's TTL.
+        """
+        base = self.interval
+        _, hi = self.bounds
+        if outcome == "error":
+            self.failures += 1
+            cap = min(hi, base * ERROR_BACKOFF ** self.failures)
+            self.delay = max(base, cap / 2 + random.uniform(0, cap / 2))
+            return self.delay
+
+        self.failures = 0
+        if outcome == "unchanged" and self.delay is not None:
+            self.delay = min(hi, max(base, self.delay * IDLE_BACKOFF))
+        else:
+            self.delay = base
+        spread = self.delay * jitter / 2
+        return max(self.delay + random.uniform(-spread, spread), self.ttl or 0)
+
+
+class PollScheduler:
+    """
+    Fetch every subscribed URL once per cycle and push the parsed
+    payload to all of its subscribers.
+
+    Duplicate subscriptions (e.g. Performance + QoS both on
+    ``/api/performance``) share a single request, polled at the
+    shortest interval requested.
+
+    Unchanged responses (``304 Not Modified`` or a body identical to the
+    last one) are neither parsed nor fanned out; subscribers that asked
+    for it only get a cheap ``on_unchanged(url)`` notification.
+
+    Cadence is adaptive: an endpoint that keeps returning the same data
+    is polled less and less often, one that fails (connection error,
+    5xx, 401) backs off exponentially with jitter, and both snap back to the
+    base interval on the first change. Subscribers bound the range with
+    *min_interval* / *max_interval*.
+
+    Near-static endpoints can be cached: with a *ttl* a good response is
+    reused that long before the URL is fetched again, unless
+    ``invalidate`` expires it first.
+
+    Requests are never cancelled to make room for newer ones: each URL
+    has one request at most in flight, and subscribers and invalidations
+    arriving meanwhile are served by its answer. A request gets
+    ``DEADLINE_FACTOR`` base intervals to answer; timeouts, connection
+    errors and 5xx answers count towards the host's circuit breaker
+    (``_Breaker``), which stops polling a failing node and probes it
+    with single half-open requests until it recovers.
+
+    *concurrency* caps requests in flight across all endpoints and
+    *jitter* (0..1) spreads the first poll and every later one so a
+    large fleet is not hit in lock-step. A *recorder* captures every
+    poll for ``--replay``; request latency, sizes and failures are
+    counted in ``diagnostics``.
+    """
+
+    def __init__(self, pool: HTTPPool, *, concurrency: int | None = None,
+                 jitter: float = 0.0,
+                 recorder=None,           # core.recording.Recorder
+                 diagnostics: Diagnostics | None = None):
+        self._pool = pool
+        self._recorder = recorder
+        self.diagnostics = diagnostics or Diagnostics()
+        self._limit = asyncio.Semaphore(concurrency) if concurrency else contextlib.nullcontext()
+        self._jitter = jitter
+        self._endpoints: dict[str, _Endpoint] = {}
+        self._breakers: dict[str, _Breaker] = {}     # host:port -> breaker
+        self._owners: dict[int, _Endpoint] = {}
+        self._tokens = itertools.count(1)
+        self._running = False
+
+    # ------------------------------------------------------------------ #
+    # Subscriptions
+    # ------------------------------------------------------------------ #
+    def subscribe(self, url: str, callback: Callable[[str, Mapping], None], *,
+                  interval: float, min_interval: float | None = None,
+                  max_interval: float | None = None, ttl: float | None = None,
+                  auth=None, on_unchanged: Callable[[str], None] | None = None) -> int:
+        """
+        Register *callback(url, payload)*; returns a token for ``unsubscribe``.
+        The poll wait adapts within ``[min_interval, max_interval]``
+        (defaults: *interval* and ``DEFAULT_MAX_INTERVAL``); *ttl* caches
+        good responses for that many seconds.
+        """
+        ep = self._endpoints.get(url)
+        if ep is None:
+            breaker = self._breakers.setdefault(urlparse(url).netloc, _Breaker())
+            ep = self._endpoints[url] = _Endpoint(url, auth, breaker)
+
+        token = next(self._tokens)
+        ep.subscribers[token] = _Subscriber(
+            callback,
+            interval,
+            interval if min_interval is None else min_interval,
+            max(interval, DEFAULT_MAX_INTERVAL) if max_interval is None else max_interval,
+            ttl,
+            on_unchanged,
+        )
+        self._owners[token] = ep
+
+        if ep.delay is not None and ep.delay > max(ep.bounds[1], ep.ttl or 0):
+            # the newcomer wants fresher data than the stretched cadence gives
+            ep.wake.set()
+
+        if self._running:
+            if ep.task is None:
+                ep.task = asyncio.create_task(self._poll(ep))
+            elif ep.payload is not None:
+                # late joiner: hand over the last payload right away
+                callback(url, ep.payload)
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        ep = self._owners.pop(token, None)
+        if ep is None:
+            return
+        ep.subscribers.pop(token, None)
+        if not ep.subscribers:
+            if ep.task is not None:
+                ep.task.cancel()
+            del self._endpoints[ep.url]
+            if not any(other.breaker is ep.breaker for other in self._endpoints.values()):
+                # nobody polls this host any more: a later subscriber must be able to probe
+                ep.breaker.release()
+
+    def invalidate(self, urls: Iterable[str] | None = None) -> None:
+        """
+        Expire cached responses for *urls* (default: every endpoint) and
+        poll them right away at their base cadence; an open breaker sends
+        its probe now instead of waiting out the cool-down.
+        """
+        targets = self._endpoints.values() if urls is None else (
+            self._endpoints[u] for u in urls if u in self._endpoints)
+        for ep in targets:
+            ep.delay = None
+            ep.breaker.until = 0.0
+            ep.breaker.release()
+            ep.wake.set()
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+    def start(self) -> None:
+        """Spawn one polling task per endpoint (needs a running loop)."""
+        self._running = True
+        for ep in self._endpoints.values():
+            if ep.task is None:
+                ep.task = asyncio.create_task(self._poll(ep))
+
+    async def stop(self) -> None:
+        self._running = False
+        tasks = [ep.task for ep in self._endpoints.values() if ep.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for ep in self._endpoints.values():
+            ep.task = None
+
+    # ------------------------------------------------------------------ #
+    # Polling
+    # ------------------------------------------------------------------ #
+    async def _poll(self, ep: _Endpoint) -> None:
+        if self._jitter:
+            # stagger the first request across the whole interval
+            await asyncio.sleep(random.uniform(0, ep.interval * self._jitter))
+        while ep.subscribers:
+            # cleared before the request so an invalidation during it still counts
+            ep.wake.clear()
+            wait = ep.breaker.admit(time.monotonic())
+            if wait:
+                # breaker open: subscribers keep the last error, the node gets no load
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(ep.wake.wait(), wait)
+                continue
+
+            headers = {"If-None-Match": ep.etag} if ep.etag else None
+            deadline = max(DEADLINE_MIN, ep.interval * DEADLINE_FACTOR)
+            probe = ep.breaker.probing           # admitted as the half-open probe
+            try:
+                async with self._limit:
+                    started = time.perf_counter()
+                    try:
+                        result = await asyncio.wait_for(
+                            self._pool.get(ep.url, auth=ep.auth, headers=headers), deadline)
+                    except asyncio.TimeoutError:
+                        result = TimeoutError(f"No answer within {deadline:g}s")
+                    except Exception as e:
+                        result = e
+                    elapsed = time.perf_counter() - started
+            except asyncio.CancelledError:
+                # cancelled mid-probe (unsubscribed, stopping): the next request probes
+                if probe:
+                    ep.breaker.release()
+                raise
+            failed = isinstance(result, Exception) or result.status_code >= 500
+            if isinstance(result, Exception):
+                self.diagnostics.request(
+                    ep.url, elapsed, error=True,
+                    timeout=isinstance(result, (TimeoutError, httpx.TimeoutException)))
+            else:
+                self.diagnostics.request(ep.url, elapsed, status=result.status_code,
+                                         size=len(result.content))
+
+            transition = ep.breaker.record(failed, time.monotonic())
+            if transition == "opened":
+                self.diagnostics.endpoint(ep.url).breaker_opens += 1
+                self._paused(ep)
+            elif transition == "closed":
+                # the probe got through: every URL on this host resumes now
+                for other in self._endpoints.values():
+                    if other.breaker is ep.breaker:
+                        other.wake.set()
+
+            delay = ep.next_delay(self._handle(ep, result, failed), self._jitter)
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(ep.wake.wait(), delay)
+
+    def _handle(self, ep: _Endpoint, result, failed: bool) -> str:
+        """
+        Parse and publish *result* unless it is what subscribers already
+        have; returns ``"changed"``, ``"unchanged"`` or ``"error"``.
+        *failed* is the breaker's verdict (no answer or 5xx); a 401 is
+        an error too, though the host did answer.
+        """
+        failed = failed or result.status_code == 401
+        if isinstance(result, Exception):
+            ep.etag = ep.digest = None
+            payload = parse_response(result)
+            changed = payload != ep.payload
+        elif result.status_code == 304 and ep.payload is not None:
+            changed = False
+        else:
+            digest = hashlib.blake2b(
+                result.content, digest_size=16, key=str(result.status_code).encode()
+            ).digest()
+            changed = digest != ep.digest
+            if changed:
+                ep.digest = digest
+                ep.etag = result.headers.get("etag") if result.status_code == 200 else None
+                payload = parse_response(result)
+
+        if self._recorder is not None:
+            self._recorder.write(ep.url, payload if changed else None)
+        if changed:
+            self._publish(ep, payload)
+        else:
+            self._unchanged(ep)
+        if failed:
+            return "error"
+        return "changed" if changed else "unchanged"
+
+    def _paused(self, failed: _Endpoint) -> None:
+        """
+        *failed* opened its host's breaker: the host's other URLs stop
+        polling too, so tell their subscribers rather than let good-looking
+        data silently age.
+        """
+        payload = {"error": "Host not answering (polling paused)"}
+        for ep in list(self._endpoints.values()):
+            if ep is failed or ep.breaker is not failed.breaker or ep.payload is None:
+                continue
+            if "error" not in ep.payload:
+                ep.etag = ep.digest = None
+                self._publish(ep, payload)
+
+    def _unchanged(self, ep: _Endpoint) -> None:
+        for sub in list(ep.subscribers.values()):
+            if sub.on_unchanged is not None:
+                sub.on_unchanged(ep.url)
+
+    def _publish(self, ep: _Endpoint, payload: Mapping) -> None:
+        ep.payload = payload
+        for sub in list(ep.subscribers.values()):
+            try:
+                sub.callback(ep.url, payload)
+            except Exception:
+                # one broken subscriber must not stop the others' updates
+                logging.getLogger(__name__).exception("subscriber failed for %s", ep.url)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Shards
+============
+Multi-process polling for very large fleets (``--workers N``).
+
+The inventory is split across N worker processes by API base URL.
+Each worker runs its own event loop, ``HTTPPool``, scheduler and
+``FleetState``. Requests, JSON decoding, change detection and
+extraction all happen there. Workers send back only the extracted
+section dicts that changed, batched every ``BATCH_WINDOW`` seconds and
+coalesced per (node, section), as one pickled message per batch on a
+pipe.
+
+The UI process feeds each batch into its own ``FleetState`` (created
+with ``poll=False``) through ``publish`` / ``idle``, so views,
+history, rates, snapshots and alerts work exactly as in
+single-process mode. Its event loop only unpickles and renders. Worker
+request statistics are merged into the UI's diagnostics panel every
+``DIAGNOSTICS_EVERY`` seconds.
+
+Workers are spawned, not forked: the UI process already runs threads
+(the reachability check) that a fork would copy in an unknown state.
+"""
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import signal
+import time
+import zlib
+from typing import Callable, Iterable, Mapping
+
+from core.diagnostics import Diagnostics
+from core.fleet import SUMMARY_SECTIONS, FleetState, Node
+from core.http_pool import HTTPPool
+
+BATCH_WINDOW = 0.1          # seconds a worker gathers updates before sending
+DIAGNOSTICS_EVERY = 2.0     # seconds between request-stat deltas
+STOP_TIMEOUT = 5.0          # seconds a worker gets to shut down cleanly
+
+log = logging.getLogger(__name__)
+
+
+def split(nodes: Iterable[Node], workers: int) -> list[list[Node]]:
+    """
+    Deal *nodes* into *workers* shards by a stable hash of ``api_base``,
+    so nodes sharing an API URL land in the same worker and share its
+    requests. Empty shards are dropped.
+    """
+    shards: list[list[Node]] = [[] for _ in range(workers)]
+    for node in nodes:
+        shards[zlib.crc32(node.api_base.encode()) % workers].append(node)
+    return [shard for shard in shards if shard]
+
+
+# ---------------------------------------------------------------------- #
+# Worker process
+# ---------------------------------------------------------------------- #
+def _run_worker(conn, nodes, sections, bounds, pool_options, make_scheduler) -> None:
+    # Ctrl+C reaches the whole process group; the parent decides when we stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_serve(conn, nodes, sections, bounds, pool_options, make_scheduler))
+
+
+async def _serve(conn, nodes, sections, bounds, pool_options, make_scheduler) -> None:
+    pool = HTTPPool(**pool_options)
+    scheduler = make_scheduler(pool)
+    fleet = FleetState(scheduler, nodes, sections=sections, bounds=bounds)
+
+    updates: dict[tuple[str, str], Mapping] = {}
+    idle: set[tuple[str, str]] = set()
+    fleet.add_listener(lambda node, section, data: updates.__setitem__((node, section), data))
+    fleet.add_idle_listener(lambda node, path: idle.add((node, path)))
+
+    stop = asyncio.Event()
+
+    def on_command() -> None:
+        try:
+            command, arg = conn.recv()
+        except (EOFError, OSError):
+            stop.set()               # parent went away
+            return
+        if command == "stop":
+            stop.set()
+        elif command == "invalidate":
+            scheduler.invalidate(arg)
+
+    loop = asyncio.get_running_loop()
+    loop.add_reader(conn.fileno(), on_command)
+    scheduler.start()
+    sent_diagnostics = time.monotonic()
+    try:
+        while not stop.is_set():
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), BATCH_WINDOW)
+            diagnostics = None
+            if time.monotonic() - sent_diagnostics >= DIAGNOSTICS_EVERY:
+                sent_diagnostics = time.monotonic()
+                if scheduler.diagnostics.endpoints:
+                    diagnostics, scheduler.diagnostics = scheduler.diagnostics, Diagnostics()
+            if not (updates or idle or diagnostics):
+                continue
+            batch = ([(node, section, data) for (node, section), data in updates.items()],
+                     list(idle), diagnostics)
+            updates.clear()
+            idle.clear()
+            try:
+                conn.send(batch)
+            except OSError:
+                break
+    finally:
+        loop.remove_reader(conn.fileno())
+        await scheduler.stop()
+        await pool.aclose()
+        conn.close()
+
+
+# ---------------------------------------------------------------------- #
+# UI side
+# ---------------------------------------------------------------------- #
+class _Shard:
+    __slots__ = ("nodes", "process", "conn")
+
+    def __init__(self, nodes: list[Node], process, conn):
+        self.nodes = nodes
+        self.process = process
+        self.conn = conn
+
+
+class ShardPool:
+    """
+    Poll *nodes* from *workers* processes and publish their extracted
+    sections into the ``FleetState`` given to ``attach``.
+
+    *make_scheduler(pool)* builds each worker's scheduler and must be
+    picklable (e.g. ``functools.partial(PollScheduler, jitter=0.2)``).
+    *pool_options* are ``HTTPPool`` keyword arguments per worker.
+    """
+
+    def __init__(self, nodes: Iterable[Node], workers: int, *,
+                 make_scheduler: Callable, pool_options: Mapping | None = None,
+                 sections: Iterable[str] = SUMMARY_SECTIONS,
+                 bounds: Mapping[str, tuple[float, float]] | None = None,
+                 diagnostics: Diagnostics | None = None):
+        self.groups = split(nodes, max(1, workers))
+        self._make_scheduler = make_scheduler
+        self._pool_options = dict(pool_options or {})
+        self.sections = tuple(sections)
+        self._bounds = dict(bounds or {})
+        self.diagnostics = diagnostics
+        self.fleet: FleetState | None = None
+        self._shards: list[_Shard] = []
+
+    def attach(self, fleet: FleetState) -> None:
+        self.fleet = fleet
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+    def spawn(self) -> None:
+        """
+        Start one worker per shard. Call before a UI takes over stdio:
+        spawning needs the real stderr, which Textual replaces.
+        """
+        if self._shards:
+            return
+        ctx = multiprocessing.get_context("spawn")
+        for i, group in enumerate(self.groups):
+            conn, child = ctx.Pipe()
+            process = ctx.Process(
+                target=_run_worker, name=f"multisync-shard-{i}", daemon=True,
+                args=(child, group, self.sections, self._bounds, self._pool_options,
+                      self._make_scheduler),
+            )
+            process.start()
+            child.close()
+            self._shards.append(_Shard(group, process, conn))
+
+    def start(self) -> None:
+        """Spawn (if not done yet) and start taking batches (needs a running loop)."""
+        self.spawn()
+        loop = asyncio.get_running_loop()
+        for shard in self._shards:
+            loop.add_reader(shard.conn.fileno(), self._receive, shard)
+
+    async def stop(self) -> None:
+        loop = asyncio.get_running_loop()
+        shards, self._shards = self._shards, []
+        for shard in shards:
+            loop.remove_reader(shard.conn.fileno())
+            with contextlib.suppress(OSError):
+                shard.conn.send(("stop", None))
+        for shard in shards:
+            await loop.run_in_executor(None, shard.process.join, STOP_TIMEOUT)
+            if shard.process.is_alive():
+                shard.process.terminate()
+            shard.conn.close()
+
+    def invalidate(self, urls: Iterable[str] | None = None) -> None:
+        """Expire cached responses in every worker (``PollScheduler.invalidate``)."""
+        urls = None if urls is None else list(urls)
+        for shard in self._shards:
+            with contextlib.suppress(OSError):
+                shard.conn.send(("invalidate", urls))
+
+    # ------------------------------------------------------------------ #
+    # Receiving
+    # ------------------------------------------------------------------ #
+    def _receive(self, shard: _Shard) -> None:
+        try:
+            updates, idle, diagnostics = shard.conn.recv()
+        except (EOFError, OSError):
+            self._lost(shard)
+            return
+        fleet = self.fleet
+        for node, section, data in updates:
+            fleet.publish(node, section, data)
+        for node, path in idle:
+            fleet.idle(node, path)
+        if diagnostics is not None and self.diagnostics is not None:
+            self.diagnostics.merge(diagnostics)
+
+    def _lost(self, shard: _Shard) -> None:
+        """A worker died: say so on each of its nodes instead of freezing them."""
+        asyncio.get_running_loop().remove_reader(shard.conn.fileno())
+        self._shards.remove(shard)
+        log.error("poll worker %s exited (code %s)", shard.process.name, shard.process.exitcode)
+        error = {"error": "Poll worker exited"}
+        for node in shard.nodes:
+            for section in self.sections:
+                self.fleet.publish(node.name, section, error)
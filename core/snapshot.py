@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Snapshot
+============
+Last-known-good extracted data per node and section, persisted so the
+next launch can paint immediately instead of showing "Loading...".
+
+The file is plain JSON, replaced atomically (write + rename)::
+
+    {"format": "multisync-snapshot", "version": 1, "saved": 1760000000.0,
+     "nodes": {"eu-1": {"api_base": "http://10.0.0.5:3000",
+                        "sections": {"status": {"at": 1759999990.0, "data": {...}}}}}}
+
+``at`` is when the values were last seen live (a poll that came back
+identical counts). Error results are never stored, and a node whose
+``api_base`` moved since the file was written is ignored on load.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Iterable, Mapping
+
+from core.extract import SECTIONS
+from core.fleet import Node
+
+FORMAT = "multisync-snapshot"
+VERSION = 1
+
+DEFAULT_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "multisync-tui", "snapshot.json",
+)
+
+# seconds between periodic saves while the dashboard runs
+SAVE_EVERY = 60.0
+
+log = logging.getLogger(__name__)
+
+
+class SnapshotCache:
+    """In-memory ``{node: {section: (data, at)}}`` mirrored to *path*."""
+
+    def __init__(self, path: str, nodes: Iterable[Node], *, clock=None):
+        self.path = path
+        self._clock = clock or time.time
+        self._bases = {n.name: n.api_base for n in nodes}
+        self._entries: dict[str, dict[str, tuple[Mapping, float]]] = {
+            name: {} for name in self._bases
+        }
+        self._dirty = False
+
+    # ------------------------------------------------------------------ #
+    # Access
+    # ------------------------------------------------------------------ #
+    def get(self, node: str | None, section: str) -> tuple[Mapping, float] | None:
+        """``(data, at)`` for *node* / *section*, or None."""
+        return self._entries.get(node, {}).get(section)
+
+    def sections(self, node: str) -> dict[str, tuple[Mapping, float]]:
+        return self._entries.get(node, {})
+
+    def put(self, node: str | None, section: str, data: Mapping) -> None:
+        """Remember *data* as the latest good value (errors are ignored)."""
+        entries = self._entries.get(node)
+        if entries is None or section not in SECTIONS or not data or "error" in data:
+            return
+        entries[section] = (data, self._clock())
+        self._dirty = True
+
+    def touch(self, node: str, sections: Iterable[str]) -> None:
+        """Values of *sections* were just confirmed unchanged – bump their age."""
+        entries = self._entries.get(node)
+        if not entries:
+            return
+        now = self._clock()
+        for section in sections:
+            entry = entries.get(section)
+            if entry is not None:
+                entries[section] = (entry[0], now)
+                self._dirty = True
+
+    def attach(self, fleet) -> None:
+        """Follow a ``FleetState``: store what it publishes, age what it confirms."""
+        fleet.add_listener(self.put)
+        fleet.add_idle_listener(
+            lambda node, path: self.touch(
+                node, (s for s in fleet.sections if path in SECTIONS[s][0]))
+        )
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+    def load(self) -> int:
+        """Read *path*; returns how many sections were restored (0 if none / unreadable)."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            log.warning("ignoring snapshot %s: %s", self.path, e)
+            return 0
+        if not isinstance(raw, dict) or raw.get("format") != FORMAT \
+                or raw.get("version") != VERSION:
+            return 0
+
+        restored = 0
+        for name, node in (raw.get("nodes") or {}).items():
+            if self._bases.get(name) != node.get("api_base"):
+                continue
+            for section, entry in (node.get("sections") or {}).items():
+                if section in SECTIONS and isinstance(entry.get("data"), dict):
+                    self._entries[name][section] = (entry["data"], float(entry.get("at", 0)))
+                    restored += 1
+        return restored
+
+    def save(self, *, force: bool = False) -> None:
+        """Write the file if anything changed since the last save."""
+        if not (self._dirty or force):
+            return
+        snapshot = {
+            "format": FORMAT,
+            "version": VERSION,
+            "saved": self._clock(),
+            "nodes": {
+                name: {"api_base": self._bases[name],
+                       "sections": {s: {"at": at, "data": data}
+                                    for s, (data, at) in entries.items()}}
+                for name, entries in self._entries.items() if entries
+            },
+        }
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f, separators=(",", ":"))
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            log.warning("could not save snapshot %s: %s", self.path, e)
+            return
+        self._dirty = False
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+TimeSeriesStore
+============
+Compact, append-only on-disk store for numeric node metrics, with tiered
+retention and downsampling rollups computed on ingest.
+
+Layout::
+
+    <root>/<node>/raw-YYYYMMDD.tsdb   every sample, one file per UTC day     kept 1 day
+    <root>/<node>/m1-YYYYMMDD.tsdb    1-minute rollups, one file per day     kept 30 days
+    <root>/<node>/h1-YYYYMM.tsdb      1-hour rollups, one file per month     kept forever
+    <root>/<node>/meta.jsonl          text attributes (versions, hostname, …) when they change
+
+Every ``.tsdb`` file starts with a one-line header naming its fields,
+followed by records of ``uint32 epoch seconds + float64 per field``
+(NaN = value unknown). Fixed-width records keep files small and let
+range queries binary-search by seeking instead of parsing.
+
+A rollup record is ``bucket start, samples, mean of each field``. Each
+node keeps one open bucket per rollup tier in memory; a sample that
+falls past it writes the finished bucket out, so rollups cost O(fields)
+per sample and never re-read raw data. On shutdown the open buckets are
+flushed as they stand; after a restart the open buckets are reopened
+from that, or rebuilt once from the raw tier. Expired segments are deleted when a
+node's raw tier rolls over to a new day, which bounds disk use at about
+30 days of minute records plus one hourly record per hour.
+"""
+
+import json
+import math
+import os
+import struct
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Mapping
+from urllib.parse import quote, unquote
+
+MAGIC = b"MSTS1"
+
+# (field name, FleetState section, key in the extracted dict)
+FIELDS = (
+    ("running",        "status",      "status"),
+    ("uptime",         "status",      "uptime_seconds"),
+    ("traffic_total",  "performance", "total"),
+    ("bytes_in",       "performance", "in"),
+    ("bytes_out",      "performance", "out"),
+    ("sessions",       "performance", "sessions"),
+    ("users",          "performance", "users"),
+    ("qos_score",      "qos",         "score"),
+    ("reliability",    "qos",         "reliability"),
+    ("availability",   "qos",         "availability"),
+    ("efficiency",     "qos",         "efficiency"),
+    ("life_points",    "points",      "life_total"),
+    ("session_points", "points",      "session_total"),
+    ("rank",           "points",      "rank"),
+    ("multiplier",     "points",      "multiplier"),
+)
+FIELD_NAMES = tuple(name for name, _, _ in FIELDS)
+_UPTIME = FIELD_NAMES.index("uptime")
+
+# rollup records: how many raw samples went in, then each field's mean
+ROLLUP_FIELDS = ("samples", *FIELD_NAMES)
+
+DAY = 86400
+
+
+class Tier:
+    """One resolution: bucket width (0 = raw), segment period and retention."""
+
+    __slots__ = ("name", "width", "period", "retention")
+
+    def __init__(self, name: str, width: int, period: str, retention: float | None):
+        self.name = name
+        self.width = width                  # seconds per record; 0 = raw samples
+        self.period = period                # "day" or "month" per segment file
+        self.retention = retention          # seconds; None = forever
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return ROLLUP_FIELDS if self.width else FIELD_NAMES
+
+    def key(self, ts: float) -> str:
+        """Segment key (``YYYYMMDD`` / ``YYYYMM``) holding *ts*."""
+        fmt = "%Y%m%d" if self.period == "day" else "%Y%m"
+        return datetime.fromtimestamp(ts, timezone.utc).strftime(fmt)
+
+    def span(self, key: str) -> tuple[float, float]:
+        """``[start, end)`` epoch seconds covered by segment *key*."""
+        if self.period == "day":
+            start = datetime.strptime(key, "%Y%m%d").replace(tzinfo=timezone.utc)
+            return start.timestamp(), (start + timedelta(days=1)).timestamp()
+        start = datetime.strptime(key, "%Y%m").replace(tzinfo=timezone.utc)
+        following = (start + timedelta(days=32)).replace(day=1)
+        return start.timestamp(), following.timestamp()
+
+
+TIERS = (
+    Tier("raw", 0, "day", 1 * DAY),
+    Tier("m1", 60, "day", 30 * DAY),
+    Tier("h1", 3600, "month", None),
+)
+TIER_BY_NAME = {t.name: t for t in TIERS}
+
+# text attributes worth keeping, written only when they change
+META_KEYS = ("hostname", "os_platform", "cli", "docker_image", "container",
+             "reflector", "launcher", "sync_hash", "wallet")
+
+
+def sample_from_row(row: Mapping[str, Mapping]) -> tuple[float, ...]:
+    """Flatten one FleetState row into the store's numeric field order."""
+    values = []
+    for _, section, key in FIELDS:
+        value = row.get(section, {}).get(key)
+        if key == "status":
+            value = None if value is None else float(value == "Running")
+        elif not isinstance(value, (int, float)) or isinstance(value, bool):
+            value = None
+        values.append(math.nan if value is None else float(value))
+    return tuple(values)
+
+
+class Segment:
+    """One fixed-width ``.tsdb`` file."""
+
+    def __init__(self, path: str, fields: Iterable[str]):
+        self.path = path
+        self.fields = tuple(fields)
+        self.record = struct.Struct(f"<I{len(self.fields)}d")
+        self._header = MAGIC + b" " + json.dumps(self.fields).encode() + b"\n"
+
+    def append(self, records: Iterable[tuple]) -> None:
+        packed = b"".join(self.record.pack(*r) for r in records)
+        if not packed:
+            return
+        new = not os.path.exists(self.path)
+        with open(self.path, "ab") as f:
+            if new:
+                f.write(self._header)
+            f.write(packed)
+
+    def read(self, start: float = 0, end: float = math.inf) -> list[tuple]:
+        """Records with ``start <= ts < end``, located by binary search."""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return []
+        with f:
+            header = f.readline()
+            if not header.startswith(MAGIC):
+                return []
+            # trust the file's own header over the fields we were built with
+            self.fields = tuple(json.loads(header[len(MAGIC):]))
+            record = self.record = struct.Struct(f"<I{len(self.fields)}d")
+            base = len(header)
+            count = (os.fstat(f.fileno()).st_size - base) // record.size
+
+            def ts_at(i):
+                f.seek(base + i * record.size)
+                return struct.unpack("<I", f.read(4))[0]
+
+            lo, hi = 0, count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if ts_at(mid) < start:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            f.seek(base + lo * record.size)
+            out = []
+            for rec in record.iter_unpack(f.read((count - lo) * record.size)):
+                if rec[0] >= end:
+                    break
+                out.append(rec)
+            return out
+
+    def last(self) -> tuple | None:
+        """The final complete record, None when empty / missing."""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return None
+        with f:
+            header = f.readline()
+            if not header.startswith(MAGIC):
+                return None
+            record = struct.Struct(f"<I{len(json.loads(header[len(MAGIC):]))}d")
+            count = (os.fstat(f.fileno()).st_size - len(header)) // record.size
+            if not count:
+                return None
+            f.seek(len(header) + (count - 1) * record.size)
+            return record.unpack(f.read(record.size))
+
+    def last_ts(self) -> int | None:
+        """Timestamp of the final complete record, None when empty / missing."""
+        last = self.last()
+        return None if last is None else last[0]
+
+    def replace_last(self, record: tuple) -> None:
+        """Overwrite the final record in place (a flushed bucket that grew since)."""
+        with open(self.path, "r+b") as f:
+            header = f.readline()
+            count = (os.fstat(f.fileno()).st_size - len(header)) // self.record.size
+            f.seek(len(header) + (count - 1) * self.record.size)
+            f.write(self.record.pack(*record))
+
+
+class Rollup:
+    """The open bucket of one rollup tier: per-field sums and counts."""
+
+    __slots__ = ("width", "start", "samples", "sums", "counts", "flushed")
+
+    def __init__(self, width: int):
+        self.width = width
+        self.start: int | None = None
+        self.samples = 0
+        self.sums = [0.0] * len(FIELD_NAMES)
+        self.counts = [0] * len(FIELD_NAMES)
+        self.flushed = False                 # the open bucket is already on disk
+
+    def resume(self, record: tuple) -> None:
+        """Reopen a bucket that a previous run flushed unfinished."""
+        self.start, self.samples = int(record[0]), int(record[1])
+        means = record[2:]
+        self.sums = [m * self.samples if m == m else 0.0 for m in means]
+        self.counts = [self.samples if m == m else 0 for m in means]
+        self.flushed = True
+
+    def add(self, ts: float, values: tuple[float, ...]) -> tuple | None:
+        """Fold one sample in; returns the finished record if *ts* opened a new bucket."""
+        start = int(ts) - int(ts) % self.width
+        done = None
+        if self.start != start:
+            if self.start is not None and start < self.start:
+                return None              # late sample for a bucket already written
+            done = self.record()
+            self.start, self.samples, self.flushed = start, 0, False
+            self.sums = [0.0] * len(values)
+            self.counts = [0] * len(values)
+        self.samples += 1
+        sums, counts = self.sums, self.counts
+        for i, value in enumerate(values):
+            if value == value:           # skip NaN
+                sums[i] += value
+                counts[i] += 1
+        return done
+
+    def record(self) -> tuple | None:
+        if self.start is None or not self.samples:
+            return None
+        return (self.start, float(self.samples), *(
+            s / n if n else math.nan for s, n in zip(self.sums, self.counts)))
+
+
+class TimeSeriesStore:
+    """Per-node tiered segments (raw, 1 min, 1 h), plus change-only metadata."""
+
+    def __init__(self, root: str, *, create: bool = True):
+        self.root = os.path.expanduser(root)
+        if create:
+            os.makedirs(self.root, exist_ok=True)
+        self._last: dict[str, bytes] = {}
+        self._meta: dict[str, dict] = {}
+        # node -> open bucket per rollup tier (built on the node's first sample)
+        self._rollups: dict[str, dict[str, Rollup]] = {}
+        self._days: dict[str, str] = {}       # node -> current raw segment key
+
+    def node_dir(self, node: str, *, create: bool = False) -> str:
+        path = os.path.join(self.root, quote(node, safe=""))
+        if create:
+            os.makedirs(path, exist_ok=True)
+        return path
+
+    def segment(self, node: str, ts: float, tier: str = "raw") -> Segment:
+        t = TIER_BY_NAME[tier]
+        return Segment(os.path.join(self.node_dir(node), f"{t.name}-{t.key(ts)}.tsdb"), t.fields)
+
+    def segments(self, node: str, tier: str, start: float = 0,
+                 end: float = math.inf) -> list[tuple[str, Segment]]:
+        """``(key, Segment)`` of *tier* overlapping ``[start, end)``, oldest first."""
+        t = TIER_BY_NAME[tier]
+        directory = self.node_dir(node)
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return []
+        prefix = t.name + "-"
+        out = []
+        for name in sorted(names):
+            if not (name.startswith(prefix) and name.endswith(".tsdb")):
+                continue
+            key = name[len(prefix):-len(".tsdb")]
+            try:
+                first, after = t.span(key)
+            except ValueError:
+                continue
+            if first < end and after > start:
+                out.append((key, Segment(os.path.join(directory, name), t.fields)))
+        return out
+
+    # ------------------------------------------------------------------ #
+    # Writing
+    # ------------------------------------------------------------------ #
+    def append(self, node: str, row: Mapping[str, Mapping], ts: float | None = None) -> bool:
+        """
+        Append one sample for *node* from its FleetState row and fold it
+        into the open rollup buckets. Raw samples equal to the previous one
+        (uptime aside) are skipped; returns True if the raw sample was written.
+        """
+        ts = time.time() if ts is None else ts
+        values = sample_from_row(row)
+        if node not in self._rollups:
+            self._resume(node, ts)
+        self._roll(node, ts, values)
+
+        # NaN != NaN, so compare packed bytes; uptime always moves, ignore it
+        packed = struct.pack(f"<{len(values) - 1}d", *values[:_UPTIME], *values[_UPTIME + 1:])
+        if self._last.get(node) == packed:
+            self._write_meta(node, row, ts)
+            return False
+        self._last[node] = packed
+        self.node_dir(node, create=True)
+        day = TIERS[0].key(ts)
+        if self._days.get(node) != day:
+            self._days[node] = day
+            self.prune(node, ts)
+        self.segment(node, ts).append([(int(ts), *values)])
+        self._write_meta(node, row, ts)
+        return True
+
+    def _roll(self, node: str, ts: float, values: tuple[float, ...]) -> None:
+        for tier, rollup in self._rollups[node].items():
+            flushed = rollup.flushed
+            done = rollup.add(ts, values)
+            if done is not None:
+                self._write_bucket(node, tier, done, replace=flushed)
+
+    def _write_bucket(self, node: str, tier: str, record: tuple, *, replace: bool) -> None:
+        segment = self.segment(node, record[0], tier)
+        if replace:
+            segment.replace_last(record)
+        else:
+            self.node_dir(node, create=True)
+            segment.append([record])
+
+    def flush(self) -> None:
+        """
+        Write every open rollup bucket as it stands, e.g. on shutdown. A
+        bucket that keeps filling afterwards is rewritten in place when it
+        closes; a restart within it picks it up again.
+        """
+        for node, rollups in self._rollups.items():
+            for tier, rollup in rollups.items():
+                record = rollup.record()
+                if record is not None:
+                    self._write_bucket(node, tier, record, replace=rollup.flushed)
+                    rollup.flushed = True
+
+    def _resume(self, node: str, ts: float) -> None:
+        """
+        First sample for *node* since start-up: rebuild each open bucket
+        (and any bucket a previous run never finished) from the raw tier,
+        or reopen the one a previous run flushed on exit.
+        """
+        rollups = self._rollups[node] = {t.name: Rollup(t.width) for t in TIERS if t.width}
+        raw_from = ts - TIERS[0].retention
+        for tier, rollup in rollups.items():
+            done = self.segments(node, tier)
+            last = done[-1][1].last() if done else None
+            if last is not None and last[0] == int(ts) - int(ts) % rollup.width:
+                rollup.resume(last)
+                continue
+            start = raw_from if last is None else max(raw_from, last[0] + rollup.width)
+            for rec in self._raw_records(node, start, ts):
+                finished = rollup.add(rec[0], rec[1:])
+                if finished is not None:
+                    self.segment(node, finished[0], tier).append([finished])
+
+    def _raw_records(self, node: str, start: float, end: float) -> list[tuple]:
+        out = []
+        for _, segment in self.segments(node, "raw", start, end):
+            out.extend(segment.read(start, end))
+        return out
+
+    def prune(self, node: str, now: float | None = None) -> int:
+        """Delete *node*'s segments past their tier's retention; returns files removed."""
+        now = time.time() if now is None else now
+        removed = 0
+        for tier in TIERS:
+            if tier.retention is None:
+                continue
+            cutoff = now - tier.retention
+            for key, segment in self.segments(node, tier.name, 0, cutoff):
+                # only whole segments go: the newest one may still be in range
+                if tier.span(key)[1] <= cutoff:
+                    try:
+                        os.remove(segment.path)
+                        removed += 1
+                    except FileNotFoundError:
+                        pass
+        return removed
+
+    def _write_meta(self, node: str, row: Mapping[str, Mapping], ts: float) -> None:
+        config = row.get("config", {})
+        meta = {k: config[k] for k in META_KEYS if k in config}
+        if not meta or meta == self._meta.get(node):
+            return
+        self._meta[node] = meta
+        with open(os.path.join(self.node_dir(node, create=True), "meta.jsonl"), "a") as f:
+            f.write(json.dumps({"ts": int(ts), **meta}) + "\n")
+
+    # ------------------------------------------------------------------ #
+    # Reading
+    # ------------------------------------------------------------------ #
+    def nodes(self) -> list[str]:
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return sorted(unquote(d) for d in names if os.path.isdir(os.path.join(self.root, d)))
+
+    @staticmethod
+    def pick_tier(start: float, end: float, *, points: int | None = None,
+                  now: float | None = None) -> str:
+        """
+        Coarsest tier still holding data from *start* that has at least
+        *points* buckets over ``[start, end)`` (raw counts as 1 s) – the
+        cheapest read that still resolves *points* slots. Without
+        *points*, or if no coarse tier resolves them, the finest one.
+        """
+        now = time.time() if now is None else now
+        kept = [tier for tier in TIERS
+                if tier.retention is None or start >= now - tier.retention]
+        if points is not None:
+            for tier in reversed(kept):
+                if (end - start) / max(1, tier.width) >= points:
+                    return tier.name
+        return kept[0].name if kept else TIERS[-1].name
+
+    def records(self, node: str, start: float, end: float, tier: str = "raw") -> tuple[tuple, list]:
+        """``(fields, records)`` of *tier* in ``[start, end)`` – tuples, no dicts."""
+        fields, out = TIER_BY_NAME[tier].fields, []
+        for _, segment in self.segments(node, tier, start, end):
+            out.extend(segment.read(start, end))
+            fields = segment.fields
+        if tier != "raw":
+            # the open bucket is not on disk yet
+            rollup = self._rollups.get(node, {}).get(tier)
+            record = rollup.record() if rollup is not None else None
+            if record is not None and start <= record[0] < end:
+                if out and out[-1][0] == record[0]:
+                    out[-1] = record         # flushed earlier, grown since
+                elif not out or out[-1][0] < record[0]:
+                    out.append(record)
+        return fields, out
+
+    def query(self, node: str, start: float, end: float, tier: str = "raw") -> list[dict]:
+        """Samples of *tier* for *node* in ``[start, end)`` as ``{"ts": …, field: …}`` dicts."""
+        fields, records = self.records(node, start, end, tier)
+        return [{"ts": rec[0], **{
+            name: value for name, value in zip(fields, rec[1:]) if not math.isnan(value)
+        }} for rec in records]
+
+    def series(self, node: str, field: str, start: float, end: float, *,
+               points: int | None = None, max_points: int | None = None,
+               now: float | None = None) -> tuple[list[int], list[float]]:
+        """
+        One field over ``[start, end)`` from the tier ``pick_tier`` chooses
+        for *points* slots – ``(timestamps, values)``, unknown values
+        dropped. Beyond *max_points* values, runs of consecutive ones are
+        averaged into one. Chart-ready.
+        """
+        fields, records = self.records(
+            node, start, end, self.pick_tier(start, end, points=points, now=now))
+        i = fields.index(field) + 1
+        ts, values = [], []
+        for rec in records:
+            if rec[i] == rec[i]:
+                ts.append(rec[0])
+                values.append(rec[i])
+        if max_points is not None and len(values) > max_points:
+            step = math.ceil(len(values) / max_points)
+            ts = ts[::step]
+            values = [math.fsum(values[j:j + step]) / len(values[j:j + step])
+                      for j in range(0, len(values), step)]
+        return ts, values
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Ticker
+============
+One shared local clock for values that age between polls (uptime,
+"last checked …ago").
+
+The app drives ``tick()`` from a single 1 s timer; every subscriber is
+called with the same ``now`` so a thousand-row fleet table and the node
+widgets all advance together, with no per-widget timers and no network.
+"""
+
+import time
+from typing import Callable
+
+
+class Ticker:
+    """Fan one clock reading out to every subscriber."""
+
+    def __init__(self, clock: Callable[[], float] | None = None):
+        self._clock = clock or time.time
+        self._callbacks: list[Callable[[float], None]] = []
+
+    def add(self, callback: Callable[[float], None]) -> None:
+        self._callbacks.append(callback)
+
+    def remove(self, callback) -> None:
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def tick(self) -> None:
+        now = self._clock()
+        for callback in list(self._callbacks):
+            callback(now)
@@ -8,34 +8,86 @@ CLI flags
 --api-port        Port exposing /api/*            (default: 3000)
 --metrics-port    Port exposing /metrics          (default: 3001)
 --password        HTTP basic password (overrides config file)
+--per-host-connections  Max pooled connections per node  (default: 4)
+--keepalive       Seconds an idle pooled connection is kept open (default: 30)
+--http2           Use HTTP/2 when the optional ``h2`` package is installed
+--inventory       Fleet mode: JSON file of nodes (see core/fleet.py)
+--connect-timeout Seconds the startup reachability check waits (default: 5)
+--check-hosts     Fleet mode: probe every node at startup, warn about unreachable ones
+--concurrency     Max requests in flight across all nodes (default: 64)
+--jitter          Fleet mode: random spread of each poll, 0..1 (default: 0.2)
+--workers         Fleet mode: poll and extract in N worker processes (0 = in-process,
+                  default; "auto" = one per CPU)
+--poll-bounds     NAME=MIN:MAX seconds an adaptive poll may range over, per
+                  widget (status/performance/qos/points/config); repeatable
+--history-size    Samples of sparkline history kept per node (default: 240)
+--rate-window     EWMA time constant for derived rates in seconds (default: 60)
+--headless        Record metrics to a time-series store instead of running the TUI
+--store           Time-series directory: headless writes it, the TUI charts it (F3)
+                  (default: ~/.local/share/multisync-tui/tsdb)
+--sample-interval Headless: seconds between stored samples (default: 15)
+--export          [HOST:]PORT to serve polled metrics as OpenMetrics on /metrics
+                  (default host: 127.0.0.1); works with the TUI and --headless
+--record          Capture every polled response to FILE (compact JSON Lines, .gz ok)
+--replay          Play FILE back through the TUI with no network
+--speed           Replay speed multiplier, 0 = as fast as possible (default: 1)
+--snapshot        Last-known values file for warm starts
+                  (default: ~/.cache/multisync-tui/snapshot.json)
+--no-snapshot     Neither read nor write the snapshot file
+--alerts          JSON file of alert rules and sinks (see core/alerts.py); TUI and --headless
+--agent           [HOST:]PORT of the node's agent.py: one compressed delta stream
+                  instead of polling (inventory: "agent" per node)
+--max-fps         Frames per second the TUI may draw; repaints in between are
+                  merged, newest data wins (default: 20; 0 = no batching)
+--once            Fetch every endpoint once, print a json (default) or tsv snapshot
+                  and exit; status 1 if any node reported an error. No Textual needed
 """
 
 import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import copy
+import functools
 import json
+import logging
 import os
+import random
+import signal
 import sys
+import time
+from typing import Iterable, Mapping
 from urllib.parse import urlparse
 
 import httpx
-from textual.app import App, ComposeResult
-from textual.binding import Binding
-from textual.containers import Grid, Vertical
-from textual.widgets import Footer, Header
 
-from widgets.config_widget import ConfigWidget
-from widgets.performance_widget import PerformanceWidget
-from widgets.points_widget import PointsWidget
-from widgets.qos_widget import QOSWidget
-from widgets.status_widget import StatusWidget
+from core.agent import Decoder, PING_EVERY, apply as apply_delta, fetch_snapshot, hello
+from core.exporter import MetricsExporter
+from core.extract import SECTIONS
+from core.fleet import SUMMARY_SECTIONS, FleetState, Node, load_inventory
+from core.http_pool import HTTPPool, http2_available
+from core.rates import DerivedMetrics
+from core.recording import Recorder, header_nodes, read_header, read_records
+from core.scheduler import (
+    DEADLINE_MIN, DEFAULT_MAX_INTERVAL, ERROR_BACKOFF, PollScheduler, _Endpoint,
+    listen_address_arg, load_password_from_config, parse_response,
+)
+from core.snapshot import DEFAULT_PATH as DEFAULT_SNAPSHOT, SnapshotCache
+from core.store import TimeSeriesStore
+
+DEFAULT_STORE = "~/.local/share/multisync-tui/tsdb"
+
+# frames per second the TUI draws at most (--max-fps)
+DEFAULT_MAX_FPS = 20.0
 
 # ---------------------------------------------------------------------- #
 # Helpers
 # ---------------------------------------------------------------------- #
 
-def validate_server_url(host: str, port: int) -> str:
+def server_url(host: str, port: int) -> str:
     """
-    Build **http://host:port**, run a quick reachability check, and
-    return the finished URL string. Exits with code 1 on any failure.
+    Build **http://host:port** and return the finished URL string.
+    Exits with code 1 if *host* has no usable hostname.
     """
     # Ensure we have a hostname
     parsed = urlparse(host if "://" in host else f"http://{host}")
@@ -43,31 +95,440 @@ def validate_server_url(host: str, port: int) -> str:
         print(f"Invalid host: {host!r}")
         sys.exit(1)
 
-    url = f"http://{parsed.hostname}:{port}"
+    return f"http://{parsed.hostname}:{port}"
+
+
+async def check_reachable(urls: list[str], *, timeout: float = 5.0,
+                          concurrency: int = 64) -> dict[str, str | None]:
+    """
+    Probe every URL concurrently (HEAD, GET on 405) and map each to an
+    error message, or None if it answered. However many hosts are
+    unreachable, the check takes about one *timeout*.
+    """
+    limit = asyncio.Semaphore(concurrency)
+
+    async def probe(client: httpx.AsyncClient, url: str) -> str | None:
+        async with limit:
+            try:
+                resp = await client.head(url)
+                if resp.status_code == 405:  # Method Not Allowed
+                    await client.get(url)
+            except httpx.RequestError as e:
+                return str(e) or type(e).__name__
+        return None
+
+    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
+        results = await asyncio.gather(*(probe(client, url) for url in urls))
+    return dict(zip(urls, results))
+
+
+def start_reachability_check(urls: list[str], **kwargs) -> concurrent.futures.Future:
+    """
+    Run ``check_reachable`` on a worker thread so the network round
+    trips overlap with importing the UI; ``.result()`` joins it.
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(asyncio.run, check_reachable(list(dict.fromkeys(urls)), **kwargs))
+    executor.shutdown(wait=False)
+    return future
+
 
+def poll_bounds_arg(spec: str) -> tuple[str, tuple[float, float]]:
+    """argparse type for ``--poll-bounds NAME=MIN:MAX`` (seconds)."""
+    name, sep, rng = spec.partition("=")
+    lo, sep2, hi = rng.partition(":")
     try:
-        resp = httpx.head(url, timeout=5.0, follow_redirects=True)
-        if resp.status_code == 405:  # Method Not Allowed
-            resp = httpx.get(url, timeout=5.0, follow_redirects=True)
-    except httpx.RequestError as e:
-        print(f"Cannot reach '{url}': {e}")
-        sys.exit(1)
+        if not (sep and sep2):
+            raise ValueError
+        bounds = (float(lo), float(hi))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected NAME=MIN:MAX, got {spec!r}") from None
+    if name not in SECTIONS:
+        raise argparse.ArgumentTypeError(
+            f"unknown widget {name!r} (choose from {', '.join(SECTIONS)})")
+    if not 0 < bounds[0] <= bounds[1]:
+        raise argparse.ArgumentTypeError(f"need 0 < MIN <= MAX, got {spec!r}")
+    return name, bounds
+
 
-    return url
+def cap_textual_fps(max_fps: float) -> None:
+    """Hold Textual's own screen updates to *max_fps*; call before importing Textual."""
+    if max_fps > 0:
+        # Textual reads its frame cap once, at import
+        os.environ["TEXTUAL_FPS"] = str(max(1, round(max_fps)))
+
+
+def workers_arg(spec: str) -> int:
+    """``N`` or ``auto`` (one worker per CPU)."""
+    if spec == "auto":
+        return os.cpu_count() or 1
+    try:
+        workers = int(spec)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number or 'auto', got {spec!r}")
+    if workers < 0:
+        raise argparse.ArgumentTypeError("worker count cannot be negative")
+    return workers
 
 
-def load_password_from_config() -> str:
+# ---------------------------------------------------------------------- #
+# Scheduler variants (the base ``PollScheduler`` lives in core/scheduler.py)
+# ---------------------------------------------------------------------- #
+class ReplayScheduler(PollScheduler):
     """
-    Read a password from the default config.json files
+    Drop-in ``PollScheduler`` that plays a ``--record`` capture back to
+    the same subscribers instead of polling – no network at all.
+
+    Recorded gaps are divided by *speed* (``<= 0``: as fast as possible);
+    ``clock`` reports the recorded time so rates and history stay true
+    to the capture at any speed.
     """
-    cfg_path = os.path.expanduser("~/.synchronizer-cli/config.json")
-    if os.path.exists(cfg_path):
-        try:
-            with open(cfg_path) as f:
-                return json.load(f).get("dashboardPassword", "")
-        except (OSError, json.JSONDecodeError):
-            pass
-    return ""
+
+    def __init__(self, path: str, *, speed: float = 1.0):
+        super().__init__(pool=None)
+        self._path = path
+        self._speed = speed
+        self._now = read_header(path)["start"]
+        self._feeder: asyncio.Task | None = None
+
+    def clock(self) -> float:
+        return self._now
+
+    def start(self) -> None:
+        self._running = True
+        if self._feeder is None:
+            self._feeder = asyncio.create_task(self._feed())
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._feeder is not None:
+            self._feeder.cancel()
+            await asyncio.gather(self._feeder, return_exceptions=True)
+            self._feeder = None
+
+    async def _poll(self, ep: _Endpoint) -> None:
+        """Nothing to poll – ``_feed`` pushes every endpoint."""
+
+    async def _feed(self) -> None:
+        log = logging.getLogger(__name__)
+        records = 0
+        for ts, url, payload in read_records(self._path):
+            if self._speed > 0 and ts > self._now:
+                await asyncio.sleep((ts - self._now) / self._speed)
+            elif records % 256 == 0:
+                await asyncio.sleep(0)   # let the UI breathe at full speed
+            self._now = max(self._now, ts)
+            records += 1
+            ep = self._endpoints.get(url)
+            if ep is None:
+                continue
+            if payload is None:
+                self._unchanged(ep)
+            else:
+                self._publish(ep, payload)
+        log.info("replay finished after %d records", records)
+
+
+class AgentScheduler(PollScheduler):
+    """
+    ``PollScheduler`` for inventories where some nodes run ``agent.py``.
+
+    Those nodes' URLs are never polled: each agent keeps one persistent
+    connection and pushes compressed field-level deltas (``core.agent``),
+    which are applied to a local copy of its snapshot and published to
+    the URL's subscribers like a fresh poll. Pings count as "unchanged".
+    Every other URL is polled as usual.
+
+    The merged state of each agent is kept, so a subscriber joining after
+    the snapshot (a node drill-down) gets the current value at once.
+
+    A dropped connection publishes an error to the node's subscribers and
+    reconnects with exponential backoff; each reconnect starts over with
+    a full snapshot. ``invalidate`` is forwarded to the agents.
+    """
+
+    def __init__(self, pool: HTTPPool, *, nodes: Iterable[Node], **kwargs):
+        super().__init__(pool, **kwargs)
+        self._agents = {node.name: node for node in nodes if node.agent}
+        # url -> (node name, endpoint path) for every URL an agent serves
+        self._served: dict[str, tuple[str, str]] = {
+            node.url(path): (node.name, path)
+            for node in self._agents.values()
+            for paths, _, _ in SECTIONS.values() for path in paths
+        }
+        self._streams: dict[str, asyncio.Task] = {}
+        self._writers: dict[str, asyncio.StreamWriter] = {}
+        # node name -> {path: payload} as last streamed (or the connection error)
+        self._states: dict[str, dict[str, Mapping]] = {}
+
+    def subscribe(self, url: str, callback, **kwargs) -> int:
+        token = super().subscribe(url, callback, **kwargs)
+        if self._running and url in self._served:
+            name, path = self._served[url]
+            self._connect(name)
+            state = self._states.get(name, {})
+            if path in state:
+                # a new endpoint would otherwise wait for the next delta
+                self._agent_publish(self._agents[name], path, state[path])
+        return token
+
+    def invalidate(self, urls: Iterable[str] | None = None) -> None:
+        urls = None if urls is None else list(urls)
+        super().invalidate(urls)
+        wanted: dict[str, list[str] | None] = {}
+        if urls is None:
+            wanted = dict.fromkeys(self._writers)
+        else:
+            for url in urls:
+                if url in self._served:
+                    name, path = self._served[url]
+                    wanted.setdefault(name, []).append(path)
+        for name, paths in wanted.items():
+            writer = self._writers.get(name)
+            if writer is not None:
+                writer.write(json.dumps({"type": "invalidate", "paths": paths}).encode() + b"\n")
+
+    def start(self) -> None:
+        super().start()
+        for url in self._endpoints:
+            if url in self._served:
+                self._connect(self._served[url][0])
+
+    async def stop(self) -> None:
+        streams, self._streams = list(self._streams.values()), {}
+        for task in streams:
+            task.cancel()
+        await asyncio.gather(*streams, return_exceptions=True)
+        await super().stop()
+
+    def _connect(self, name: str) -> None:
+        if name not in self._streams:
+            self._streams[name] = asyncio.create_task(self._stream(self._agents[name]))
+
+    async def _poll(self, ep: _Endpoint) -> None:
+        if ep.url not in self._served:
+            await super()._poll(ep)
+
+    async def _stream(self, node: Node) -> None:
+        host, _, port = node.agent.rpartition(":")
+        failures = 0
+        while True:
+            writer = None
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(host, int(port)), DEADLINE_MIN * 5)
+                writer.write(hello(node.password))
+                self._writers[node.name] = writer
+                decoder = Decoder()
+                state = self._states[node.name] = {}
+                while True:
+                    # an agent pings every PING_EVERY s; silence for 3 means it is gone
+                    data = await asyncio.wait_for(reader.read(1 << 16), PING_EVERY * 3)
+                    if not data:
+                        raise ConnectionError("agent closed the connection")
+                    for message in decoder.feed(data):
+                        touched = apply_delta(state, message)
+                        failures = 0
+                        if message.get("type") == "ping":
+                            self._agent_idle(node)
+                        for path in touched:
+                            self._agent_publish(node, path, state[path])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                reason = ("No answer from agent" if isinstance(e, asyncio.TimeoutError)
+                          else str(e) or type(e).__name__)
+                error = {"error": f"agent {node.agent}: {reason}"}
+                state = self._states[node.name] = dict.fromkeys(
+                    (p for paths, _, _ in SECTIONS.values() for p in paths), error)
+                for path, payload in state.items():
+                    self._agent_publish(node, path, payload)
+                failures += 1
+                cap = min(DEFAULT_MAX_INTERVAL, ERROR_BACKOFF ** failures)
+                await asyncio.sleep(cap / 2 + random.uniform(0, cap / 2))
+            finally:
+                self._writers.pop(node.name, None)
+                if writer is not None:
+                    writer.close()
+
+    def _agent_publish(self, node: Node, path: str, payload: Mapping) -> None:
+        ep = self._endpoints.get(node.url(path))
+        if ep is None or payload == ep.payload:
+            return
+        # deltas patch *state* in place: subscribers get their own copy
+        payload = copy.deepcopy(payload)
+        if self._recorder is not None:
+            self._recorder.write(ep.url, payload)
+        self._publish(ep, payload)
+
+    def _agent_idle(self, node: Node) -> None:
+        for url, (name, _) in self._served.items():
+            ep = self._endpoints.get(url)
+            if name == node.name and ep is not None:
+                self._unchanged(ep)
+
+
+# ---------------------------------------------------------------------- #
+# Headless collector
+# ---------------------------------------------------------------------- #
+async def collect(
+    nodes: list[Node],
+    *,
+    http_pool: HTTPPool,
+    scheduler: PollScheduler,
+    store: TimeSeriesStore,
+    sample_interval: float,
+    poll_bounds: Mapping[str, tuple[float, float]] | None = None,
+    export: tuple[str, int] | None = None,
+    alerts: tuple[list, list] | None = None,
+    shards=None,                  # core.shards.ShardPool
+) -> None:
+    """
+    Run every widget's extraction pipeline for *nodes* without Textual
+    and append one sample per node every *sample_interval* s.
+    With *export* the same data is served as OpenMetrics; *alerts*
+    (``load_alerts`` output) are evaluated on the same stream. With
+    *shards* the nodes are polled by worker processes instead.
+    Stops cleanly on SIGINT / SIGTERM.
+    """
+    fleet = FleetState(scheduler, nodes, sections=SECTIONS, bounds=poll_bounds,
+                       poll=shards is None)
+    if shards is not None:
+        shards.attach(fleet)
+    seen: set[str] = set()
+    fleet.add_listener(lambda node, section, data: seen.add(node))
+    exporter = MetricsExporter(fleet) if export else None
+    engine = None
+    if alerts:
+        rules, sinks = alerts
+        if any(rule.section == DerivedMetrics.SECTION for rule in rules):
+            DerivedMetrics(fleet)
+        from core.alerts import AlertEngine
+        engine = AlertEngine(fleet, rules, sinks=sinks)
+
+    async def check_alerts():
+        while True:
+            await asyncio.sleep(1)
+            engine.check()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop.set)
+
+    scheduler.start()
+    if shards is not None:
+        shards.start()
+    checker = asyncio.create_task(check_alerts()) if engine is not None else None
+    try:
+        if exporter is not None:
+            await exporter.start(*export)
+        while not stop.is_set():
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), sample_interval)
+            # every node with data, changed or not: steady stretches (a node
+            # down or idle) still fill the rollups; the store skips repeated
+            # raw samples itself
+            now = time.time()
+            for name in seen:
+                store.append(name, fleet.rows[name], now)
+    finally:
+        store.flush()
+        if checker is not None:
+            checker.cancel()
+        if exporter is not None:
+            await exporter.stop()
+        await scheduler.stop()
+        if shards is not None:
+            await shards.stop()
+        await http_pool.aclose()
+        if engine is not None:
+            await engine.aclose()
+
+
+# ---------------------------------------------------------------------- #
+# One-shot snapshot
+# ---------------------------------------------------------------------- #
+async def fetch_once(nodes: list[Node], *, http_pool: HTTPPool, concurrency: int,
+                     timeout: float = 10.0) -> dict[str, dict[str, Mapping]]:
+    """
+    Fetch every endpoint the widgets use for *nodes* – each URL once, all
+    at the same time, at most *concurrency* in flight – and run the
+    widgets' extractors on the results: ``{node: {section: data}}``.
+    Nodes with an agent are read from its snapshot instead.
+    """
+    limit = asyncio.Semaphore(concurrency)
+
+    async def from_agent(node: Node) -> dict[str, Mapping]:
+        async with limit:
+            try:
+                state = await asyncio.wait_for(fetch_snapshot(node.agent, node.password), timeout)
+            except Exception as e:
+                reason = "No answer from agent" if isinstance(e, asyncio.TimeoutError) else str(e) or type(e).__name__
+                state = {"error": {"error": f"agent {node.agent}: {reason}"}}
+        return {node.url(path): state.get(path) or state.get("error")
+                or {"error": "agent has no data yet"}
+                for paths, _, _ in SECTIONS.values() for path in paths}
+
+    async def fetch(url: str, auth) -> Mapping:
+        async with limit:
+            try:
+                return parse_response(await http_pool.get(url, auth=auth))
+            except Exception as e:
+                return parse_response(e)
+
+    urls: dict[str, tuple] = {}
+    for node in nodes:
+        if node.agent:
+            continue
+        for paths, _, _ in SECTIONS.values():
+            for path in paths:
+                urls.setdefault(node.url(path), node.auth)
+    try:
+        results = await asyncio.gather(
+            *(fetch(url, auth) for url, auth in urls.items()),
+            *(from_agent(node) for node in nodes if node.agent))
+        payloads = dict(zip(urls, results))
+        for served in results[len(urls):]:
+            payloads.update(served)
+    finally:
+        await http_pool.aclose()
+
+    return {
+        node.name: {
+            section: extractor(*(payloads[node.url(p)] for p in paths))
+            for section, (paths, extractor, _) in SECTIONS.items()
+        }
+        for node in nodes
+    }
+
+
+def format_once(rows: Mapping[str, Mapping[str, Mapping]], fmt: str) -> str:
+    """
+    ``json``: ``{"at": epoch, "nodes": {node: {section: data}}}``.
+    ``tsv``: a header of ``section.field`` columns, then one line per node.
+    """
+    if fmt == "json":
+        return json.dumps({"at": int(time.time()), "nodes": rows}, indent=2)
+
+    # columns grouped by section, fields in first-seen order across nodes
+    columns: dict[str, dict[str, None]] = {section: {} for section in SECTIONS}
+    for row in rows.values():
+        for section, data in row.items():
+            columns[section].update(dict.fromkeys(data))
+    header = [(section, key) for section, keys in columns.items() for key in keys]
+
+    def cell(value) -> str:
+        if value is None:
+            return ""
+        return " ".join(str(value).split()) if isinstance(value, str) else str(value)
+
+    lines = ["\t".join(["node", *(f"{section}.{key}" for section, key in header)])]
+    for name, row in rows.items():
+        lines.append("\t".join([cell(name), *(
+            cell(row.get(section, {}).get(key)) for section, key in header)]))
+    return "\n".join(lines)
 
 
 # ---------------------------------------------------------------------- #
@@ -79,90 +540,267 @@ def make_arg_parser() -> argparse.ArgumentParser:
     p.add_argument("--api-port", type=int, default=3000, help="Port exposing /api/*")
     p.add_argument("--metrics-port", type=int, default=3001, help="Port exposing /metrics")
     p.add_argument("--password", default=None, help="Web service password")
+    p.add_argument("--per-host-connections", type=int, default=4,
+                   help="Max pooled connections per node (default: 4)")
+    p.add_argument("--keepalive", type=float, default=30.0,
+                   help="Seconds an idle pooled connection is kept open (default: 30)")
+    p.add_argument("--http2", action="store_true",
+                   help="Use HTTP/2 (requires: pip install httpx[http2])")
+    p.add_argument("--inventory", metavar="FILE", default=None,
+                   help="Fleet mode: JSON inventory of nodes to monitor")
+    p.add_argument("--connect-timeout", type=float, default=5.0,
+                   help="Seconds the startup reachability check (and each --once "
+                        "request) waits per host (default: 5)")
+    p.add_argument("--check-hosts", action="store_true",
+                   help="Fleet mode: probe every node at startup and list unreachable ones")
+    p.add_argument("--concurrency", type=int, default=64,
+                   help="Max requests in flight across all nodes (default: 64)")
+    p.add_argument("--jitter", type=float, default=0.2,
+                   help="Fleet mode: fraction of each interval to randomise polls by (default: 0.2)")
+    p.add_argument("--workers", metavar="N", type=workers_arg, default=0,
+                   help="Fleet mode: shard polling and extraction across N processes "
+                        "('auto' = one per CPU; default: 0, in-process)")
+    p.add_argument("--poll-bounds", metavar="NAME=MIN:MAX", type=poll_bounds_arg,
+                   action="append", default=[],
+                   help="Adaptive poll range in seconds for one widget "
+                        f"({'/'.join(SECTIONS)}), e.g. qos=5:60; repeatable")
+    p.add_argument("--history-size", type=int, default=240,
+                   help="Samples of trend history kept per node (default: 240)")
+    p.add_argument("--rate-window", type=float, default=60.0,
+                   help="Smoothing time constant for derived rates, seconds (default: 60)")
+    p.add_argument("--headless", action="store_true",
+                   help="Collect metrics to --store without starting the TUI")
+    p.add_argument("--store", metavar="DIR", default=DEFAULT_STORE,
+                   help="Time-series directory: written by --headless, charted by the "
+                        f"TUI history view (F3) (default: {DEFAULT_STORE})")
+    p.add_argument("--sample-interval", type=float, default=15.0,
+                   help="Headless: seconds between stored samples (default: 15)")
+    p.add_argument("--record", metavar="FILE", default=None,
+                   help="Capture every polled response to FILE (.gz = compressed)")
+    p.add_argument("--replay", metavar="FILE", default=None,
+                   help="Play a --record capture back through the TUI, no network")
+    p.add_argument("--speed", type=float, default=1.0,
+                   help="Replay speed multiplier; 0 = as fast as possible (default: 1)")
+    p.add_argument("--export", metavar="[HOST:]PORT", type=listen_address_arg, default=None,
+                   help="Serve polled metrics as OpenMetrics on http://HOST:PORT/metrics "
+                        "(default host: 127.0.0.1)")
+    p.add_argument("--snapshot", metavar="FILE", default=DEFAULT_SNAPSHOT,
+                   help="Last-known values painted at launch and kept during outages "
+                        f"(default: {DEFAULT_SNAPSHOT})")
+    p.add_argument("--no-snapshot", action="store_true",
+                   help="Start cold: neither read nor write --snapshot")
+    p.add_argument("--alerts", metavar="FILE", default=None,
+                   help="JSON alert rules and sinks (file / command / webhook)")
+    p.add_argument("--agent", metavar="[HOST:]PORT", default=None,
+                   help="Stream from the node's agent.py instead of polling its API "
+                        "(HOST defaults to --host); in an inventory set \"agent\" per node")
+    p.add_argument("--max-fps", type=float, default=DEFAULT_MAX_FPS,
+                   help="Frame budget: batch repaints into at most this many frames per "
+                        f"second (default: {DEFAULT_MAX_FPS:g}; lower it on slow links; "
+                        "0 = no batching)")
+    p.add_argument("--once", nargs="?", const="json", choices=("json", "tsv"), default=None,
+                   help="Print one snapshot of every node (json or tsv) and exit; "
+                        "exit status 1 if any node reported an error")
     return p
 
 
-# ---------------------------------------------------------------------- #
-# Textual App
-# ---------------------------------------------------------------------- #
-class DashboardApp(App):
-    CSS_PATH = "dashboard.css"
-    TITLE = "Synchronizer Dashboard TUI"
-
-    # Customize the bottom/footer bar with options
-    COMMAND_PALETTE_DISPLAY = "Ctrl+p"
-    BINDINGS = [
-        Binding("ctrl+q", "quit", "Quit", key_display="Ctrl+q:"),
-    ]
-
-    def __init__(
-        self,
-        *,
-        api_base: str,
-        config_bases: list[str],  # [metrics_base, api_base]
-        api_password: str,
-        **kwargs,
-    ):
-        super().__init__(**kwargs)
-        self._api_base = api_base.rstrip("/")
-        self._password = api_password
-        self._config_bases = config_bases
-
-    # ------------------------------------------------------------------ #
-    # Layout
-    # ------------------------------------------------------------------ #
-    def compose(self) -> ComposeResult:
-        """Build the 2 × 3 grid of widgets."""
-        with Vertical():
-            with Grid(id="body-grid"):
-                # Row 1
-                yield StatusWidget(
-                    "Service Status",
-                    api_base=self._api_base,
-                    api_password=self._password,
-                )
-                yield ConfigWidget(
-                    "Configuration",
-                    endpoints=self._config_bases,
-                    api_password=self._password,
-                )
-
-                # Row 2
-                yield PerformanceWidget(
-                    "Performance",
-                    api_base=self._api_base,
-                    api_password=self._password,
-                )
-                yield QOSWidget(
-                    "QoS Metrics",
-                    api_base=self._api_base,
-                    api_password=self._password,
-                )
-            # Row 3
-            yield PointsWidget("Points",
-                api_base=self._api_base,
-                api_password=self._password)
-        yield Footer()
 # ---------------------------------------------------------------------- #
 # Entrypoint
 # ---------------------------------------------------------------------- #
 def main() -> None:
-    args = make_arg_parser().parse_args()
-
-    # Build & validate the two base URLs we need
-    api_base     = validate_server_url(args.host, args.api_port)
-    metrics_base = validate_server_url(args.host, args.metrics_port)
+    parser = make_arg_parser()
+    args = parser.parse_args()
+    if args.replay and (args.headless or args.record):
+        parser.error("--replay cannot be combined with --headless or --record")
+    if args.once and (args.headless or args.record or args.replay or args.workers):
+        parser.error("--once cannot be combined with --headless, --record, --replay or --workers")
+    if args.workers and not args.inventory:
+        parser.error("--workers needs an --inventory")
+    if args.workers and (args.record or args.replay):
+        parser.error("--workers cannot be combined with --record or --replay")
 
     # Password precedence: CLI > config file
     password = args.password if args.password is not None else load_password_from_config()
 
-    DashboardApp(
-        api_base=api_base,                   # for widgets that append /api/...
-        config_bases=[metrics_base, api_base],
-        api_password=password,
-    ).run()
+    if args.replay:
+        # nodes come from the capture; nothing is ever fetched
+        try:
+            header = read_header(args.replay)
+        except (OSError, ValueError) as e:
+            print(f"Cannot replay {args.replay!r}: {e}")
+            sys.exit(1)
+        nodes = header_nodes(header)
+        fleet_mode = header["fleet"]
+    elif args.inventory:
+        # fleet mode: unreachable nodes just show up as errors in the summary
+        try:
+            nodes = load_inventory(args.inventory, default_password=password)
+        except (OSError, ValueError) as e:
+            print(f"Cannot load inventory {args.inventory!r}: {e}")
+            sys.exit(1)
+        fleet_mode = True
+    else:
+        # Build the two base URLs we need; validated below
+        api_base     = server_url(args.host, args.api_port)
+        metrics_base = server_url(args.host, args.metrics_port)
+        agent = args.agent or ""
+        if agent and ":" not in agent:
+            agent = f"{args.host}:{agent}"
+        nodes = [Node(name=args.host, api_base=api_base, metrics_base=metrics_base,
+                      password=password, agent=agent)]
+        fleet_mode = False
+
+    if args.once:
+        # one concurrent sweep straight to stdout: no TUI, snapshot or probe
+        http_pool = HTTPPool(
+            per_host=args.per_host_connections,
+            max_connections=max(100, args.concurrency),
+            keepalive_expiry=args.keepalive,
+            http2=args.http2,
+            timeout=args.connect_timeout,
+        )
+        rows = asyncio.run(fetch_once(nodes, http_pool=http_pool, concurrency=args.concurrency,
+                                      timeout=args.connect_timeout))
+        print(format_once(rows, args.once))
+        failed = any("error" in data for row in rows.values() for data in row.values())
+        sys.exit(1 if failed else 0)
+
+    alerts = None
+    if args.alerts:
+        from core.alerts import load_alerts
+        try:
+            alerts = load_alerts(args.alerts)
+        except (OSError, ValueError) as e:
+            print(f"Cannot load alert rules {args.alerts!r}: {e}")
+            sys.exit(1)
+
+    # warm start: a replay never touches the live snapshot
+    snapshots = None
+    if not (args.headless or args.replay or args.no_snapshot):
+        snapshots = SnapshotCache(os.path.expanduser(args.snapshot), nodes)
+        warm = snapshots.load()
+    else:
+        warm = 0
+
+    # single node: both ports must answer, unless a snapshot proves it
+    # answered before – then paint the cached values and revalidate;
+    # fleet: only warn (--check-hosts)
+    # (nodes behind an agent are not reachable directly)
+    check = None
+    polled = [n for n in nodes if not n.agent]
+    if not args.replay and polled and (args.check_hosts if fleet_mode else not warm):
+        check = start_reachability_check(
+            [base for n in polled for base in (n.api_base, n.metrics_base)],
+            timeout=args.connect_timeout, concurrency=args.concurrency,
+        )
+
+    # Textual is only needed (and imported) for the interactive UI; the
+    # import overlaps with the reachability check above
+    if not args.headless:
+        cap_textual_fps(args.max_fps)
+        from app import DashboardApp
+
+    if check is not None:
+        unreachable = {url: err for url, err in check.result().items() if err}
+        for url, err in list(unreachable.items())[:10]:
+            print(f"Cannot reach '{url}': {err}")
+        if len(unreachable) > 10:
+            print(f"… and {len(unreachable) - 10} more")
+        if unreachable and not fleet_mode:
+            sys.exit(1)
+
+    if args.http2 and not http2_available():
+        print("HTTP/2 requested but 'h2' is not installed; falling back to HTTP/1.1")
+
+    http_pool = HTTPPool(
+        per_host=args.per_host_connections,
+        max_connections=max(100, args.concurrency),
+        keepalive_expiry=args.keepalive,
+        http2=args.http2,
+    )
+    recorder = Recorder(args.record, nodes, fleet=fleet_mode) if args.record else None
+    if args.replay:
+        scheduler = ReplayScheduler(args.replay, speed=args.speed)
+    else:
+        # nodes with an agent stream their data; the rest are polled
+        scheduler_cls = (functools.partial(AgentScheduler, nodes=nodes)
+                         if any(n.agent for n in nodes) else PollScheduler)
+        scheduler = scheduler_cls(
+            http_pool,
+            concurrency=args.concurrency,
+            jitter=args.jitter if fleet_mode else 0.0,
+            recorder=recorder,
+        )
+
+    # fleet rows polled by worker processes; the local scheduler above then
+    # only serves drill-down widgets
+    shards = None
+    if args.workers:
+        from core.shards import ShardPool
+        per_worker = -(-args.concurrency // args.workers)
+        shards = ShardPool(
+            nodes, args.workers,
+            make_scheduler=functools.partial(scheduler_cls, concurrency=per_worker,
+                                             jitter=args.jitter),
+            pool_options=dict(per_host=args.per_host_connections,
+                              max_connections=max(100, per_worker),
+                              keepalive_expiry=args.keepalive, http2=args.http2),
+            sections=SECTIONS if args.headless else SUMMARY_SECTIONS,
+            bounds=dict(args.poll_bounds),
+            diagnostics=scheduler.diagnostics,
+        )
+        # workers start polling while Textual loads, and before it takes stdio
+        shards.spawn()
+
+    if args.headless:
+        print(f"Collecting {len(nodes)} node(s) into {args.store} "
+              f"every {args.sample_interval:g}s (Ctrl+C to stop)")
+        if args.export:
+            print("Serving OpenMetrics on http://%s:%d/metrics" % args.export)
+        try:
+            asyncio.run(collect(
+                nodes,
+                http_pool=http_pool,
+                scheduler=scheduler,
+                store=TimeSeriesStore(args.store),
+                sample_interval=args.sample_interval,
+                poll_bounds=dict(args.poll_bounds),
+                export=args.export,
+                alerts=alerts,
+                shards=shards,
+            ))
+        finally:
+            if recorder is not None:
+                recorder.close()
+        return
+
+    try:
+        DashboardApp(
+            nodes=nodes,
+            fleet_mode=fleet_mode,
+            history_size=args.history_size,
+            rate_window=args.rate_window,
+            poll_bounds=dict(args.poll_bounds),
+            export=args.export,
+            clock=scheduler.clock if args.replay else None,
+            http_pool=http_pool,
+            scheduler=scheduler,
+            snapshots=snapshots,
+            alerts=alerts,
+            shards=shards,
+            max_fps=args.max_fps,
+            # history view only reads; never create an empty store from the TUI
+            store=TimeSeriesStore(args.store, create=False)
+            if os.path.isdir(os.path.expanduser(args.store)) and not args.replay else None,
+        ).run()
+    finally:
+        if recorder is not None:
+            recorder.close()
 
 
 if __name__ == "__main__":
+    # httpcore probes for ``trio`` when the first client is built, only to
+    # support trio event loops; this script always runs on asyncio and owns
+    # its process, so skip that import (~90 ms to the first request)
+    sys.modules["trio"] = None
     main()
-
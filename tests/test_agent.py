@@ -0,0 +1,52 @@
+"""AgentScheduler against a live AgentServer on loopback."""
+
+import asyncio
+
+import httpx
+
+from core.agent import AgentServer
+from core.fleet import Node
+from core.scheduler import PollScheduler
+from dashboard import AgentScheduler
+
+API = "http://node.test"
+
+
+class FakePool:
+    """Stands in for ``HTTPPool`` on the agent side: every path answers with its own name."""
+
+    async def get(self, url, **kwargs):
+        return httpx.Response(200, json={"path": url[len(API):]}, request=httpx.Request("GET", url))
+
+
+async def wait_for(predicate, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.05)
+
+
+async def late_subscriber():
+    server = AgentServer(PollScheduler(FakePool()), api_base=API, metrics_base=API,
+                         password="pw")
+    await server.start("127.0.0.1", 0)
+    port = server._server.sockets[0].getsockname()[1]
+    node = Node("n1", API, API, "pw", agent=f"127.0.0.1:{port}")
+    scheduler = AgentScheduler(None, nodes=[node])
+    got: dict[str, dict] = {}
+    try:
+        scheduler.subscribe(node.url("/api/status"), got.__setitem__, interval=5)
+        scheduler.start()
+        await wait_for(lambda: node.url("/api/status") in got)
+
+        # joins after the snapshot: served from the scheduler's copy, not the next delta
+        for path in ("/api/versions", "/metrics"):
+            scheduler.subscribe(node.url(path), got.__setitem__, interval=5)
+            assert got[node.url(path)] == {"path": path}
+    finally:
+        await scheduler.stop()
+        await server.stop()
+
+
+def test_late_subscriber_gets_current_value():
+    asyncio.run(late_subscriber())
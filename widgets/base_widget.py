@@ -3,17 +3,33 @@
 APIWidget
 ============
 Base widget for asynchronous API polling.
-Sets default attributes for all other widgets
+Sets default attributes for all other widgets.
+
+Widgets do not fetch on their own: on mount they subscribe their
+endpoints to the app-wide ``PollScheduler`` and re-extract whenever a
+fresh payload is pushed to ``receive``.
+
+Stale-while-revalidate: the last good ``extract_data`` result stays on
+screen when a poll fails (the scheduler keeps retrying with backoff),
+and on launch a widget paints straight from ``app.snapshots`` if the
+previous run left one. Either way the border subtitle shows how old the
+values are until a fresh response replaces them.
+
+Repaints go through the app's ``FrameScheduler`` (``app.frames``) when
+there is one, so many updates in one frame render once, newest data wins.
 """
 
-import asyncio
+import time
 from typing import Mapping, Sequence
 
-from httpx import AsyncClient
-from textual import work
+from rich.markup import escape
 from textual.reactive import reactive
 from textual.widgets import Static
 
+from core.extract import diff_fields, format_duration, seconds_since
+
+_NOTHING = object()
+
 
 class APIWidget(Static):
     """Base class for all dashboard widgets that hit an HTTP API."""
@@ -24,6 +40,22 @@ class APIWidget(Static):
     # default refresh every N seconds – subclasses can override class attr
     interval: int = 10
 
+    # adaptive polling range (None = interval / scheduler default);
+    # ``--poll-bounds <section>=MIN:MAX`` overrides both per widget
+    min_interval: float | None = None
+    max_interval: float | None = None
+
+    # name used for --poll-bounds (matches the FleetState section)
+    section: str = ""
+
+    # seconds a good response is cached before re-fetching (None = live);
+    # ``DashboardApp.action_refresh`` / a node restart expire it early
+    ttl: float | None = None
+
+    # FleetState fields outside our own payload that we render, e.g.
+    # {"rates": ("in_rate",)} – a change to any of them re-renders us
+    watch_fields: Mapping[str, tuple[str, ...]] = {}
+
     # list of endpoints after normalisation
     endpoints: list[str]
 
@@ -34,16 +66,33 @@ class APIWidget(Static):
         endpoints: str | Sequence[str],
         api_password: str,
         interval: int | None = None,
+        node: str | None = None,
         **kwargs,
     ):
         super().__init__(classes="widget-base", **kwargs)
         self.border_title = title
 
+        # fleet node name, used to look up shared per-node state (history …)
+        self.node = node
+
         # normalise to list[str] so the rest of the code is simple
         self.endpoints = [endpoints] if isinstance(endpoints, str) else list(endpoints)
 
         self._api_password = api_password
 
+        # latest parsed payload per endpoint, filled by the scheduler
+        self._responses: dict[str, Mapping] = {}
+        self._subscriptions: list[int] = []
+        self._watched: dict[str, tuple] = {}
+
+        # wall-clock time the shown values were extracted; why they are
+        # stale ("cached" on warm start, else the error) or None when fresh
+        self._data_at = time.time()
+        self._stale: str | None = None
+
+        # data waiting for the next frame (see ``paint``)
+        self._paint_data = _NOTHING
+
         # allow caller to override the refresh cadence ad-hoc
         if interval is not None:
             self.interval = interval
@@ -52,40 +101,121 @@ class APIWidget(Static):
     # Textual lifecycle
     # ------------------------------------------------------------------ #
     def on_mount(self):
-        # one immediate fetch + recurring timer
-        self.update_data()
-        self.set_interval(self.interval, self.update_data)
+        # the app-wide scheduler fetches each URL once and fans it out
+        scheduler = self.app.scheduler
+        auth = ("", self._api_password)
+        lo, hi = getattr(self.app, "poll_bounds", {}).get(
+            self.section, (self.min_interval, self.max_interval)
+        )
+        self._subscriptions = [
+            scheduler.subscribe(url, self.receive, interval=self.interval,
+                                min_interval=lo, max_interval=hi, ttl=self.ttl,
+                                auth=auth)
+            for url in self.endpoints
+        ]
+        if self.watch_fields and self.node is not None:
+            self.app.fleet.add_listener(self._on_fleet_update)
+
+        self.refresh_alerts()
+        snapshots = getattr(self.app, "snapshots", None)
+        cached = snapshots.get(self.node, self.section) if snapshots is not None else None
+        if cached is not None and not self.data:
+            self.data, self._data_at = cached
+            self._set_stale("cached")
+
+    def on_unmount(self):
+        self.app.ticker.remove(self._show_age)
+        for token in self._subscriptions:
+            self.app.scheduler.unsubscribe(token)
+        self._subscriptions = []
+        if self.watch_fields and self.node is not None:
+            self.app.fleet.remove_listener(self._on_fleet_update)
+
+    def _on_fleet_update(self, node: str, section: str, data: Mapping) -> None:
+        keys = self.watch_fields.get(section) if node == self.node else None
+        if not keys:
+            return
+        values = tuple(data.get(k) for k in keys)
+        if values != self._watched.get(section):
+            self._watched[section] = values
+            if self.data:
+                self.paint(self.data)
 
     # ------------------------------------------------------------------ #
     # Internals
     # ------------------------------------------------------------------ #
-    def get_client(self) -> AsyncClient:
-        """Return a pre-configured HTTPX client."""
-        return AsyncClient(auth=("", self._api_password), timeout=10)
-
-    @work(exclusive=True)
-    async def update_data(self):
-        """Fetch *all* configured endpoints concurrently and refresh self.data."""
-        async with self.get_client() as client:
-            tasks = [client.get(url) for url in self.endpoints]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        responses: dict[str, Mapping] = {}
-        for url, result in zip(self.endpoints, results):
-            if isinstance(result, Exception):
-                # network failure etc.
-                responses[url] = {"error": str(result)}
-            else:
-                if result.status_code == 401:
-                    responses[url] = {"error": "Authentication failed"}
-                else:
-                    try:
-                        responses[url] = result.json()
-                    except ValueError:
-                        responses[url] = {"error": "Invalid JSON"}
-
+    def receive(self, url: str, payload: Mapping) -> None:
+        """Scheduler callback: store the latest payload for *url*."""
+        self._responses[url] = payload
+        if len(self._responses) == len(self.endpoints):
+            self.update_data()
+
+    def update_data(self):
+        """Re-run ``extract_data`` over the latest payload of every endpoint."""
         # pass everything to subclass for domain-specific handling
-        self.data = self.extract_data(responses)
+        started = time.perf_counter()
+        data = self.extract_data(
+            {url: self._responses[url] for url in self.endpoints}
+        )
+        self.app.scheduler.diagnostics.extracted(type(self).__name__, time.perf_counter() - started)
+
+        if "error" in data:
+            if self.data and "error" not in self.data:
+                # keep the last good values up while the scheduler retries
+                self._set_stale(data["error"])
+                return
+        else:
+            self._data_at = time.time()
+            snapshots = getattr(self.app, "snapshots", None)
+            if snapshots is not None:
+                snapshots.put(self.node, self.section, data)
+        self._set_stale(None)
+
+        # field-level diff: identical values never reach the render path
+        if diff_fields(self.data, data):
+            self.data = data
+
+    def _set_stale(self, reason: str | None) -> None:
+        was = self._stale
+        if reason == was:
+            return
+        self._stale = reason
+        if reason is None:
+            self.app.ticker.remove(self._show_age)
+            self.border_subtitle = ""
+            return
+        if was is None:
+            # the age advances on the app's shared 1 s ticker
+            self.app.ticker.add(self._show_age)
+        self._show_age()
+
+    def _show_age(self, now: float | None = None) -> None:
+        age = format_duration(seconds_since(self._data_at, now))
+        label = "cached" if self._stale == "cached" else f"stale – {escape(self._stale)}"
+        self.border_subtitle = f"[yellow]{label} · {age} old[/]"
+
+    def refresh_alerts(self) -> None:
+        """Toggle the ``alerting`` class while a rule on our data is firing."""
+        alerts = getattr(self.app, "alerts", None)
+        if alerts is None:
+            return
+        firing = [e for e in alerts.active(self.node).values()
+                  if e["section"] == self.section
+                  or e["field"] in self.watch_fields.get(e["section"], ())]
+        self.set_class(bool(firing), "alerting")
+        self.set_class(any(e["severity"] == "critical" for e in firing), "alerting-critical")
+
+    def history(self):
+        """This node's ``NodeHistory`` (None when not tracked)."""
+        history = getattr(self.app, "history", None)
+        return history.get(self.node) if history is not None else None
+
+    def rates(self) -> Mapping:
+        """This node's derived rates (``in_rate``, ``points_per_hour`` …), if any."""
+        fleet = getattr(self.app, "fleet", None)
+        if fleet is None or self.node not in fleet.rows:
+            return {}
+        return fleet.rows[self.node].get("rates", {})
 
     # ------------------------------------------------------------------ #
     # Hooks for subclasses
@@ -96,7 +226,25 @@ class APIWidget(Static):
         return next(iter(responses.values()))
 
     def watch_data(self, data):
+        self.paint(data)
+
+    def paint(self, data):
+        """Repaint with *data* – in the app's next frame if it batches them."""
+        self._paint_data = data
+        frames = getattr(self.app, "frames", None)
+        if frames is None:
+            self.flush_paint()
+        else:
+            frames.request(self)
+
+    def flush_paint(self):
+        """``render_content`` + ``update`` for the newest queued data, timed for diagnostics."""
+        data, self._paint_data = self._paint_data, _NOTHING
+        if data is _NOTHING:
+            return
+        started = time.perf_counter()
         self.update(self.render_content(data))
+        self.app.scheduler.diagnostics.rendered(type(self).__name__, time.perf_counter() - started)
 
     def render_content(self, data):
         """Convert *data* into a Rich renderable (string by default)."""
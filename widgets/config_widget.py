@@ -11,12 +11,16 @@ Polls and return data from endpoints:
 polls them, and prints a concise summary.
 """
 
+from core.extract import SECTION_TTL, extract_config
 from widgets.base_widget import APIWidget
 
 
 class ConfigWidget(APIWidget):
     """Display quick node summary pulled from /metrics + /api/versions."""
 
+    section = "config"
+    ttl = SECTION_TTL["config"]   # versions / system info change only on redeploys
+
     def __init__(
         self,
         title: str,
@@ -46,27 +50,7 @@ class ConfigWidget(APIWidget):
     # ------------------------------------------------------------------ #
     def extract_data(self, responses):
         metrics, versions = (responses[e] for e in self.endpoints)
-
-        # bubble up any upstream errors
-        for name, payload in (("metrics", metrics), ("versions", versions)):
-            if "error" in payload:
-                return {"error": f"{name}: {payload['error']}"}
-
-        sync = metrics.get("synchronizer", {})
-        sys = metrics.get("system", {})
-        other = versions.get("versions", {})
-
-        return {
-            "sync_hash": sync.get("syncHash", "N/A"),
-            "wallet": sync.get("wallet", "N/A"),
-            "hostname": sys.get("hostname", "N/A"),
-            "os_platform": f"{sys.get('platform', '')} {sys.get('arch', '')}".strip(),
-            "cli": metrics.get("version", "N/A"),
-            "docker_image": other.get("dockerImage", "N/A"),
-            "container": other.get("containerImage", "N/A"),
-            "reflector": other.get("reflectorVersion", "N/A"),
-            "launcher": other.get("launcher", "N/A"),
-        }
+        return extract_config(metrics, versions)
 
     # ------------------------------------------------------------------ #
     # Rendering
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+DiagnosticsWidget
+============
+
+Percentile tables over ``core.diagnostics``:
+    • per endpoint: request latency, errors, timeouts, 304s, payload size,
+                    circuit-breaker openings
+    • per widget:   extract_data and render_content time
+
+Only refreshes while mounted, so the hidden panel costs nothing.
+
+"""
+
+from rich.console import Group
+from rich.table import Table
+from textual.widgets import Static
+
+from core.extract import convert_bytes
+
+
+def _ms(seconds: float | None) -> str:
+    if seconds is None:
+        return "–"
+    return f"{seconds * 1000:.1f}" if seconds >= 0.001 else f"{seconds * 1000:.3f}"
+
+
+class DiagnosticsWidget(Static):
+    """Live self-measurement of polling and rendering."""
+
+    def __init__(self, title: str, *, diagnostics, **kwargs):
+        super().__init__(classes="widget-base", **kwargs)
+        self.border_title = title
+        self._diagnostics = diagnostics
+
+    def on_mount(self):
+        self.set_interval(1, self._flush)
+        self._flush()
+
+    def _flush(self) -> None:
+        self.update(self.render_content(self._diagnostics))
+
+    def render_content(self, diagnostics):
+        endpoints = Table(title="Endpoints (all nodes) – latency ms", expand=True,
+                          title_justify="left", header_style="bold #8be9fd")
+        for column in ("Endpoint", "Requests", "Errors", "Timeouts", "Opens", "304",
+                       "p50", "p95", "p99", "max", "avg size"):
+            endpoints.add_column(column, justify="left" if column == "Endpoint" else "right")
+        for key, stats in sorted(diagnostics.endpoints.items()):
+            latency = stats.latency
+            size = stats.size.mean
+            endpoints.add_row(
+                key, str(stats.requests), str(stats.errors), str(stats.timeouts),
+                str(stats.breaker_opens),
+                str(stats.not_modified),
+                _ms(latency.percentile(0.50)), _ms(latency.percentile(0.95)),
+                _ms(latency.percentile(0.99)), _ms(latency.max if latency.count else None),
+                convert_bytes(round(size)) if size is not None else "–",
+            )
+
+        widgets = Table(title="Widgets – ms", expand=True,
+                        title_justify="left", header_style="bold #8be9fd")
+        for column in ("Widget", "Extracts", "p50", "p95", "Renders", "p50", "p95", "max"):
+            widgets.add_column(column, justify="left" if column == "Widget" else "right")
+        for name, stats in sorted(diagnostics.widgets.items()):
+            extract, render = stats.extract, stats.render
+            widgets.add_row(
+                name,
+                str(extract.count), _ms(extract.percentile(0.50)), _ms(extract.percentile(0.95)),
+                str(render.count), _ms(render.percentile(0.50)), _ms(render.percentile(0.95)),
+                _ms(render.max if render.count else None),
+            )
+        return Group(endpoints, "", widgets)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+FleetTable
+============
+
+Sortable one-row-per-node table fed by ``FleetState``.
+
+Built on Textual's Line API so it scales to thousands of nodes:
+    • only rows inside the viewport are rendered
+    • each row's Strip is cached and rebuilt only when one of its cells changed
+    • sort order is kept with bisect, moving just the rows whose sort key changed
+    • uptime is stored as the start time and aged on the app's shared 1 s
+      ticker, re-rendering only the rows currently on screen
+
+"""
+
+from bisect import bisect_left, insort
+from typing import Mapping
+
+from rich.cells import set_cell_size
+from rich.segment import Segment
+from rich.style import Style
+from textual.binding import Binding
+from textual.geometry import Size
+from textual.message import Message
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from core.extract import convert_bytes, format_duration, seconds_since
+
+# (key, header, width)
+COLUMNS = (
+    ("node", "Node", 24),
+    ("status", "Status", 12),
+    ("uptime", "Uptime", 16),
+    ("score", "QoS", 6),
+    ("traffic", "Traffic", 12),
+    ("points", "Points", 10),
+    ("alerts", "Alerts", 8),
+)
+
+HEADER_STYLE = Style(color="#8be9fd", bold=True)
+CURSOR_STYLE = Style(bgcolor="#44475a")
+ALERT_STYLE = Style(color="yellow", bold=True)
+CRITICAL_STYLE = Style(color="red", bold=True)
+STATUS_STYLES = {
+    "Running": Style(color="green"),
+    "Not Running": Style(color="red"),
+    "Error": Style(color="red", bold=True),
+}
+
+
+def row_values(name: str, row: Mapping) -> dict:
+    """Raw (sortable) cell values for one node's FleetState row."""
+    status = row.get("status", {})
+    if any("error" in data for data in row.values()):
+        state = "Error"
+    else:
+        state = status.get("status")
+    return {
+        "node": name,
+        "status": state,
+        "uptime": status.get("started_at"),
+        "score": row.get("qos", {}).get("score"),
+        "traffic": row.get("performance", {}).get("total"),
+        "points": row.get("points", {}).get("session_total"),
+        # (any critical, count) of firing alert rules (core.alerts)
+        "alerts": _alert_count(row.get("alerts")),
+    }
+
+
+def _alert_count(alerts: Mapping | None) -> tuple[bool, int]:
+    if not alerts:
+        return (False, 0)
+    return (bool(alerts.get("critical")), len(alerts.get("firing", ())))
+
+
+def format_cell(key: str, value) -> str:
+    if value is None:
+        return "…"
+    if key == "uptime":
+        return format_duration(seconds_since(value))
+    if key == "score":
+        return f"{value}%"
+    if key == "alerts":
+        return f"⚠ {value[1]}" if value[1] else ""
+    if key == "traffic":
+        return convert_bytes(value)
+    return str(value)
+
+
+class FleetTable(ScrollView, can_focus=True):
+    """Virtualised, incrementally updated node table."""
+
+    BINDINGS = [
+        Binding("up", "cursor(-1)", show=False),
+        Binding("down", "cursor(1)", show=False),
+        Binding("pageup", "page(-1)", show=False),
+        Binding("pagedown", "page(1)", show=False),
+        Binding("home", "jump(0)", show=False),
+        Binding("end", "jump(-1)", show=False),
+        Binding("enter", "select", "Open node", key_display="Enter:"),
+        Binding("s", "sort_next", "Sort", key_display="s:"),
+        Binding("r", "sort_reverse", "Reverse", key_display="r:"),
+    ]
+
+    class NodeSelected(Message):
+        """Posted when the user opens a node (Enter / click)."""
+
+        def __init__(self, node: str):
+            super().__init__()
+            self.node = node
+
+    def __init__(self, *, fleet, **kwargs):
+        super().__init__(**kwargs)
+        self._fleet = fleet
+
+        self._values: dict[str, dict] = {}   # node -> raw cell values
+        self._cells: dict[str, dict] = {}    # node -> formatted cell text
+        self._strips: dict[str, Strip] = {}  # node -> cached row strip
+
+        self._sort_col = 0
+        self._reverse = False
+        self._keys: list[tuple] = []         # sorted sort keys, ascending
+        self._cursor = 0
+
+        for name in fleet.nodes:
+            self._set_row(name, fleet.row(name))
+
+    # ------------------------------------------------------------------ #
+    # Textual lifecycle
+    # ------------------------------------------------------------------ #
+    def on_mount(self):
+        self._fleet.add_listener(self._on_fleet_update)
+        self.app.ticker.add(self._tick)
+        self._update_virtual_size()
+
+    def on_unmount(self):
+        self._fleet.remove_listener(self._on_fleet_update)
+        self.app.ticker.remove(self._tick)
+
+    def _update_virtual_size(self):
+        width = sum(w + 1 for _, _, w in COLUMNS)
+        self.virtual_size = Size(width, len(self._keys) + 1)
+
+    # ------------------------------------------------------------------ #
+    # Incremental updates
+    # ------------------------------------------------------------------ #
+    def _sort_key(self, name: str) -> tuple:
+        key = COLUMNS[self._sort_col][0]
+        value = self._values[name][key]
+        if key == "uptime" and value is not None:
+            # stored as the start time: longest uptime = earliest start
+            value = -value
+        # missing values sort last, ties broken by node name
+        return (value is None, value if value is not None else 0, name)
+
+    def _set_row(self, name: str, row: Mapping) -> set[str]:
+        """Store new values for *name*; return the keys whose cells changed."""
+        values = row_values(name, row)
+        old = self._values.get(name)
+        if old == values:
+            return set()
+
+        changed = {k for k, v in values.items() if old is None or old[k] != v}
+        sort_field = COLUMNS[self._sort_col][0]
+        if old is not None and sort_field in changed:
+            del self._keys[bisect_left(self._keys, self._sort_key(name))]
+
+        self._values[name] = values
+        self._cells[name] = {k: format_cell(k, v) for k, v in values.items()}
+        self._strips.pop(name, None)
+
+        if old is None or sort_field in changed:
+            insort(self._keys, self._sort_key(name))
+        return changed
+
+    def _on_fleet_update(self, node: str, section: str, data: Mapping) -> None:
+        changed = self._set_row(node, self._fleet.row(node))
+        if not changed:
+            return
+        if COLUMNS[self._sort_col][0] in changed:
+            # row may have moved – repaint the visible window only
+            self.refresh()
+        else:
+            self.refresh_line(self._index_of(node) + 1)
+
+    def _tick(self, now: float) -> None:
+        """Age the uptime cells of the rows on screen."""
+        first = self.scroll_offset.y
+        for index in range(first, min(len(self._keys), first + self.size.height)):
+            name = self._name_at(index)
+            start = self._values[name]["uptime"]
+            if start is None or self._values[name]["status"] == "Error":
+                continue
+            text = format_duration(seconds_since(start, now))
+            cells = self._cells[name]
+            if cells["uptime"] != text:
+                cells["uptime"] = text
+                self._strips.pop(name, None)
+                self.refresh_line(index + 1)
+
+    @property
+    def selected(self) -> str | None:
+        """Name of the node under the cursor, None while the table is empty."""
+        return self._name_at(self._cursor) if self._keys else None
+
+    def _index_of(self, name: str) -> int:
+        i = bisect_left(self._keys, self._sort_key(name))
+        return len(self._keys) - 1 - i if self._reverse else i
+
+    def _name_at(self, index: int) -> str:
+        if self._reverse:
+            index = len(self._keys) - 1 - index
+        return self._keys[index][-1]
+
+    # ------------------------------------------------------------------ #
+    # Line API
+    # ------------------------------------------------------------------ #
+    def render_line(self, y: int) -> Strip:
+        width = self.size.width
+        scroll_x, scroll_y = self.scroll_offset
+
+        if y == 0:
+            strip = self._header_strip()
+        else:
+            index = scroll_y + y - 1
+            if index >= len(self._keys):
+                return Strip.blank(width, self.rich_style)
+            name = self._name_at(index)
+            strip = self._strips.get(name)
+            if strip is None:
+                strip = self._strips[name] = self._row_strip(name)
+            if index == self._cursor:
+                strip = strip.apply_style(CURSOR_STYLE)
+
+        return strip.crop_extend(scroll_x, scroll_x + width, self.rich_style)
+
+    def _header_strip(self) -> Strip:
+        segments = []
+        for i, (_, header, width) in enumerate(COLUMNS):
+            if i == self._sort_col:
+                header += " ▼" if self._reverse else " ▲"
+            segments.append(Segment(set_cell_size(header, width) + " ", HEADER_STYLE))
+        return Strip(segments)
+
+    def _row_strip(self, name: str) -> Strip:
+        cells = self._cells[name]
+        segments = []
+        for key, _, width in COLUMNS:
+            text = set_cell_size(cells[key], width) + " "
+            if key == "status":
+                style = STATUS_STYLES.get(cells[key])
+            elif key == "alerts" and cells[key]:
+                style = CRITICAL_STYLE if self._values[name]["alerts"][0] else ALERT_STYLE
+            else:
+                style = None
+            segments.append(Segment(text, style))
+        return Strip(segments)
+
+    # ------------------------------------------------------------------ #
+    # Actions
+    # ------------------------------------------------------------------ #
+    def _move_cursor(self, index: int) -> None:
+        if not self._keys:
+            return
+        old = self._cursor
+        self._cursor = max(0, min(index, len(self._keys) - 1))
+        self.refresh_line(old + 1)
+        self.refresh_line(self._cursor + 1)
+
+        # keep the cursor row inside the viewport (header takes one line)
+        rows_visible = max(1, self.size.height - 1)
+        if self._cursor < self.scroll_offset.y:
+            self.scroll_to(y=self._cursor, animate=False)
+        elif self._cursor >= self.scroll_offset.y + rows_visible:
+            self.scroll_to(y=self._cursor - rows_visible + 1, animate=False)
+
+    def action_cursor(self, delta: int) -> None:
+        self._move_cursor(self._cursor + delta)
+
+    def action_page(self, direction: int) -> None:
+        self._move_cursor(self._cursor + direction * max(1, self.size.height - 1))
+
+    def action_jump(self, index: int) -> None:
+        self._move_cursor(index if index >= 0 else len(self._keys) - 1)
+
+    def action_select(self) -> None:
+        if self._keys:
+            self.post_message(self.NodeSelected(self._name_at(self._cursor)))
+
+    def action_sort_next(self) -> None:
+        self.sort_by((self._sort_col + 1) % len(COLUMNS))
+
+    def action_sort_reverse(self) -> None:
+        self._reverse = not self._reverse
+        self.refresh()
+
+    def sort_by(self, column: int) -> None:
+        """Full re-sort – only on an explicit column change."""
+        self._sort_col = column
+        self._keys = sorted(self._sort_key(name) for name in self._values)
+        self.refresh()
+
+    def on_click(self, event) -> None:
+        if event.y == 0:
+            column, x = 0, event.x + self.scroll_offset.x
+            for i, (_, _, width) in enumerate(COLUMNS):
+                if x < width + 1:
+                    column = i
+                    break
+                x -= width + 1
+            if column == self._sort_col:
+                self.action_sort_reverse()
+            else:
+                self.sort_by(column)
+            return
+        self._move_cursor(self.scroll_offset.y + event.y - 1)
+        if event.chain == 2:
+            self.action_select()
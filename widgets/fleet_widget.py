@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+FleetSummaryWidget
+============
+
+Fleet-wide totals fed by ``FleetState`` rather than its own endpoints.
+
+"""
+
+import time
+from typing import Mapping
+
+from textual.widgets import Static
+
+from core.extract import convert_bytes
+
+
+class FleetSummaryWidget(Static):
+    """Totals across every node, refreshed at most once a second."""
+
+    def __init__(self, title: str, *, fleet, **kwargs):
+        super().__init__(classes="widget-base", **kwargs)
+        self.border_title = title
+        self._fleet = fleet
+        self._dirty = True
+
+    def on_mount(self):
+        self._fleet.add_listener(self._on_fleet_update)
+        self.set_interval(1, self._flush)
+        self._flush()
+
+    def on_unmount(self):
+        self._fleet.remove_listener(self._on_fleet_update)
+
+    def _on_fleet_update(self, node: str, section: str, data: Mapping) -> None:
+        # many nodes report per second – coalesce into one repaint
+        self._dirty = True
+
+    def _flush(self) -> None:
+        if self._dirty:
+            self._dirty = False
+            started = time.perf_counter()
+            summary = self._fleet.summary()
+            self.update(self.render_content(summary))
+            self.border_subtitle = (f"[yellow]{summary['cached']} node(s) from cache[/]"
+                                    if summary["cached"] else "")
+            self.app.scheduler.diagnostics.rendered(type(self).__name__,
+                                                    time.perf_counter() - started)
+
+    def render_content(self, data):
+        return (
+            f"Nodes         : {data['nodes']}\n"
+            f"Running       : {data['running']}/{data['nodes']}\n"
+            f"Errors        : {data['errors']}\n"
+            f"Avg QoS Score : {data['avg_score']}%\n"
+            f"Total Traffic : {convert_bytes(data['traffic'])}\n"
+            f"Session Points: {data['points']}"
+        )
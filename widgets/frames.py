@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+FrameScheduler
+============
+
+App-wide repaint batching under a frame budget (``--max-fps``).
+
+Widgets ``request`` a repaint instead of rendering on the spot. Every
+pending repaint is flushed together inside one ``App.batch_update`` –
+one terminal write – at most ``max_fps`` times a second. A widget asked
+again before its frame renders once, with its newest data; intermediate
+states are dropped.
+
+The first request after a quiet period is painted at the end of the
+current event-loop turn, so data fanned out to several widgets by one
+response still lands in a single frame.
+"""
+
+import asyncio
+import time
+
+
+class FrameScheduler:
+    """Coalesce widget repaints into at most *max_fps* frames per second."""
+
+    def __init__(self, app, max_fps: float):
+        self._app = app
+        self.period = 1 / max_fps
+        self._pending: dict = {}             # widget -> None, in request order
+        self._handle: asyncio.Handle | asyncio.TimerHandle | None = None
+        self._last = 0.0                     # monotonic time of the last frame
+
+    def request(self, widget) -> None:
+        """Repaint *widget* (its ``flush_paint``) in the next frame."""
+        self._pending[widget] = None
+        if self._handle is not None:
+            return
+        loop = asyncio.get_running_loop()
+        wait = self._last + self.period - time.monotonic()
+        self._handle = (loop.call_soon(self._flush) if wait <= 0
+                        else loop.call_later(wait, self._flush))
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._pending = {}
+
+    def _flush(self) -> None:
+        self._handle = None
+        self._last = time.monotonic()
+        pending, self._pending = self._pending, {}
+        with self._app.batch_update():
+            for widget in pending:
+                if widget.is_mounted:
+                    widget.flush_paint()
+        self._app.scheduler.diagnostics.rendered("Frame", time.monotonic() - self._last)
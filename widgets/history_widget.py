@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+HistoryWidget
+============
+
+Long-term charts for one node from the on-disk ``TimeSeriesStore``:
+QoS score, life points and session points over the last day, week or
+30 days, one sparkline column per time slot.
+
+The store hands back the coarsest tier that still has a record for
+every column (minute rollups for a day, hourly ones for a week or 30
+days), so a redraw reads a few kilobytes and rarely touches the raw
+tier; the records are then averaged into columns. Reads only – the
+headless collector writes the store.
+
+"""
+
+import math
+import time
+
+from rich.console import Group
+from rich.text import Text
+from textual.binding import Binding
+from textual.widgets import Static
+
+from core.history import sparkline
+
+CHARTS = (
+    ("QoS score",      "qos_score"),
+    ("Life points",    "life_points"),
+    ("Session points", "session_points"),
+)
+
+RANGES = ((86400, "1 day"), (7 * 86400, "7 days"), (30 * 86400, "30 days"))
+
+REFRESH_EVERY = 60
+
+
+def _resample(ts: list[int], values: list[float], start: float, end: float,
+              width: int) -> list[float]:
+    """Average *values* into *width* equal time slots; NaN where a slot is empty."""
+    sums, counts = [0.0] * width, [0] * width
+    scale = width / (end - start)
+    for t, v in zip(ts, values):
+        i = min(width - 1, int((t - start) * scale))
+        sums[i] += v
+        counts[i] += 1
+    return [s / n if n else math.nan for s, n in zip(sums, counts)]
+
+
+def _fmt(value: float) -> str:
+    return f"{value:,.0f}" if abs(value) >= 100 else f"{value:,.1f}"
+
+
+class HistoryWidget(Static, can_focus=True):
+    """Sparkline charts of a node's stored history."""
+
+    BINDINGS = [
+        Binding("r", "cycle_range", "Range", key_display="r:"),
+    ]
+
+    def __init__(self, title: str, *, store, node: str, **kwargs):
+        super().__init__(classes="widget-base", **kwargs)
+        self.border_title = title
+        self._store = store
+        self._node = node
+        self._range = len(RANGES) - 1
+        self._series: dict[str, tuple[list, list]] = {}
+        self._window = (0.0, 0.0)
+
+    def on_mount(self):
+        self.set_interval(REFRESH_EVERY, self._load)
+        self._load()
+
+    def on_resize(self) -> None:
+        self._flush()
+
+    def action_cycle_range(self) -> None:
+        self._range = (self._range + 1) % len(RANGES)
+        self._load()
+
+    def _load(self) -> None:
+        """Re-read the visible window from the store, then redraw."""
+        end = time.time()
+        start = end - RANGES[self._range][0]
+        # a tier that fills every column; more than ~4 records per column
+        # are averaged in the store before they reach ``_resample``
+        width = max(10, self.size.width)
+        self._window = (start, end)
+        self._series = {
+            field: self._store.series(self._node, field, start, end,
+                                      points=width, max_points=width * 4)
+            for _, field in CHARTS
+        }
+        self.border_subtitle = f"{self._node} · last {RANGES[self._range][1]}"
+        self._flush()
+
+    def _flush(self) -> None:
+        self.update(self.render_content(self.size.width))
+
+    def render_content(self, width: int):
+        width = max(10, width)
+        start, end = self._window
+        parts = []
+        for label, field in CHARTS:
+            ts, values = self._series.get(field, ([], []))
+            title = Text(label, style="bold #8be9fd")
+            if not values:
+                parts += [title, Text("no data", style="dim"), ""]
+                continue
+            title.append(f"   last {_fmt(values[-1])}  min {_fmt(min(values))}"
+                         f"  max {_fmt(max(values))}", style="default")
+            parts += [title, Text(sparkline(_resample(ts, values, start, end, width), width),
+                                  style="green"), ""]
+        return Group(*parts[:-1])
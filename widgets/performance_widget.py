@@ -8,26 +8,16 @@ Polls and returns performance relevant data from API endpoint:
 
 """
 
+from core.extract import convert_bytes, extract_performance
+from core.history import sparkline
+from core.rates import format_rate
 from widgets.base_widget import APIWidget
 
-def convert_bytes(size_in_bytes):
-    """Convert bytes to KB, MB, or GB, rounded to 2 decimal places."""
-    KB = 1024
-    MB = KB * 1024
-    GB = MB * 1024
-
-    if size_in_bytes >= GB:
-        return f"{size_in_bytes / GB:.2f} GB"
-    elif size_in_bytes >= MB:
-        return f"{size_in_bytes / MB:.2f} MB"
-    elif size_in_bytes >= KB:
-        return f"{size_in_bytes / KB:.2f} KB"
-    else:
-        return f"{size_in_bytes} B"
-
 
 class PerformanceWidget(APIWidget):
     interval = 5
+    section = "performance"
+    watch_fields = {"rates": ("in_rate", "out_rate", "sessions_per_min")}
 
     def __init__(self, title: str, *, api_base: str, api_password: str, **kwargs):
         super().__init__(
@@ -41,25 +31,34 @@ class PerformanceWidget(APIWidget):
     # APIWidget hooks
     # ------------------------------------------------------------------ #
     def extract_data(self, responses):
-        p = responses[self.endpoints[0]].get("performance", {})
-        return {
-            "total": p.get("totalTraffic"),
-            "sessions": p.get("sessions"),
-            "in": p.get("bytesIn"),
-            "out": p.get("bytesOut"),
-            "users": p.get("users"),
-        }
+        return extract_performance(responses[self.endpoints[0]])
 
     def render_content(self, data):
         if "error" in data:
             return f"[bold red]{data['error']}[/bold red]"
+        rates = self.rates()
+        sessions_per_min = rates.get("sessions_per_min")
         #total_mb = (data.get("total", 0) or 0) / 1024 / 1024
-        return (
+        text = (
 #            f"Total Traffic : {total_mb:.2f} MB\n"
             f"Total Traffic : {convert_bytes(data.get('total', 0))}\n"
-            f"Sessions      : {data.get('sessions', 0)}\n"
-            f"In Traffic    : {convert_bytes(data.get('in', 0))}\n"
-            f"Out Traffic   : {convert_bytes(data.get('out', 0))}\n"
+            f"Sessions      : {data.get('sessions', 0)}"
+            + (f"  ({sessions_per_min:.1f}/min)" if sessions_per_min is not None else "") + "\n"
+            f"In Traffic    : {convert_bytes(data.get('in', 0))}  ({format_rate(rates.get('in_rate'))})\n"
+            f"Out Traffic   : {convert_bytes(data.get('out', 0))}  ({format_rate(rates.get('out_rate'))})\n"
             f"Users         : {data.get('users', 0)}"
         )
+        return text + self._trends()
 
+    def _trends(self) -> str:
+        """Sparklines of traffic rates and session/user counts."""
+        history = self.history()
+        if history is None or len(history.series("in_rate")) < 2:
+            return ""
+        width = max(8, self.content_size.width - 16)
+        return (
+            f"\n\nIn Rate       : [#50fa7b]{sparkline(history.values('in_rate'), width)}[/]\n"
+            f"Out Rate      : [#8be9fd]{sparkline(history.values('out_rate'), width)}[/]\n"
+            f"Sessions      : [#f1fa8c]{sparkline(history.values('sessions'), width)}[/]\n"
+            f"Users         : [#bd93f9]{sparkline(history.values('users'), width)}[/]"
+        )
@@ -6,17 +6,23 @@ PointsWidget
 Polls and returns points relevant data from API endpoint:
     • /api/points
 
+Each panel is cached per (label, value) in a ``RenderCache``.
+
 """
 
 from rich.align import Align
 from rich.columns import Columns
 from rich.panel import Panel
 
+from core.extract import extract_points
 from widgets.base_widget import APIWidget
+from widgets.render_cache import RenderCache
 
 
 class PointsWidget(APIWidget):
     interval = 15
+    section = "points"
+    watch_fields = {"rates": ("points_per_hour",)}
 
     def __init__(self, title: str, *, api_base: str, api_password: str, **kwargs):
         super().__init__(
@@ -26,19 +32,13 @@ class PointsWidget(APIWidget):
             **kwargs,
         )
         self.add_class("widget-center-title")
+        self._cells = RenderCache()
 
     # ------------------------------------------------------------------ #
     # APIWidget hooks
     # ------------------------------------------------------------------ #
     def extract_data(self, responses):
-        performance = responses[self.endpoints[0]]
-        points = performance.get("points", {})
-        return {
-            "life_total": performance.get("walletLifePoints", 0),
-            "session_total": performance.get("syncLifePoints", 0),
-            "rank": points.get("rank", 0),
-            "multiplier": points.get("multiplier", 0),
-        }
+        return extract_points(responses[self.endpoints[0]])
 
     def render_content(self, data):
         if "error" in data:
@@ -50,19 +50,23 @@ class PointsWidget(APIWidget):
             ("Global Rank", data.get("rank", 0)),
             ("Multiplier", data.get("multiplier", 0)),
         ]
+        per_hour = self.rates().get("points_per_hour")
+        if per_hour is not None:
+            mappings.append(("Points / Hour", f"{per_hour:.1f}"))
 
-        panels = []
-        for label, value in mappings:
-            centered_value = Align(str(value), align="center", vertical="middle")
-            panels.append(
-                Panel(
-                    centered_value,
-                    title=f"[#6272a4]{label}[/]",
-                    expand=True,
-                    border_style="#666666",
-                    title_align="center",
-                )
-            )
-
+        panels = [
+            self._cells.get((label, str(value)), lambda: self._panel(label, str(value)))
+            for label, value in mappings
+        ]
+        self._cells.sweep()
         return Columns(panels, expand=True)
 
+    @staticmethod
+    def _panel(label: str, value: str) -> Panel:
+        return Panel(
+            Align(value, align="center", vertical="middle"),
+            title=f"[#6272a4]{label}[/]",
+            expand=True,
+            border_style="#666666",
+            title_align="center",
+        )
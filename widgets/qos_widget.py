@@ -6,6 +6,9 @@ QOSWidget
 Polls and returns metrics relevant data from API endpoint:
     • /api/performance
 
+Panels are cached per (title, value) in a ``RenderCache``: a repaint
+rebuilds only the cells whose value changed.
+
 """
 
 from rich.align import Align
@@ -13,12 +16,11 @@ from rich.columns import Columns
 from rich.console import Group
 from rich.panel import Panel
 from rich.text import Text
-from widgets.base_widget import APIWidget
 
-
-def score_translate(score: int) -> int:
-    """Convert API score code (0, 1, 2) → percentage (100 %, 66 %, 33 %)."""
-    return (3 - score) * 100 // 3 if score in (0, 1, 2) else 0
+from core.extract import extract_qos
+from core.history import sparkline
+from widgets.base_widget import APIWidget
+from widgets.render_cache import RenderCache
 
 
 
@@ -26,6 +28,7 @@ class QOSWidget(APIWidget):
     """Displays overall QoS and sub-scores in a 4-row grid of panels."""
 
     interval = 5  # seconds between polls
+    section = "qos"
 
     # ------------------------------------------------------------------ #
     # construction
@@ -37,28 +40,13 @@ class QOSWidget(APIWidget):
             api_password=api_password,
             **kwargs,
         )
+        self._cells = RenderCache()
 
     # ------------------------------------------------------------------ #
     # APIWidget hooks
     # ------------------------------------------------------------------ #
     def extract_data(self, responses):
-        payload = responses[self.endpoints[0]].get("qos", {})
-
-        reliability  = score_translate(payload.get("reliability"))
-        availability = score_translate(payload.get("availability"))
-        efficiency   = score_translate(payload.get("efficiency"))
-        blurbs = payload.get("ratingsBlurbs", {})
-        blurbs = blurbs if blurbs else {}
-
-        return {
-            "score": (reliability + availability + efficiency) // 3,
-            "reliability": reliability,
-            "availability": availability,
-            "efficiency": efficiency,
-            "reliability_comment":   blurbs.get("reliability", ""),
-            "availability_comment":  blurbs.get("availability", ""),
-            "efficiency_comment":    blurbs.get("efficiency", ""),
-        }
+        return extract_qos(responses[self.endpoints[0]])
 
     # ------------------------------------------------------------------ #
     # helpers
@@ -104,6 +92,14 @@ class QOSWidget(APIWidget):
             **panel_kwargs
         )
 
+    def _cell(self, title: str, value, *, percent: bool = False, **kwargs):
+        """``_value_panel`` through the render cache (*percent* colourises an int)."""
+        return self._cells.get(
+            (title, value, percent, tuple(kwargs.items())),
+            lambda: self._value_panel(
+                title, self._colorize_percent(value) if percent else value, **kwargs),
+        )
+
     # ------------------------------------------------------------------ #
     # render method – Textual calls this automatically
     # ------------------------------------------------------------------ #
@@ -112,15 +108,13 @@ class QOSWidget(APIWidget):
             return f"[bold red]{data['error']}[/bold red]"
 
         # Row 1 ─ overall score (single-column)
-        row1 = self._value_panel(
-            "Overall Health Score", self._colorize_percent(data.get("score", 0)) 
-        )
+        row1 = self._cell("Overall Health Score", data.get("score", 0), percent=True)
 
         # Row 2 ─ reliability value + comment
         row2 = Columns(
             [
-                self._value_panel("Reliability", self._colorize_percent(data.get("reliability", 0)), width=18),
-                self._value_panel("", data.get("reliability_comment"), show_border=False),
+                self._cell("Reliability", data.get("reliability", 0), percent=True, width=18),
+                self._cell("", data.get("reliability_comment"), show_border=False),
             ],
             #equal=True,
             #expand=True,
@@ -129,8 +123,8 @@ class QOSWidget(APIWidget):
         # Row 3 ─ availability value + comment
         row3 = Columns(
             [
-                self._value_panel("Availability", self._colorize_percent(data.get("availability", 0)), width=18),
-                self._value_panel("Comment", data.get("availability_comment"), show_border=False),
+                self._cell("Availability", data.get("availability", 0), percent=True, width=18),
+                self._cell("Comment", data.get("availability_comment"), show_border=False),
             ],
             #equal=True,
             #expand=True,
@@ -139,13 +133,23 @@ class QOSWidget(APIWidget):
         # Row 4 ─ efficiency value + comment
         row4 = Columns(
             [
-                self._value_panel("Efficiency", self._colorize_percent(data.get("efficiency", 0)), width=18),
-                self._value_panel("Comment", data.get("efficiency_comment"), show_border=False),
+                self._cell("Efficiency", data.get("efficiency", 0), percent=True, width=18),
+                self._cell("Comment", data.get("efficiency_comment"), show_border=False),
             ],
             #equal=True,
             #expand=True,
         )
 
         # Stack rows vertically
-        return Group(row1, row2, row3, row4)
+        self._cells.sweep()
+        return Group(row1, row2, row3, row4, *self._trend_rows())
+
+    def _trend_rows(self) -> list:
+        """Sparkline of the overall score under the panels (needs 2+ samples)."""
+        history = self.history()
+        if history is None or len(history.series("score")) < 2:
+            return []
+        width = max(8, self.content_size.width - 2)
+        spark = sparkline(history.values("score"), width)
+        return [self._value_panel("", Text(spark, style="#50fa7b"), show_border=False)]
 
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+RenderCache
+============
+
+Per-widget cache of Rich cells (panels, aligned values …).
+
+A cell is built once per distinct content key and wrapped in
+``CachedRenderable``, which also remembers its rendered lines per width,
+so a repaint where one number changed re-renders just that cell; the
+rest replay stored segments. Resizing only misses the line cache.
+
+Entries not used by the latest render are dropped on ``sweep()``, so
+memory stays at one render's worth of cells.
+"""
+
+from typing import Callable, Hashable
+
+from rich.console import Console, ConsoleOptions, RenderableType, RenderResult
+from rich.measure import Measurement
+from rich.segment import Segment
+
+
+class CachedRenderable:
+    """Wrap *renderable*, memoising its measurement and lines per width."""
+
+    __slots__ = ("renderable", "_lines", "_measurements")
+
+    def __init__(self, renderable: RenderableType):
+        self.renderable = renderable
+        self._lines: dict[tuple, list[list[Segment]]] = {}
+        self._measurements: dict[int, Measurement] = {}
+
+    @property
+    def vertical(self) -> str:
+        # tables (and so ``Columns``) read a cell's vertical alignment off it
+        return getattr(self.renderable, "vertical", "top")
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        key = (options.max_width, options.min_width, options.height,
+               options.justify, options.overflow, options.no_wrap)
+        lines = self._lines.get(key)
+        if lines is None:
+            lines = self._lines[key] = console.render_lines(self.renderable, options, pad=False)
+        new_line = Segment.line()
+        for line in lines:
+            yield from line
+            yield new_line
+
+    def __rich_measure__(self, console: Console, options: ConsoleOptions) -> Measurement:
+        measurement = self._measurements.get(options.max_width)
+        if measurement is None:
+            measurement = Measurement.get(console, options, self.renderable)
+            self._measurements[options.max_width] = measurement
+        return measurement
+
+
+class RenderCache:
+    """``key -> CachedRenderable``, pruned to what the last render used."""
+
+    def __init__(self):
+        self._cells: dict[Hashable, CachedRenderable] = {}
+        self._used: set[Hashable] = set()
+
+    def get(self, key: Hashable, build: Callable[[], RenderableType]) -> CachedRenderable:
+        """The cell for *key*, calling *build* only on a miss."""
+        self._used.add(key)
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = CachedRenderable(build())
+        return cell
+
+    def sweep(self) -> None:
+        """Forget every cell the render since the previous sweep did not ask for."""
+        if len(self._cells) != len(self._used):
+            self._cells = {k: v for k, v in self._cells.items() if k in self._used}
+        self._used = set()
@@ -6,53 +6,21 @@ StatusWidget
 Polls and returns status relevant data from API endpoint:
     • /api/versions
 
+Uptime and the "last checked" age tick locally every second.
+
 """
 
-from datetime import datetime, timezone
-from dateutil import parser
+import time
 
+from core.extract import extract_status, format_duration, seconds_since
 from widgets.base_widget import APIWidget
 
 
-def uptime(timestamp: str) -> str:
-    try:
-        source_time = parser.parse(timestamp)
-        if source_time.tzinfo is None:
-            source_time = source_time.replace(tzinfo=timezone.utc)
-        now = datetime.now(timezone.utc)
-        delta = now - source_time
-
-        days = delta.days
-        hours = (delta.seconds // 3600) % 24
-        minutes = (delta.seconds // 60) % 60
-        seconds = delta.seconds % 60
-
-        parts = []
-        if days > 0:
-            parts.append(f"{days}d")
-        if hours > 0:
-            parts.append(f"{hours}h")
-        if minutes > 0:
-            parts.append(f"{minutes}m")
-        parts.append(f"{seconds}s")
-
-        return " ".join(parts)
-    except Exception:
-        return "N/A"
-
-
-def date_to_human_utc(timestamp: str) -> str:
-    try:
-        dt = parser.isoparse(timestamp)
-        return dt.strftime("%b %-d, %Y %H:%M UTC")
-    except (ValueError, TypeError):
-        return "N/A"
-
-
 class StatusWidget(APIWidget):
     """Poll `/api/status` once every 10 s and show a quick summary."""
 
     interval = 10
+    section = "status"
 
     def __init__(self, title: str, *, api_base: str, api_password: str, **kwargs):
         super().__init__(
@@ -62,31 +30,43 @@ class StatusWidget(APIWidget):
             **kwargs,
         )
 
+    def on_mount(self):
+        super().on_mount()
+        # an unchanged /api/status is never re-rendered, so uptime and the
+        # "last checked" age advance on the app's shared 1 s ticker
+        self.app.ticker.add(self._tick)
+
+    def on_unmount(self):
+        self.app.ticker.remove(self._tick)
+        super().on_unmount()
+
+    def _tick(self, now: float) -> None:
+        # a failing node's clock is unknown – its ages stay frozen
+        if self.data and "error" not in self.data and self._stale in (None, "cached"):
+            self.paint(self.data)
+
     # ------------------------------------------------------------------ #
     # APIWidget hooks
     # ------------------------------------------------------------------ #
     def extract_data(self, responses):
-        payload = responses[self.endpoints[0]]
-        return {
-            "status": "Running" if payload.get("serviceStatus") == "running" else "Not Running",
-            "docker": "Available" if payload.get("dockerAvailable") else "Not Available",
-            "autostart": "Enabled" if payload.get("autoStart") else "Not Enabled",
-            "uptime": uptime(payload.get("uptime")),
-            "image_updates": payload.get("imageUpdates", {}).get("available", "N/A"),
-            "last_checked": date_to_human_utc(
-                payload.get("imageUpdates", {}).get("lastChecked", "N/A")
-            ),
-        }
+        return extract_status(responses[self.endpoints[0]])
 
     def render_content(self, data):
         if "error" in data:
             return f"[bold red]{data['error']}[/bold red]"
+        now = time.time() if self._stale in (None, "cached") else self._data_at
+        uptime = data.get("uptime", "Loading...")
+        if data.get("started_at") is not None:
+            uptime = format_duration(seconds_since(data["started_at"], now))
+        last_checked = data.get("last_checked", "Loading...")
+        if data.get("last_checked_at") is not None:
+            last_checked += f" ({format_duration(seconds_since(data['last_checked_at'], now))} ago)"
         return (
             f"Service Status : {data.get('status', 'Loading...')}\n"
             f"Docker Status  : {data.get('docker', 'Loading...')}\n"
             f"Auto-start     : {data.get('autostart', 'Loading...')}\n"
-            f"Uptime         : {data.get('uptime', 'Loading...')}\n"
+            f"Uptime         : {uptime}\n"
             f"Image Updates  : {data.get('image_updates', 'Loading...')}\n"
-            f"Last Checked   : {data.get('last_checked', 'Loading...')}"
+            f"Last Checked   : {last_checked}"
         )
 